@@ -0,0 +1,37 @@
+"""Benchmarks for the performance-critical paths of noqx."""
+
+import pkgutil
+from typing import Any, Dict, Iterator, List, Tuple
+
+from noqx.manager import list_solver_metadata, load_solver, modules
+
+
+def load_solvers(solver_dir: str = "solver"):
+    """Load all the solvers in the directory.
+
+    Args:
+        solver_dir: The directory where the solvers are located.
+    """
+    for module_info in pkgutil.iter_modules([solver_dir]):
+        if module_info.name not in modules:
+            load_solver(solver_dir, module_info.name)
+
+
+def iter_examples(puzzle_names: List[str]) -> Iterator[Tuple[str, int, Dict[str, Any], Dict[str, Any]]]:
+    """Iterate over the examples of the solvers in the format of (`puzzle_name`, `index`, `example`, `params`).
+
+    * The default parameters are overridden by the `config` of the example. The digit parameters are converted to strings, which is the same as the web frontend.
+
+    Args:
+        puzzle_names: The puzzles to be iterated, all the puzzles are iterated if it is empty.
+    """
+    for puzzle_name, puzzle_metadata in list_solver_metadata().items():
+        if puzzle_names and puzzle_name not in puzzle_names:
+            continue
+
+        default_params = puzzle_metadata.get("parameters", {})
+        for index, puzzle_example in enumerate(puzzle_metadata.get("examples", [])):
+            puzzle_config = puzzle_example.get("config", {})
+            params = {k: puzzle_config.get(k, v["default"]) for k, v in default_params.items()}
+            params = {k: str(v) if str(v).isdigit() else v for k, v in params.items()}
+            yield puzzle_name, index, puzzle_example, params
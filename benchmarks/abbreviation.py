@@ -0,0 +1,85 @@
+"""Benchmark the throughput of the [Penpa+](https://swaroopg92.github.io/penpa-edit/) abbreviation codec.
+
+* The legacy codec replaces the abbreviations one by one with `str.replace`. The current codec scans the content in a single pass. Both codecs run over the boards of all the solver examples, and the results are checked to be identical.
+
+* Usage: `python -m benchmarks.abbreviation [-r REPEAT]`
+"""
+
+import argparse
+import json
+import time
+from base64 import b64decode
+from functools import reduce
+from typing import Callable, List
+from zlib import decompress
+
+from benchmarks import load_solvers
+from noqx.manager import list_solver_metadata
+from noqx.puzzle.penpa import PENPA_ABBREVIATIONS, PENPA_PREFIX, compress_abbreviations, expand_abbreviations
+
+
+def legacy_expand(data: str) -> str:
+    """Expand the abbreviations one by one."""
+    return reduce(lambda s, abbr: s.replace(abbr[1], abbr[0]), PENPA_ABBREVIATIONS, data)
+
+
+def legacy_compress(data: str) -> str:
+    """Compress the abbreviations one by one."""
+    return reduce(lambda s, abbr: s.replace(abbr[0], abbr[1]), PENPA_ABBREVIATIONS, data)
+
+
+def collect_boards() -> List[str]:
+    """Collect the abbreviated problem and solution boards of all the solver examples."""
+    boards = []
+    for puzzle_metadata in list_solver_metadata().values():
+        for puzzle_example in puzzle_metadata.get("examples", []):
+            if puzzle_example.get("data") is None:
+                continue
+
+            parts = decompress(b64decode(puzzle_example["data"][len(PENPA_PREFIX) :]), wbits=-15).decode().split("\n")
+            boards.extend((parts[3], parts[4]))
+
+    return boards
+
+
+def throughput(func: Callable[[str], str], boards: List[str], repeat: int) -> float:
+    """Measure the throughput (in MB/s) of a codec function."""
+    size = sum(len(board) for board in boards) * repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for board in boards:
+            func(board)
+
+    return size / (time.perf_counter() - start) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the throughput of the abbreviation codec.")
+    parser.add_argument("-r", "--repeat", type=int, default=20, help="the number of repeats over all the boards.")
+    args = parser.parse_args()
+
+    load_solvers()
+
+    abbreviated = collect_boards()
+    expanded = [json.dumps(json.loads(legacy_expand(board))) for board in abbreviated]
+    for board in abbreviated:
+        if expand_abbreviations(board) != legacy_expand(board):
+            raise AssertionError(f"Different expansions for {board[:80]}.")
+
+    for board in expanded:
+        if compress_abbreviations(board) != legacy_compress(board):
+            raise AssertionError(f"Different compressions for {board[:80]}.")
+
+    print(f"{len(abbreviated)} boards, {sum(len(board) for board in expanded) / 1e6:.3f} MB expanded in total.")
+    print(f"{'direction':<12}{'legacy (MB/s)':>16}{'current (MB/s)':>16}{'speedup':>10}")
+    for direction, boards, legacy, current in (
+        ("expand", abbreviated, legacy_expand, expand_abbreviations),
+        ("compress", expanded, legacy_compress, compress_abbreviations),
+    ):
+        legacy_speed = throughput(legacy, boards, args.repeat)
+        current_speed = throughput(current, boards, args.repeat)
+        print(f"{direction:<12}{legacy_speed:>16.2f}{current_speed:>16.2f}{current_speed / legacy_speed:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark the connectivity propagator against the flood-fill encoding.
+
+* The connectivity rules of every solver example (`noqx.rule.reachable.grid_color_connected` with the `4`, `8` and `x` adjacency types) are switched to the `propagator` backend. Both programs are grounded and solved, and the models are checked to be the same.
+
+* A Python propagator trades the grounding of the flood fill for a callback on every assignment, so it is only worth it if the grounding dominates. The examples that time out are reported without checking the models.
+
+* Usage: `python -m benchmarks.connectivity [-p PUZZLE ...] [-r REPEAT] [-tl TIME_LIMIT]`
+"""
+
+import argparse
+import re
+from typing import List, Optional, Tuple
+
+from benchmarks import iter_examples, load_solvers
+from noqx.clingo import ClingoSolver, Config
+from noqx.manager import generate_program, prepare_puzzle
+from noqx.rule.reachable import grid_color_connected
+
+CONSTRAINT = re.compile(r"^:- grid\(R, C\), (.+)\(R, C\), not (reachable_grid_adj_(4|8|x)_\w+)\(R, C\)\.$", re.M)
+
+
+def propagator_program(program: str) -> str:
+    """Switch the connectivity rules in the program to the `propagator` backend."""
+    for color, tag, adj_type in CONSTRAINT.findall(program):
+        lines = [line for line in program.split("\n") if not line.startswith(f"{tag}(R, C) :- ")]
+        rule = grid_color_connected(color, int(adj_type) if adj_type.isdigit() else adj_type, backend="propagator")
+        program = "\n".join(lines).replace(f":- grid(R, C), {color}(R, C), not {tag}(R, C).", rule)
+
+    return program
+
+
+def solve(program: str, propagator: bool) -> Tuple[float, float, Optional[List[str]]]:
+    """Solve the program with or without the propagator and get the grounding time, the solving time and the models.
+
+    * The models are `None` if the search is not exhausted within the time limit.
+    """
+    Config.connectivity_propagator = propagator
+    solver = ClingoSolver()
+    solver.solve(program)
+    exhausted = solver.statistics().get("exhausted") or len(solver.model) >= solver.max_models > 0
+    return solver.ground_time, solver.solve_time, sorted(solver.model) if exhausted else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the connectivity propagator against the flood-fill encoding.")
+    parser.add_argument("-p", "--puzzle", nargs="*", default=[], help="the puzzles to benchmark, default to all.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="the number of repeats for each example.")
+    parser.add_argument("-tl", "--time-limit", type=int, default=Config.time_limit, help="time limit in seconds.")
+    args = parser.parse_args()
+
+    Config.time_limit = args.time_limit
+    load_solvers()
+
+    totals = [0.0, 0.0, 0.0, 0.0]
+    header = f"{'puzzle':<20}{'example':>8}{'size':>8}{'models':>8}"
+    print(f"{header}{'asp ground':>12}{'asp solve':>12}{'prop ground':>12}{'prop solve':>12}{'speedup':>10}")
+    for puzzle_name, index, example, param in iter_examples(args.puzzle):
+        puzzle_content = example.get("data")
+        if puzzle_content is None:
+            continue  # the puzz.link URLs are converted by the web frontend only
+
+        puzzle = prepare_puzzle(puzzle_name, puzzle_content, param)
+        program = generate_program(puzzle)
+        propagated = propagator_program(program)
+        if propagated == program:
+            continue  # no connectivity rules in the program
+
+        timings = [float("inf")] * 4
+        for _ in range(args.repeat):  # take the minimum time to reduce the noise
+            asp_ground, asp_solve, asp_models = solve(program, False)
+            prop_ground, prop_solve, prop_models = solve(propagated, True)
+            timings = [min(t, e) for t, e in zip(timings, (asp_ground, asp_solve, prop_ground, prop_solve))]
+
+        if asp_models is not None and prop_models is not None and asp_models != prop_models:
+            raise AssertionError(f"Different models for {puzzle_name} example {index}.")
+
+        totals = [t + e for t, e in zip(totals, timings)]
+        speedup = (timings[0] + timings[1]) / (timings[2] + timings[3])
+        models = "timeout" if asp_models is None or prop_models is None else len(asp_models)
+        values = "".join(f"{t * 1000:>12.3f}" for t in timings)
+        print(f"{puzzle_name:<20}{index:>8}{f'{puzzle.row}x{puzzle.col}':>8}{models:>8}{values}{speedup:>9.2f}x")
+
+    if totals[2] + totals[3] > 0:
+        values = "".join(f"{t * 1000:>12.3f}" for t in totals)
+        print(f"{'total':<44}{values}{(totals[0] + totals[1]) / (totals[2] + totals[3]):>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
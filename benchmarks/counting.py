@@ -0,0 +1,75 @@
+"""Benchmark counting the solutions of draft puzzles against storing every model as a string.
+
+* The drafts are the examples with only the first clues kept (the texts and the symbols on the board), so they usually have many solutions. The solutions are counted up to the maximum number of models by `ClingoSolver.solve`, which converts and keeps every model, and by `ClingoSolver.count`, which only counts them.
+
+* Usage: `python -m benchmarks.counting [-p PUZZLE ...] [-k KEEP] [-m MAX_MODELS] [-tl TIME_LIMIT]`
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Tuple
+
+from benchmarks import iter_examples, load_solvers
+from noqx.clingo import ClingoSolver, Config
+from noqx.manager import generate_program, get_solver, prepare_puzzle
+
+
+def run(puzzle_name: str, program: str, max_models: int, counting: bool) -> Tuple[float, float, int]:
+    """Solve the program by a fresh solver and get the searching time, the peak memory (in MiB) and the number of models."""
+    solver = ClingoSolver(max_models, get_solver(puzzle_name).solver_config)
+    solver.ground(program)
+    tracemalloc.start()
+    start = time.perf_counter()
+    if counting:
+        count = solver.count(program)[0]
+    else:
+        solver.solve(program)
+        count = len(solver.model)
+
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return elapsed, peak, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark counting the solutions of draft puzzles.")
+    parser.add_argument(
+        "-p", "--puzzle", nargs="*", default=["sudoku", "hitori", "nurikabe"], help="the puzzles to benchmark."
+    )
+    parser.add_argument("-k", "--keep", type=float, default=0.5, help="the ratio of the clues kept in the drafts.")
+    parser.add_argument("-m", "--max-models", type=int, default=10000, help="the maximum number of models, 0 for all.")
+    parser.add_argument("-tl", "--time-limit", type=int, default=Config.time_limit, help="time limit in seconds.")
+    args = parser.parse_args()
+
+    Config.time_limit = args.time_limit
+    load_solvers()
+
+    print(
+        f"{'puzzle':<20}{'example':>8}{'models':>10}{'store (ms)':>13}{'count (ms)':>13}{'store (MiB)':>13}{'count (MiB)':>13}"
+    )
+    for puzzle_name, index, example, param in iter_examples(args.puzzle):
+        puzzle_content = example.get("data")
+        if puzzle_content is None:
+            continue  # the puzz.link URLs are converted by the web frontend only
+
+        puzzle = prepare_puzzle(puzzle_name, puzzle_content, param)
+        for clues in (puzzle.text, puzzle.symbol):
+            for point in list(clues)[int(len(clues) * args.keep) :]:
+                del clues[point]
+
+        try:
+            program = generate_program(puzzle)
+        except ValueError:
+            continue  # the clues are required by some solvers
+
+        store_time, store_peak, stored = run(puzzle_name, program, args.max_models, False)
+        count_time, count_peak, counted = run(puzzle_name, program, args.max_models, True)
+        models = f"{counted}" if stored == counted else f"{stored}/{counted}"  # the timeouts may differ
+        timings = f"{store_time * 1000:>13.1f}{count_time * 1000:>13.1f}{store_peak:>13.2f}{count_peak:>13.2f}"
+        print(f"{puzzle_name:<20}{index:>8}{models:>10}{timings}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark the grounding cost of the adjacency rules.
+
+* The legacy adjacency rules join every pair of cells and filter them by the distance, while the current rules join every cell with the cells at bounded offsets. Both programs of every solver example are grounded, and the ground programs are checked to have the same atoms.
+
+* The synthetic grids with a single shading rule show how the grounding cost grows with the size of the grid.
+
+* Usage: `python -m benchmarks.grounding [-p PUZZLE ...] [-r REPEAT] [-s SIZE ...]`
+"""
+
+import argparse
+import time
+from typing import Set, Tuple
+
+from clingo.control import Control
+
+from benchmarks import iter_examples, load_solvers
+from noqx.manager import generate_program, prepare_puzzle
+from noqx.rule.common import grid, shade_c
+from noqx.rule.neighbor import adjacent, avoid_same_color_adjacent
+
+LEGACY_ADJACENCY = {
+    adjacent(4): "adj_4(R, C, R1, C1) :- grid_all(R, C), grid_all(R1, C1), |R - R1| + |C - C1| == 1.",
+    adjacent("x"): "adj_x(R, C, R1, C1) :- grid_all(R, C), grid_all(R1, C1), |R - R1| == 1, |C - C1| == 1.",
+    adjacent(8): "adj_8(R, C, R1, C1) :- grid_all(R, C), grid_all(R1, C1), |R - R1| + |C - C1| == 1.\n"
+    + "adj_8(R, C, R1, C1) :- grid_all(R, C), grid_all(R1, C1), |R - R1| == 1, |C - C1| == 1.",
+}
+
+
+def legacy_program(program: str) -> str:
+    """Replace the adjacency rules in the program with the legacy ones."""
+    for current, legacy in LEGACY_ADJACENCY.items():
+        program = program.replace(current, legacy)
+
+    return program
+
+
+def ground(program: str) -> Tuple[float, Set[str], int]:
+    """Ground the program and get the grounding time, the ground atoms and the number of ground rules."""
+    ctl = Control(["--solve-limit=0"])
+    ctl.add("base", [], program)
+    start = time.perf_counter()
+    ctl.ground([("base", [])])
+    ground_time = time.perf_counter() - start
+
+    ctl.solve()  # the search is stopped immediately, which only collects the statistics of the ground program
+    atoms = {str(atom.symbol) for atom in ctl.symbolic_atoms}
+    return ground_time, atoms, int(ctl.statistics["problem"]["lp"]["rules"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the grounding cost of the adjacency rules.")
+    parser.add_argument("-p", "--puzzle", nargs="*", default=[], help="the puzzles to benchmark, default to all.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="the number of repeats for each example.")
+    parser.add_argument("-s", "--size", type=int, nargs="*", default=[10, 20, 40], help="the sizes of the synthetic grids.")
+    args = parser.parse_args()
+
+    load_solvers()
+
+    total_legacy, total_current = 0.0, 0.0
+    header = f"{'puzzle':<20}{'size':>8}{'atoms':>10}{'legacy rules':>14}{'current rules':>14}"
+    print(f"{header}{'legacy (ms)':>14}{'current (ms)':>14}{'speedup':>10}")
+    for puzzle_name, _, example, param in iter_examples(args.puzzle):
+        puzzle_content = example.get("data")
+        if puzzle_content is None:
+            continue  # the puzz.link URLs are converted by the web frontend only
+
+        puzzle = prepare_puzzle(puzzle_name, puzzle_content, param)
+        program = generate_program(puzzle)
+        legacy = legacy_program(program)
+        if legacy == program:
+            continue  # no adjacency rules in the program
+
+        legacy_time, current_time = float("inf"), float("inf")
+        for _ in range(args.repeat):  # take the minimum time to reduce the noise
+            elapsed, legacy_atoms, legacy_rules = ground(legacy)
+            legacy_time = min(legacy_time, elapsed)
+            elapsed, current_atoms, current_rules = ground(program)
+            current_time = min(current_time, elapsed)
+
+        if legacy_atoms != current_atoms:
+            raise AssertionError(f"Different ground atoms for {puzzle_name}.")
+
+        total_legacy += legacy_time
+        total_current += current_time
+        size = f"{puzzle.row}x{puzzle.col}"
+        print(
+            f"{puzzle_name:<20}{size:>8}{len(current_atoms):>10}{legacy_rules:>14}{current_rules:>14}{legacy_time * 1000:>14.3f}"
+            f"{current_time * 1000:>14.3f}{legacy_time / current_time:>9.2f}x"
+        )
+
+    if total_current > 0:
+        print(f"{'total':<66}{total_legacy * 1000:>14.3f}{total_current * 1000:>14.3f}{total_legacy / total_current:>9.2f}x")
+
+    print(f"\n{'adjacency':<12}{'size':>8}{'legacy (ms)':>14}{'current (ms)':>14}{'speedup':>10}")
+    for adj_type in (4, "x", 8):
+        for size in args.size:
+            program = "\n".join(
+                (grid(size, size), shade_c(), adjacent(adj_type), avoid_same_color_adjacent(adj_type=adj_type))
+            )
+            legacy_time = min(ground(legacy_program(program))[0] for _ in range(args.repeat))
+            current_time = min(ground(program)[0] for _ in range(args.repeat))
+            print(
+                f"{adj_type:<12}{f'{size}x{size}':>8}{legacy_time * 1000:>14.3f}"
+                f"{current_time * 1000:>14.3f}{legacy_time / current_time:>9.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
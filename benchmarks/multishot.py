@@ -0,0 +1,75 @@
+"""Benchmark the multi-shot solving of the guarded parameters against grounding the program for every variant.
+
+* For every example with guarded parameters (see `noqx.manager.Solver.add_param_line`), all the combinations of the checkbox parameters are solved by a fresh solver each, and by a single solver which grounds the program once and re-solves it under the new parameters. The models are checked to be the same if both searches are exhausted before reaching the maximum number of models.
+
+* Usage: `python -m benchmarks.multishot [-p PUZZLE ...] [-m MAX_MODELS] [-tl TIME_LIMIT]`
+"""
+
+import argparse
+from itertools import product
+from typing import List, Optional, Tuple
+
+from benchmarks import iter_examples, load_solvers
+from noqx.clingo import ClingoSolver, Config, split_params
+from noqx.manager import generate_program, prepare_puzzle
+
+
+def solve(solver: ClingoSolver, program: str) -> Tuple[float, Optional[List[str]]]:
+    """Solve the program and get the total time and the models with sorted atoms.
+
+    * The models are `None` if the search is not exhausted within the time limit.
+    """
+    solver.solve(program)
+    exhausted = solver.statistics().get("exhausted") or len(solver.model) >= solver.max_models > 0
+    models = sorted(" ".join(sorted(model.split())) for model in solver.model)
+    return solver.ground_time + solver.solve_time, models if exhausted else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the multi-shot solving of the guarded parameters.")
+    parser.add_argument("-p", "--puzzle", nargs="*", default=[], help="the puzzles to benchmark, default to all.")
+    parser.add_argument("-m", "--max-models", type=int, default=2, help="the maximum number of models, 0 for all.")
+    parser.add_argument("-tl", "--time-limit", type=int, default=Config.time_limit, help="time limit in seconds.")
+    args = parser.parse_args()
+
+    Config.time_limit = args.time_limit
+    load_solvers()
+
+    totals = [0.0, 0.0]
+    print(f"{'puzzle':<20}{'example':>8}{'variants':>10}{'one-shot (ms)':>16}{'multi-shot (ms)':>18}{'speedup':>10}")
+    for puzzle_name, index, example, param in iter_examples(args.puzzle):
+        puzzle_content = example.get("data")
+        if puzzle_content is None:
+            continue  # the puzz.link URLs are converted by the web frontend only
+
+        puzzle = prepare_puzzle(puzzle_name, puzzle_content, param)
+        guarded = sorted(split_params(generate_program(puzzle))[1])
+        if not guarded:
+            continue  # no guarded parameters in the program
+
+        session = ClingoSolver(args.max_models)
+        timings = [0.0, 0.0]
+        for values in product((False, True), repeat=len(guarded)):
+            puzzle = prepare_puzzle(puzzle_name, puzzle_content, {**param, **dict(zip(guarded, values))})
+            program = generate_program(puzzle)
+            one_shot_time, one_shot_models = solve(ClingoSolver(args.max_models), program)
+            multi_shot_time, multi_shot_models = solve(session, program)
+            if one_shot_models is not None and multi_shot_models is not None:
+                capped = len(one_shot_models) == args.max_models  # the capped searches may find other models
+                if len(one_shot_models) != len(multi_shot_models) or (not capped and one_shot_models != multi_shot_models):
+                    raise AssertionError(f"Different models for {puzzle_name} example {index} with {values}.")
+
+            timings = [timings[0] + one_shot_time, timings[1] + multi_shot_time]
+
+        totals = [t + e for t, e in zip(totals, timings)]
+        print(
+            f"{puzzle_name:<20}{index:>8}{2 ** len(guarded):>10}{timings[0] * 1000:>16.3f}"
+            f"{timings[1] * 1000:>18.3f}{timings[0] / timings[1]:>9.2f}x"
+        )
+
+    if totals[1] > 0:
+        print(f"{'total':<38}{totals[0] * 1000:>16.3f}{totals[1] * 1000:>18.3f}{totals[0] / totals[1]:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark the cost of packing the models into [Penpa+](https://swaroopg92.github.io/penpa-edit/) URLs.
+
+* The legacy path decodes the puzzle content again for every model and parses the solution board again while encoding. The current path clones the decoded puzzle with `Puzzle.empty_copy`.
+
+* Usage: `python -m benchmarks.packing [-p PUZZLE ...] [-r REPEAT]`
+"""
+
+import argparse
+import json
+import time
+from functools import reduce
+from typing import Any, Dict
+
+from benchmarks import iter_examples, load_solvers
+from noqx.clingo import ClingoSolver
+from noqx.manager import generate_program, prepare_puzzle, store_solution
+from noqx.puzzle import Puzzle
+from noqx.puzzle.penpa import PENPA_ABBREVIATIONS
+
+
+def legacy_encode(puzzle_name: str, puzzle_content: str, param: Dict[str, Any], model: str) -> str:
+    """Pack a model by decoding the puzzle content again, as `store_solution` did before."""
+    puzzle = prepare_puzzle(puzzle_name, puzzle_content, param)
+    solution = store_solution(puzzle, model)
+    solution.template = json.loads(reduce(lambda s, abbr: s.replace(abbr[1], abbr[0]), PENPA_ABBREVIATIONS, solution.parts[4]))
+    return solution.encode()
+
+
+def current_encode(puzzle: Puzzle, model: str) -> str:
+    """Pack a model by cloning the decoded puzzle."""
+    return store_solution(puzzle, model).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cost of packing the models into URLs.")
+    parser.add_argument("-p", "--puzzle", nargs="*", default=[], help="the puzzles to benchmark, default to all.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="the number of repeats for each model.")
+    args = parser.parse_args()
+
+    load_solvers()
+
+    total_legacy, total_current, total_models = 0.0, 0.0, 0
+    print(f"{'puzzle':<20}{'size':>8}{'models':>8}{'legacy (ms)':>14}{'current (ms)':>14}{'speedup':>10}")
+    for puzzle_name, _, example, param in iter_examples(args.puzzle):
+        puzzle_content = example.get("data")
+        if puzzle_content is None:
+            continue  # the puzz.link URLs are converted by the web frontend only
+
+        puzzle = prepare_puzzle(puzzle_name, puzzle_content, param)
+        solver = ClingoSolver()
+        solver.solve(generate_program(puzzle))
+        models = solver.solution()
+        if not models:
+            continue
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            legacy = [legacy_encode(puzzle_name, puzzle_content, param, model) for model in models]
+        legacy_time = (time.perf_counter() - start) / args.repeat / len(models)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            current = [current_encode(puzzle, model) for model in models]
+        current_time = (time.perf_counter() - start) / args.repeat / len(models)
+
+        if legacy != current:
+            raise AssertionError(f"Different solutions are packed for {puzzle_name}.")
+
+        total_legacy += legacy_time * len(models)
+        total_current += current_time * len(models)
+        total_models += len(models)
+        size = f"{puzzle.row}x{puzzle.col}"
+        print(
+            f"{puzzle_name:<20}{size:>8}{len(models):>8}{legacy_time * 1000:>14.3f}"
+            f"{current_time * 1000:>14.3f}{legacy_time / current_time:>9.2f}x"
+        )
+
+    if total_models > 0:
+        print(
+            f"{'total':<28}{total_models:>8}{total_legacy / total_models * 1000:>14.3f}"
+            f"{total_current / total_models * 1000:>14.3f}{total_legacy / total_current:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
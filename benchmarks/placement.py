@@ -0,0 +1,79 @@
+"""Benchmark the precomputed shape placements against the rule-level variant matching.
+
+* The legacy programs are generated by dropping the `cells` argument of `general_shape` in the solver modules, so the grounder tries every anchor cell for every variant. Both programs of every solver example are solved, and the models are checked to be the same.
+
+* Usage: `python -m benchmarks.placement [-p PUZZLE ...] [-r REPEAT]`
+"""
+
+import argparse
+import sys
+from typing import Any, Dict, List, Tuple
+
+from benchmarks import iter_examples, load_solvers
+from noqx.clingo import ClingoSolver
+from noqx.manager import generate_program, modules, prepare_puzzle
+from noqx.rule import shape
+
+
+def legacy_general_shape(*args: Any, **kwargs: Any) -> str:
+    """Generate the shape rules without the precomputed placements."""
+    kwargs.pop("cells", None)
+    return shape.general_shape(*args, **kwargs)
+
+
+def generate(puzzle_name: str, puzzle_content: str, param: Dict[str, Any], legacy: bool) -> str:
+    """Generate the program of a puzzle with or without the precomputed placements."""
+    module = sys.modules[type(modules[puzzle_name]).__module__]
+    module.general_shape = legacy_general_shape if legacy else shape.general_shape
+    try:
+        return generate_program(prepare_puzzle(puzzle_name, puzzle_content, param))
+    finally:
+        module.general_shape = shape.general_shape
+
+
+def solve(program: str) -> Tuple[float, float, int, List[str]]:
+    """Solve the program and get the grounding time, the solving time, the number of rules and the sorted models."""
+    solver = ClingoSolver()
+    solver.solve(program)
+    models = sorted(" ".join(sorted(model.split())) for model in solver.model)
+    return solver.ground_time, solver.solve_time, solver.statistics().get("rules", 0), models
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the precomputed shape placements.")
+    parser.add_argument("-p", "--puzzle", nargs="*", default=[], help="the puzzles to benchmark, default to all.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="the number of repeats for each example.")
+    args = parser.parse_args()
+
+    load_solvers()
+
+    header = f"{'puzzle':<20}{'example':>8}{'legacy rules':>14}{'current rules':>14}{'legacy ground':>15}"
+    print(f"{header}{'current ground':>16}{'legacy total':>14}{'current total':>15}")
+    for puzzle_name, index, example, param in iter_examples(args.puzzle):
+        puzzle_content = example.get("data")
+        if puzzle_content is None:
+            continue  # the puzz.link URLs are converted by the web frontend only
+
+        legacy = generate(puzzle_name, puzzle_content, param, legacy=True)
+        current = generate(puzzle_name, puzzle_content, param, legacy=False)
+        if legacy == current:
+            continue  # no precomputed placements in the program
+
+        results = []
+        for program in (legacy, current):
+            runs = [solve(program) for _ in range(args.repeat)]
+            results.append((min(run[0] for run in runs), min(run[0] + run[1] for run in runs), runs[-1][2], runs[-1][3]))
+
+        (legacy_ground, legacy_total, legacy_rules, legacy_models) = results[0]
+        (current_ground, current_total, current_rules, current_models) = results[1]
+        if legacy_models != current_models:
+            raise AssertionError(f"Different models for {puzzle_name} example {index}.")
+
+        print(
+            f"{puzzle_name:<20}{index:>8}{legacy_rules:>14}{current_rules:>14}{legacy_ground * 1000:>15.3f}"
+            f"{current_ground * 1000:>16.3f}{legacy_total * 1000:>14.3f}{current_total * 1000:>15.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
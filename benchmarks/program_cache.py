@@ -0,0 +1,88 @@
+"""Benchmark the program cache and the ground program cache against generating and grounding the program for every request.
+
+* For every example, the program is generated with an empty program cache and generated again from the cache. The program is grounded by a fresh solver, and loaded from the ground program cache after it is stored. The models are checked to have the same atoms if the search is exhausted before reaching the maximum number of models.
+
+* The programs with external atoms, propagators or domain heuristics cannot use the ground program cache, and only the program cache is measured for them.
+
+* Usage: `python -m benchmarks.program_cache [-p PUZZLE ...] [-m MAX_MODELS] [-tl TIME_LIMIT]`
+"""
+
+import argparse
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+from benchmarks import iter_examples, load_solvers
+from noqx.clingo import ClingoSolver, Config
+from noqx.manager import generate_program, get_solver, prepare_puzzle, program_cache
+from noqx.puzzle import Puzzle
+
+
+def generate(puzzle: Puzzle) -> Tuple[float, str]:
+    """Generate the program and get the generation time and the program."""
+    start = time.perf_counter()
+    program = generate_program(puzzle)
+    return time.perf_counter() - start, program
+
+
+def ground(puzzle_name: str, program: str, max_models: int) -> Tuple[ClingoSolver, Optional[List[str]]]:
+    """Solve the program by a fresh solver and get the solver and the models with sorted atoms.
+
+    * The models are `None` if the search is not exhausted within the time limit.
+    """
+    solver = ClingoSolver(max_models, get_solver(puzzle_name).solver_config)
+    solver.solve(program)
+    exhausted = solver.statistics().get("exhausted") or len(solver.model) >= solver.max_models > 0
+    models = sorted(" ".join(sorted(model.split())) for model in solver.model)
+    return solver, models if exhausted else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the program cache and the ground program cache.")
+    parser.add_argument("-p", "--puzzle", nargs="*", default=[], help="the puzzles to benchmark, default to all.")
+    parser.add_argument("-m", "--max-models", type=int, default=2, help="the maximum number of models, 0 for all.")
+    parser.add_argument("-tl", "--time-limit", type=int, default=Config.time_limit, help="time limit in seconds.")
+    args = parser.parse_args()
+
+    Config.time_limit = args.time_limit
+    load_solvers()
+
+    totals = [0.0, 0.0, 0.0, 0.0]
+    print(f"{'puzzle':<20}{'example':>8}{'generate (ms)':>15}{'cached (ms)':>13}{'ground (ms)':>13}{'cached (ms)':>13}")
+    with tempfile.TemporaryDirectory() as ground_cache_path:
+        for puzzle_name, index, example, param in iter_examples(args.puzzle):
+            puzzle_content = example.get("data")
+            if puzzle_content is None:
+                continue  # the puzz.link URLs are converted by the web frontend only
+
+            program_cache.clear()
+            generate_time, program = generate(prepare_puzzle(puzzle_name, puzzle_content, param))
+            cached_generate_time, cached_program = generate(prepare_puzzle(puzzle_name, puzzle_content, param))
+            if cached_program != program:
+                raise AssertionError(f"Different programs for {puzzle_name} example {index}.")
+
+            Config.ground_cache_path = None
+            solver, models = ground(puzzle_name, program, args.max_models)
+            Config.ground_cache_path = ground_cache_path
+            ground(puzzle_name, program, args.max_models)  # store the ground program
+            cached_solver, cached_models = ground(puzzle_name, program, args.max_models)
+            Config.ground_cache_path = None
+
+            timings = [generate_time, cached_generate_time, solver.ground_time, cached_solver.ground_time]
+            if not cached_solver.ground_cached:
+                timings[3] = timings[2]  # the ground program cache is not applicable
+
+            elif models is not None and cached_models is not None:
+                capped = len(models) == args.max_models  # the capped searches may find other models
+                if len(models) != len(cached_models) or (not capped and models != cached_models):
+                    raise AssertionError(f"Different models for {puzzle_name} example {index}.")
+
+            totals = [t + e for t, e in zip(totals, timings)]
+            print(f"{puzzle_name:<20}{index:>8}" + "".join(f"{t * 1000:>{w}.3f}" for t, w in zip(timings, (15, 13, 13, 13))))
+
+    print(f"{'total':<28}" + "".join(f"{t * 1000:>{w}.3f}" for t, w in zip(totals, (15, 13, 13, 13))))
+    print(f"{'speedup':<28}{totals[0] / totals[1]:>14.2f}x{totals[2] / totals[3]:>25.2f}x")
+
+
+if __name__ == "__main__":
+    main()
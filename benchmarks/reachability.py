@@ -0,0 +1,106 @@
+"""Benchmark the shared multi-source reachability against the reachability per source cell.
+
+* The solvers in `PUZZLES` are solved with both encodings, which are switched by `noqx.rule.reachable.SHARED_REACHABILITY`. For the solver examples, the models are checked to be the same.
+
+* The synthetic Nurikabe and Fillomino boards with random clues show how the ground programs grow with the size of the grid and the number of clues. They are only grounded since the boards are not valid puzzles.
+
+* Usage: `python -m benchmarks.reachability [-p PUZZLE ...] [-r REPEAT] [-s SIZE ...]`
+"""
+
+import argparse
+import random
+from typing import Any, Dict, List, Tuple
+
+from benchmarks import iter_examples, load_solvers
+from benchmarks.grounding import ground
+from noqx.clingo import ClingoSolver
+from noqx.manager import generate_program, prepare_puzzle
+from noqx.puzzle import Point, Puzzle
+from noqx.rule import reachable
+
+# the solvers switching between the shared reachability and the reachability per source cell
+PUZZLES = ("fillomino", "nurikabe")
+
+
+def solve(program: str) -> Tuple[float, float, List[str]]:
+    """Solve the program and get the grounding time, the solving time and the models with sorted atoms."""
+    solver = ClingoSolver()
+    solver.solve(program)
+    return solver.ground_time, solver.solve_time, sorted(" ".join(sorted(model.split())) for model in solver.model)
+
+
+def synthetic_puzzle(puzzle_name: str, size: int, param: Dict[str, Any], seed: int = 0) -> Puzzle:
+    """Generate a board with random clues, where every clue has no other clues around it."""
+    rng = random.Random(seed)
+    puzzle = Puzzle(puzzle_name, "", param)
+    puzzle.row, puzzle.col = size, size
+    for r in range(size):
+        for c in range(size):
+            if rng.random() < 0.15 and all(Point(r + dr, c + dc) not in puzzle.text for dr in (-1, 0) for dc in (-1, 0, 1)):
+                puzzle.text[Point(r, c)] = rng.randint(1, 7)
+
+    return puzzle
+
+
+def generate(puzzle_name: str, puzzle_content: str, param: Dict[str, Any], shared: bool) -> Tuple[Puzzle, str]:
+    """Decode the puzzle and generate its program with the shared reachability or the reachability per source cell."""
+    reachable.SHARED_REACHABILITY = shared
+    puzzle = prepare_puzzle(puzzle_name, puzzle_content, param)
+    return puzzle, generate_program(puzzle)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared multi-source reachability.")
+    parser.add_argument("-p", "--puzzle", nargs="*", default=[], help="the puzzles to benchmark, default to all.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="the number of repeats for each example.")
+    parser.add_argument("-s", "--size", type=int, nargs="*", default=[10, 25], help="the sizes of the synthetic grids.")
+    args = parser.parse_args()
+
+    load_solvers()
+    puzzle_names = [name for name in PUZZLES if not args.puzzle or name in args.puzzle]
+
+    print(f"{'puzzle':<20}{'example':>8}{'size':>8}{'per source (ms)':>18}{'shared (ms)':>14}{'speedup':>10}")
+    for puzzle_name, index, example, param in iter_examples(puzzle_names):
+        puzzle_content = example.get("data")
+        if puzzle_content is None:
+            continue  # the puzz.link URLs are converted by the web frontend only
+
+        results = []
+        for shared in (False, True):
+            puzzle, program = generate(puzzle_name, puzzle_content, param, shared)
+            runs = [solve(program) for _ in range(args.repeat)]
+            results.append((min(ground_time + solve_time for ground_time, solve_time, _ in runs), runs[-1][2]))
+
+        if results[0][1] != results[1][1]:
+            raise AssertionError(f"Different models for {puzzle_name} example {index}.")
+
+        (legacy_time, _), (shared_time, _) = results
+        print(
+            f"{puzzle_name:<20}{index:>8}{f'{puzzle.row}x{puzzle.col}':>8}{legacy_time * 1000:>18.3f}"
+            f"{shared_time * 1000:>14.3f}{legacy_time / shared_time:>9.2f}x"
+        )
+
+    header = f"\n{'puzzle':<20}{'size':>8}{'clues':>8}{'per source rules':>18}{'shared rules':>14}"
+    print(f"{header}{'per source (ms)':>18}{'shared (ms)':>14}{'speedup':>10}")
+    for puzzle_name in ("nurikabe", "fillomino"):
+        if puzzle_name not in puzzle_names:
+            continue
+
+        for size in args.size:
+            results = []
+            for shared in (False, True):
+                reachable.SHARED_REACHABILITY = shared
+                puzzle = synthetic_puzzle(puzzle_name, size, {"fast_mode": True})
+                program = generate_program(puzzle)
+                runs = [ground(program) for _ in range(args.repeat)]
+                results.append((min(ground_time for ground_time, _, _ in runs), runs[-1][2]))
+
+            (legacy_time, legacy_rules), (shared_time, shared_rules) = results
+            print(
+                f"{puzzle_name:<20}{f'{size}x{size}':>8}{len(puzzle.text):>8}{legacy_rules:>18}{shared_rules:>14}"
+                f"{legacy_time * 1000:>18.3f}{shared_time * 1000:>14.3f}{legacy_time / shared_time:>9.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Benchmark the row-major room labelling against the legacy BFS from random start cells, and the edge dictionary against the compact puzzle view.
+
+* The synthetic boards are split into rooms by growing the regions from random seed cells, and the walls are the edges between different regions. Both implementations are checked to find the same rooms, and the current implementation is checked to be deterministic.
+
+* The legacy implementation starts every BFS from a random unexplored cell, which takes linear time to pick the cell, and looks up four `Point` keys in the edge dictionary for every cell.
+
+* The current implementation is measured with the edge dictionary and with the compact view (see `noqx.puzzle.PuzzleView`) for the rooms (`full_bfs`) and the borders of all the rooms (`area_border`). The view is built once per puzzle, and its building time is reported separately.
+
+* Usage: `python -m benchmarks.rooms [-s SIZE ...] [-n ROOMS ...] [-r REPEAT]`
+"""
+
+import argparse
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from noqx.puzzle import Direction, Point, Puzzle, PuzzleView
+from noqx.rule.helper import full_bfs
+from noqx.rule.neighbor import area_border
+
+
+def legacy_full_bfs(
+    rows: int,
+    cols: int,
+    edges: Dict[Tuple[int, int, str, str], bool],
+    clues: Optional[Dict[Tuple[int, int, str, str], Union[int, str]]] = None,
+) -> Dict[Tuple[Tuple[int, int], ...], Optional[Tuple[int, int]]]:
+    """Generate the rooms by BFS from random start cells."""
+    unexplored_cells = {(r, c) for c in range(cols) for r in range(rows)}
+    clue_to_room: Dict[Tuple[Tuple[int, int], ...], Optional[Tuple[int, int]]] = {}
+    rc_set = {(r, c) for (r, c, _, _) in clues} if clues else set()
+
+    def get_neighbors(r: int, c: int) -> Iterator[Tuple[int, int]]:
+        if edges.get(Point(r, c, Direction.LEFT)) is not True:
+            yield (r, c - 1)
+
+        if edges.get(Point(r, c + 1, Direction.LEFT)) is not True:
+            yield (r, c + 1)
+
+        if edges.get(Point(r, c, Direction.TOP)) is not True:
+            yield (r - 1, c)
+
+        if edges.get(Point(r + 1, c, Direction.TOP)) is not True:
+            yield (r + 1, c)
+
+    while unexplored_cells:
+        start_cell = random.choice(tuple(unexplored_cells))
+        clue_cell = None
+        connected_component = {start_cell}
+        unexplored_cells.remove(start_cell)
+        queue = deque([start_cell], rows * cols)
+        while queue:
+            r, c = queue.popleft()
+            for neighbor in get_neighbors(r, c):
+                if neighbor in unexplored_cells:
+                    connected_component.add(neighbor)
+                    unexplored_cells.remove(neighbor)
+                    queue.append(neighbor)
+
+            if clues and (r, c) in rc_set:
+                clue_cell = (r, c)
+
+        clue_to_room[tuple(connected_component)] = clue_cell
+
+    return clue_to_room
+
+
+def synthetic_board(size: int, rooms: int, seed: int = 0) -> Dict[Tuple[int, int, str, str], bool]:
+    """Generate the edges of a board split into rooms grown from random seed cells."""
+    rng = random.Random(seed)
+    region: Dict[Tuple[int, int], int] = {}
+    frontier: List[Tuple[int, int]] = []
+    for index, cell in enumerate(rng.sample([(r, c) for r in range(size) for c in range(size)], rooms)):
+        region[cell] = index
+        frontier.append(cell)
+
+    while frontier:
+        r, c = frontier.pop(rng.randrange(len(frontier)))
+        for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            neighbor = (r + dr, c + dc)
+            if 0 <= neighbor[0] < size and 0 <= neighbor[1] < size and neighbor not in region:
+                region[neighbor] = region[(r, c)]
+                frontier.append(neighbor)
+
+    edges = {}
+    for r in range(size):
+        for c in range(size):
+            edges[Point(r, c, Direction.LEFT)] = c == 0 or region[(r, c - 1)] != region[(r, c)]
+            edges[Point(r, c, Direction.TOP)] = r == 0 or region[(r - 1, c)] != region[(r, c)]
+        edges[Point(r, size, Direction.LEFT)] = True
+
+    for c in range(size):
+        edges[Point(size, c, Direction.TOP)] = True
+
+    return edges
+
+
+def synthetic_puzzle(size: int, edges: Dict[Tuple[int, int, str, str], bool]) -> Puzzle:
+    """Create a puzzle of the synthetic board."""
+    puzzle = Puzzle("synthetic", "")
+    puzzle.row, puzzle.col = size, size
+    puzzle.edge = edges
+    return puzzle
+
+
+def borders(size: int, edges: Union[Dict[Tuple[int, int, str, str], bool], PuzzleView]) -> List[str]:
+    """Generate the borders of all the rooms."""
+    return [area_border(i, room, edges) for i, room in enumerate(full_bfs(size, size, edges))]
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    """Get the minimum time of the function."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the row-major room labelling and the compact puzzle view.")
+    parser.add_argument("-s", "--size", type=int, nargs="*", default=[20, 50], help="the sizes of the synthetic grids.")
+    parser.add_argument("-n", "--rooms", type=int, nargs="*", default=[50, 300, 800], help="the numbers of rooms.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="the number of repeats for each board.")
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>8}{'rooms':>8}{'legacy (ms)':>14}{'dict (ms)':>12}{'view (ms)':>12}{'speedup':>10}"
+        f"{'borders dict (ms)':>20}{'borders view (ms)':>20}{'build view (ms)':>18}"
+    )
+    for size in args.size:
+        for rooms in args.rooms:
+            if rooms > size * size:
+                continue
+
+            edges = synthetic_board(size, rooms)
+            view = synthetic_puzzle(size, edges).view
+            legacy = legacy_full_bfs(size, size, edges)
+            current = full_bfs(size, size, edges)
+            if sorted(tuple(sorted(room)) for room in legacy) != sorted(current):
+                raise AssertionError(f"Different rooms for the {size}x{size} board with {rooms} rooms.")
+
+            if list(full_bfs(size, size, edges)) != list(current) or full_bfs(size, size, view) != current:
+                raise AssertionError(f"Non-deterministic rooms for the {size}x{size} board with {rooms} rooms.")
+
+            if borders(size, edges) != borders(size, view):
+                raise AssertionError(f"Different borders for the {size}x{size} board with {rooms} rooms.")
+
+            legacy_time = measure(lambda: legacy_full_bfs(size, size, edges), args.repeat)  # noqa: B023
+            dict_time = measure(lambda: full_bfs(size, size, edges), args.repeat)  # noqa: B023
+            view_time = measure(lambda: full_bfs(size, size, view), args.repeat)  # noqa: B023
+            borders_dict_time = measure(lambda: borders(size, edges), args.repeat)  # noqa: B023
+            borders_view_time = measure(lambda: borders(size, view), args.repeat)  # noqa: B023
+            build_time = measure(lambda: PuzzleView(synthetic_puzzle(size, edges)), args.repeat)  # noqa: B023
+            print(
+                f"{f'{size}x{size}':>8}{len(current):>8}{legacy_time * 1000:>14.3f}{dict_time * 1000:>12.3f}"
+                f"{view_time * 1000:>12.3f}{legacy_time / view_time:>9.2f}x{borders_dict_time * 1000:>20.3f}"
+                f"{borders_view_time * 1000:>20.3f}{build_time * 1000:>18.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
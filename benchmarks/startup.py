@@ -0,0 +1,103 @@
+"""Benchmark the startup of the server and the size of the PyScript bundle with the eager and the lazy solver loading.
+
+* Server: every mode runs in a fresh interpreter, which imports all the solvers (`eager`), registers the solvers from a prebuilt metadata index (`lazy`, see `noqx.registry`), or additionally imports a solver on first use (`lazy + first use`). The minimum cold startup time and the peak resident memory are reported.
+
+* PyScript: the bundle fetched before the page is ready contains all the solver files with the eager loading, and only the package marker of the solvers with the lazy loading, where every solver file is fetched on first use. The sizes of the files are reported since MicroPython is not available here.
+
+* Usage: `python -m benchmarks.startup [-r REPEAT] [-f FIRST_USE]`
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+from noqx.registry import build_index
+
+CHILD = """
+import resource, sys, time
+start = time.perf_counter()
+{setup}
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(elapsed, peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024)
+"""
+
+SETUPS: Dict[str, str] = {
+    "eager": "\n".join(
+        (
+            "import pkgutil",
+            "from noqx.manager import load_solver",
+            "for module_info in pkgutil.iter_modules(['solver']):",
+            "    load_solver('solver', module_info.name)",
+        )
+    ),
+    "lazy": "from noqx.registry import load_index\nassert load_index('solver', sys.argv[1])",
+    "lazy + first use": "from noqx.registry import load_index\nfrom noqx.manager import get_solver\n"
+    "assert load_index('solver', sys.argv[1])\nget_solver(sys.argv[2])",
+}
+
+# the server-side modules are not shipped in the PyScript bundle
+SERVER_MODULES = ("batch.py", "cache.py", "clingo.py", "flight.py", "hint.py", "pool.py", "propagator.py", "registry.py")
+
+
+def startup(setup: str, index_path: str, first_use: str, repeat: int) -> Tuple[float, float]:
+    """Run the setup in fresh interpreters and get the minimum time and the peak memory (in MiB)."""
+    runs: List[Tuple[float, float]] = []
+    for _ in range(repeat):
+        code = CHILD.format(setup=setup)
+        output = subprocess.run(
+            [sys.executable, "-c", code, index_path, first_use], capture_output=True, check=True, text=True
+        )
+        elapsed, peak = output.stdout.split()
+        runs.append((float(elapsed), float(peak)))
+
+    return min(run[0] for run in runs), max(run[1] for run in runs)
+
+
+def bundle_sizes() -> Dict[str, int]:
+    """Get the sizes (in bytes) of the PyScript bundle with the eager and the lazy solver loading."""
+    core = 0
+    for dirname in ("noqx", "noqx/puzzle", "noqx/rule"):
+        for filename in os.listdir(dirname):
+            if filename.endswith(".py") and filename not in SERVER_MODULES:
+                core += os.path.getsize(os.path.join(dirname, filename))
+
+    solvers = [os.path.join("solver", f) for f in os.listdir("solver") if f.endswith(".py") and f != "__init__.py"]
+    solver_sizes = [os.path.getsize(path) for path in solvers]
+    return {
+        "eager": core + os.path.getsize("solver/__init__.py") + sum(solver_sizes),
+        "lazy": core + os.path.getsize("solver/__init__.py"),
+        "per solver (avg)": sum(solver_sizes) // len(solver_sizes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the startup with the eager and the lazy solver loading.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="the number of fresh interpreters for each mode.")
+    parser.add_argument("-f", "--first-use", type=str, default="sudoku", help="the solver imported on first use.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index_path = os.path.join(tmpdir, "solver_index.json")
+        index = build_index("solver")
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+
+        print(f"{'server':<20}{'startup (ms)':>14}{'peak memory (MiB)':>20}")
+        for mode, setup in SETUPS.items():
+            elapsed, peak = startup(setup, index_path, args.first_use, args.repeat)
+            print(f"{mode:<20}{elapsed * 1000:>14.3f}{peak:>20.1f}")
+
+        print(f"\n{'pyscript bundle':<20}{'size (KiB)':>14}")
+        for mode, size in bundle_sizes().items():
+            print(f"{mode:<20}{size / 1024:>14.1f}")
+
+        print(f"{'metadata index':<20}{os.path.getsize(index_path) / 1024:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
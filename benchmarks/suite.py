@@ -0,0 +1,220 @@
+"""Benchmark every solver example with per-phase timings.
+
+* The phases are `decode` (`prepare_puzzle`), `generate` (`generate_program`), `ground` and `solve` ([Clingo](https://potassco.org/clingo/)), and `pack` (`store_solution` and `encode` for all the models). The timings are the medians over the repetitions in milliseconds, and the statistics of the ground program and the search are recorded from the last repetition.
+
+* The examples with puzz.link URLs are skipped, since the URLs are converted by the web frontend only.
+
+* With `--portfolio K`, every example is solved by `K` threads racing with the configurations in `noqx.clingo.PORTFOLIO` (or the single `configuration` of the solver), and the configuration of the winning thread is recorded. The `winners` command counts the winners per puzzle type, which suggests the default configuration of every solver.
+
+* Usage:
+    * `python -m benchmarks.suite run [-p PUZZLE ...] [-r REPEAT] [-o OUTPUT] [-pf PORTFOLIO]`, the output can be either a `.json` or a `.csv` file.
+    * `python -m benchmarks.suite compare BASE NEW [-t THRESHOLD] [-m MIN_MS]`, the process exits with code 1 if any regression is found.
+    * `python -m benchmarks.suite winners RESULT`
+"""
+
+import argparse
+import csv
+import json
+import platform
+import sys
+import time
+from statistics import median
+from typing import Any, Dict, List, Optional
+
+import clingo
+
+from benchmarks import iter_examples, load_solvers
+from noqx.clingo import ClingoSolver, Config
+from noqx.manager import generate_program, prepare_puzzle, store_solution
+
+PHASES = ("decode", "generate", "ground", "solve", "pack")
+STATISTICS = ("models", "exhausted", "atoms", "rules", "bodies", "choices", "conflicts", "restarts", "winner")
+FIELDS = ("puzzle", "example", "size", "status") + tuple(f"{phase}_ms" for phase in PHASES) + ("total_ms",) + STATISTICS
+
+
+def run_example(puzzle_name: str, puzzle_content: str, param: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a single example once and record the timings of every phase and the statistics."""
+    timings: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    puzzle = prepare_puzzle(puzzle_name, puzzle_content, param)
+    timings["decode"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    program = generate_program(puzzle)
+    timings["generate"] = time.perf_counter() - start
+
+    solver = ClingoSolver()
+    models = list(solver.iter_solve(program))
+    timings["ground"] = solver.ground_time
+    timings["solve"] = solver.solve_time
+
+    start = time.perf_counter()
+    for model in models:
+        store_solution(puzzle, model).encode()
+    timings["pack"] = time.perf_counter() - start
+
+    result: Dict[str, Any] = {"size": f"{puzzle.row}x{puzzle.col}"}
+    result.update({f"{phase}_ms": timings[phase] * 1000 for phase in PHASES})
+    result.update(solver.statistics())
+    result["models"] = len(models)
+    result["status"] = "ok" if result.get("exhausted") or len(models) >= solver.max_models > 0 else "timeout"
+    return result
+
+
+def run(puzzle_names: List[str], repeat: int) -> List[Dict[str, Any]]:
+    """Run all the examples and collect the records."""
+    records: List[Dict[str, Any]] = []
+    for puzzle_name, index, example, param in iter_examples(puzzle_names):
+        record: Dict[str, Any] = {"puzzle": puzzle_name, "example": index}
+        puzzle_content = example.get("data")
+        if puzzle_content is None:
+            records.append({**record, "status": "skipped"})
+            continue
+
+        try:
+            results = [run_example(puzzle_name, puzzle_content, param) for _ in range(repeat)]
+        except Exception as err:
+            records.append({**record, "status": f"error: {err}"})
+            continue
+
+        record.update(results[-1])
+        for phase in PHASES:
+            record[f"{phase}_ms"] = round(median(result[f"{phase}_ms"] for result in results), 3)
+
+        record["total_ms"] = round(sum(record[f"{phase}_ms"] for phase in PHASES), 3)
+        records.append(record)
+        print(
+            f"{puzzle_name:<20}{index:>4}{record['size']:>8}{record['total_ms']:>12.3f} ms  {record['status']}",
+            file=sys.stderr,
+        )
+
+    return records
+
+
+def save(records: List[Dict[str, Any]], path: Optional[str], repeat: int):
+    """Save the records into a JSON or CSV file, or print them as JSON if no path is given."""
+    if path is not None and path.endswith(".csv"):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(records)
+        return
+
+    content = {
+        "meta": {
+            "python": platform.python_version(),
+            "clingo": clingo.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "time_limit": Config.time_limit,
+            "max_solutions_to_find": Config.max_solutions_to_find,
+            "portfolio": Config.portfolio,
+        },
+        "records": records,
+    }
+    if path is None:
+        print(json.dumps(content, indent=2))
+        return
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(content, f, indent=2)
+
+
+def load(path: str) -> Dict[Any, Dict[str, Any]]:
+    """Load the records from a JSON or CSV file and index them by (`puzzle`, `example`)."""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            records: List[Dict[str, Any]] = list(csv.DictReader(f))
+        else:
+            records = json.load(f)["records"]
+
+    return {(record["puzzle"], int(record["example"])): record for record in records}
+
+
+def compare(base_path: str, new_path: str, threshold: float, min_ms: float) -> int:
+    """Compare two result files and report the regressions.
+
+    * A phase regresses if it is slower than the base by more than `threshold` (relative) and `min_ms` (absolute). An example regresses if it was solved in the base but not in the new results.
+
+    Returns:
+        The number of regressions.
+    """
+    base, new = load(base_path), load(new_path)
+    regressions = 0
+    base_total, new_total = 0.0, 0.0
+    for key, new_record in new.items():
+        base_record = base.get(key)
+        if base_record is None or base_record["status"] != "ok":
+            continue
+
+        if new_record["status"] != "ok":
+            print(f"{key[0]:<20}{key[1]:>4}  status: ok -> {new_record['status']}")
+            regressions += 1
+            continue
+
+        base_total += float(base_record["total_ms"])
+        new_total += float(new_record["total_ms"])
+        for field in tuple(f"{phase}_ms" for phase in PHASES) + ("total_ms",):
+            old_ms, new_ms = float(base_record[field]), float(new_record[field])
+            if new_ms > old_ms * (1 + threshold) and new_ms - old_ms > min_ms:
+                print(f"{key[0]:<20}{key[1]:>4}  {field}: {old_ms:.3f} -> {new_ms:.3f} ({new_ms / max(old_ms, 1e-9):.2f}x)")
+                regressions += 1
+
+    if new_total > 0:
+        print(
+            f"total: {base_total:.3f} ms -> {new_total:.3f} ms ({new_total / base_total:.2f}x), {regressions} regression(s)."
+        )
+
+    return regressions
+
+
+def winners(path: str) -> Dict[str, Dict[str, int]]:
+    """Count the winning configurations of the solved examples per puzzle type in a result file recorded with `--portfolio`."""
+    counts: Dict[str, Dict[str, int]] = {}
+    for (puzzle_name, _), record in sorted(load(path).items()):
+        if record["status"] == "ok" and record.get("winner"):
+            counts.setdefault(puzzle_name, {}).setdefault(record["winner"], 0)
+            counts[puzzle_name][record["winner"]] += 1
+
+    for puzzle_name, count in counts.items():
+        ranking = ", ".join(f"{name} ({n})" for name, n in sorted(count.items(), key=lambda item: -item[1]))
+        print(f"{puzzle_name:<20}{ranking}")
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every solver example with per-phase timings.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmark.")
+    run_parser.add_argument("-p", "--puzzle", nargs="*", default=[], help="the puzzles to benchmark, default to all.")
+    run_parser.add_argument("-r", "--repeat", type=int, default=3, help="the number of repeats for each example.")
+    run_parser.add_argument("-o", "--output", type=str, default=None, help="the output file (.json or .csv).")
+    run_parser.add_argument("-tl", "--time-limit", type=int, default=Config.time_limit, help="time limit in seconds.")
+    run_parser.add_argument("-pf", "--portfolio", type=int, default=0, help="the number of threads racing, 0 to disable.")
+
+    compare_parser = subparsers.add_parser("compare", help="compare two result files.")
+    compare_parser.add_argument("base", type=str, help="the base result file.")
+    compare_parser.add_argument("new", type=str, help="the new result file.")
+    compare_parser.add_argument("-t", "--threshold", type=float, default=0.2, help="the relative threshold of regressions.")
+    compare_parser.add_argument("-m", "--min-ms", type=float, default=5.0, help="the absolute threshold of regressions.")
+
+    winners_parser = subparsers.add_parser("winners", help="count the winning configurations per puzzle type.")
+    winners_parser.add_argument("result", type=str, help="the result file recorded with --portfolio.")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        Config.time_limit = args.time_limit
+        Config.portfolio = args.portfolio
+        load_solvers()
+        save(run(args.puzzle, args.repeat), args.output, args.repeat)
+    elif args.command == "winners":
+        winners(args.result)
+    else:
+        sys.exit(1 if compare(args.base, args.new, args.threshold, args.min_ms) > 0 else 0)
+
+
+if __name__ == "__main__":
+    main()
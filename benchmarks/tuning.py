@@ -0,0 +1,143 @@
+"""Sweep the candidate solver configurations over the examples of every solver and report the best profile.
+
+* Every example is grounded and solved with each profile in `CANDIDATES`, together with the `current` profile from `noqx.manager.Solver.solver_config`. A profile is only eligible for a solver if it finds the same number of models as the current profile for all the examples within the time limit.
+
+* Every profile is solved in a forked process, since clasp may crash with some configurations (e.g., `crafty` on the Binairo examples).
+
+* The best profile of a solver is the eligible profile with the minimum total time, which is reported only if it is faster than the current profile by `--min-speedup`. The report is a JSON file mapping the puzzle names to the best profiles, which can be copied to the `solver_config` attributes of the solvers.
+
+* Usage: `python -m benchmarks.tuning [-p PUZZLE ...] [-r REPEAT] [-o OUTPUT] [-s MIN_SPEEDUP] [-tl TIME_LIMIT]`
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks import iter_examples, load_solvers
+from noqx.clingo import ClingoSolver, Config
+from noqx.manager import generate_program, modules, prepare_puzzle
+
+CANDIDATES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "crafty": {"configuration": "crafty"},
+    "trendy": {"configuration": "trendy"},
+    "frumpy": {"configuration": "frumpy"},
+    "jumpy": {"configuration": "jumpy"},
+    "handy": {"configuration": "handy"},
+    "eq-0": {"eq": 0},
+    "eq-5": {"eq": 5},
+    "sat-prepro": {"sat-prepro": 2},
+    "domain-neg": {"heuristic": "Domain", "dom-mod": "neg,show"},
+}
+
+
+def solve(program: str, solver_config: Dict[str, Any], repeat: int) -> Tuple[float, Optional[int]]:
+    """Solve the program with a profile and get the minimum total time and the number of models.
+
+    * The number of models is `None` if the search is not exhausted within the time limit.
+    """
+    best, count = float("inf"), None
+    for _ in range(repeat):
+        solver = ClingoSolver(solver_config=solver_config)
+        solver.solve(program)
+        exhausted = solver.statistics().get("exhausted") or len(solver.model) >= solver.max_models > 0
+        best = min(best, solver.ground_time + solver.solve_time)
+        count = len(solver.model) if exhausted else None
+
+    return best, count
+
+
+def _solve_worker(conn: Connection, program: str, solver_config: Dict[str, Any], repeat: int):
+    """Solve the program in a forked process and send the result back."""
+    conn.send(solve(program, solver_config, repeat))
+    conn.close()
+
+
+def solve_isolated(program: str, solver_config: Dict[str, Any], repeat: int) -> Tuple[float, Optional[int]]:
+    """Solve the program with a profile in a forked process.
+
+    * If the process crashes, the time is infinite and the number of models is `-1`.
+    """
+    context = multiprocessing.get_context("fork")
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=_solve_worker, args=(child_conn, program, solver_config, repeat))
+    process.start()
+    child_conn.close()
+    try:
+        result: Tuple[float, Optional[int]] = parent_conn.recv()
+    except EOFError:
+        result = (float("inf"), -1)
+
+    process.join()
+    parent_conn.close()
+    return result
+
+
+def tune(puzzle_names: List[str], repeat: int, min_speedup: float) -> Dict[str, Dict[str, Any]]:
+    """Sweep the profiles over the examples and collect the report per puzzle type."""
+    totals: Dict[str, Dict[str, float]] = {}
+    counts: Dict[str, Dict[str, List[Optional[int]]]] = {}
+    for puzzle_name, index, example, param in iter_examples(puzzle_names):
+        puzzle_content = example.get("data")
+        if puzzle_content is None:
+            continue  # the puzz.link URLs are converted by the web frontend only
+
+        program = generate_program(prepare_puzzle(puzzle_name, puzzle_content, param))
+        current = modules[puzzle_name].solver_config
+        profiles = {"current": current, **{name: config for name, config in CANDIDATES.items() if config != current}}
+        for name, solver_config in profiles.items():
+            elapsed, count = solve_isolated(program, solver_config, repeat)
+            totals.setdefault(puzzle_name, {}).setdefault(name, 0.0)
+            totals[puzzle_name][name] += elapsed
+            counts.setdefault(puzzle_name, {}).setdefault(name, []).append(count)
+
+        print(f"{puzzle_name:<20}{index:>4}  {totals[puzzle_name]['current'] * 1000:>12.3f} ms", file=sys.stderr)
+
+    report: Dict[str, Dict[str, Any]] = {}
+    for puzzle_name, puzzle_totals in totals.items():
+        expected = counts[puzzle_name]["current"]
+        if None in expected or -1 in expected:
+            continue  # the current profile times out or crashes, so the models cannot be verified
+
+        eligible = {name: total for name, total in puzzle_totals.items() if counts[puzzle_name][name] == expected}
+        best = min(eligible, key=lambda name: eligible[name])
+        speedup = puzzle_totals["current"] / eligible[best]
+        if speedup < min_speedup:
+            best = "current"
+
+        report[puzzle_name] = {
+            "best": best,
+            "solver_config": CANDIDATES.get(best, modules[puzzle_name].solver_config),
+            "speedup": round(speedup, 3),
+            "total_ms": {name: round(total * 1000, 3) for name, total in puzzle_totals.items()},
+        }
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep the solver configurations over the examples of every solver.")
+    parser.add_argument("-p", "--puzzle", nargs="*", default=[], help="the puzzles to tune, default to all.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="the number of repeats for each example.")
+    parser.add_argument("-o", "--output", type=str, default=None, help="the output JSON report.")
+    parser.add_argument("-s", "--min-speedup", type=float, default=1.2, help="the minimum speedup to report a profile.")
+    parser.add_argument("-tl", "--time-limit", type=int, default=Config.time_limit, help="time limit in seconds.")
+    args = parser.parse_args()
+
+    Config.time_limit = args.time_limit
+    load_solvers()
+
+    report = tune(args.puzzle, args.repeat, args.min_speedup)
+    for puzzle_name, result in report.items():
+        print(f"{puzzle_name:<20}{result['best']:<12}{result['speedup']:>8.2f}x  {json.dumps(result['solver_config'])}")
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,18 @@
 """Entry point for the noqx project."""
 
 import argparse
+import asyncio
 import json
 import logging
 import os
-import pkgutil
 import shutil
 import sys
 import traceback
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from noqx.clingo import Config, run_solver
-from noqx.manager import list_solver_metadata, load_solver
+from noqx.clingo import Config, cache_stats, iter_solver, run_solver, warm_caches
+from noqx.manager import list_solver_metadata, program_cache
+from noqx.registry import load_solvers
 
 # argument parser
 parser = argparse.ArgumentParser(description="Noqx startup settings.")
@@ -20,12 +21,30 @@ parser.add_argument("-p", "--port", default=8000, type=int, help="the port to ru
 parser.add_argument("-d", "--debug", action="store_true", help="whether to enable debug mode with auto-reloading.")
 parser.add_argument("-tl", "--time-limit", default=Config.time_limit, type=int, help="time limit in seconds.")
 parser.add_argument("-pt", "--parallel-threads", default=Config.parallel_threads, type=int, help="parallel threads.")
+parser.add_argument("-pf", "--portfolio", default=Config.portfolio, type=int, help="threads racing with clasp portfolio.")
+parser.add_argument("-gtl", "--ground-time-limit", default=Config.ground_time_limit, type=int, help="grounding time limit.")
+parser.add_argument("-ml", "--memory-limit", default=Config.memory_limit, type=int, help="worker memory limit in MiB.")
+parser.add_argument("-w", "--workers", default=1, type=int, help="solver worker processes, 0 to solve in server threads.")
+parser.add_argument("-q", "--queue-size", default=16, type=int, help="maximum puzzles waiting for a solver worker.")
+parser.add_argument("-cs", "--cache-size", default=Config.cache_size, type=int, help="solved puzzles kept in memory.")
+parser.add_argument("-cp", "--cache-path", default=Config.cache_path, type=str, help="path of the on-disk solution cache.")
+parser.add_argument("-pc", "--program-cache-size", default=Config.program_cache_size, type=int, help="programs in memory.")
+parser.add_argument("-gc", "--ground-cache-path", default=Config.ground_cache_path, type=str, help="path of the ground cache.")
+parser.add_argument("-W", "--warm-cache", action="store_true", help="warm the caches with all the solver examples.")
 parser.add_argument("-B", "--build-document", action="store_true", help="build the documentation site.")
 parser.add_argument("-D", "--deployment-mode", action="store_true", help="enable deployment mode for static sites.")
 parser.add_argument("-O", "--offline-mode", action="store_true", help="enable offline mode.")
 args = parser.parse_args()
 Config.time_limit = args.time_limit
 Config.parallel_threads = args.parallel_threads
+Config.portfolio = args.portfolio
+Config.ground_time_limit = args.ground_time_limit
+Config.memory_limit = args.memory_limit
+Config.cache_size = args.cache_size
+Config.cache_path = args.cache_path
+Config.program_cache_size = args.program_cache_size
+Config.ground_cache_path = args.ground_cache_path
+program_cache.max_entries = args.program_cache_size
 
 # logging setup
 log_level = "DEBUG" if args.debug else "INFO"
@@ -234,8 +253,8 @@ if __name__ == "main" or (__name__ == "__main__" and args.deployment_mode):
 
     # load the solvers
     logging.debug("Loading solvers...")
-    for module_info in pkgutil.iter_modules(["solver"]):
-        load_solver("solver", module_info.name)
+    if not load_solvers("solver", "./build/solver_index.json"):
+        logging.debug("Solver index rebuilt.")
 
     with open("penpa-edit/js/solver_metadata.js", "w", encoding="utf-8", newline="\n") as f:
         # dump the metadata to a javascript file for further import
@@ -262,10 +281,13 @@ if args.deployment_mode:
         "files": {},
         "plugins": ["!codemirror", "!deprecation-manager", "!donkey", "!error", "!py-editor", "!py-game", "!py-terminal"],
     }
+    server_modules = ("batch.py", "cache.py", "clingo.py", "flight.py", "hint.py", "pool.py", "propagator.py", "registry.py")
     for dirname in ["noqx", "noqx/puzzle", "noqx/rule", "solver"]:
         for filename in os.listdir(dirname):
-            if filename.endswith(".py") and filename != "clingo.py":
-                pyscript_config["files"][f"./py/{dirname}/{filename}"] = f"{dirname}/{filename}"
+            if filename.endswith(".py") and filename not in server_modules:
+                if dirname != "solver" or filename == "__init__.py":  # the solvers are fetched by the frontend on first use
+                    pyscript_config["files"][f"./py/{dirname}/{filename}"] = f"{dirname}/{filename}"
+
                 shutil.copy(f"./{dirname}/{filename}", f"./dist/page/penpa-edit/py/{dirname}/{filename}")
 
     if args.offline_mode:
@@ -284,17 +306,70 @@ if args.deployment_mode:
 else:
     # starlette app setup
     try:
+        from contextlib import asynccontextmanager
+
         import uvicorn
         from starlette.applications import Starlette
+        from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
         from starlette.config import environ
         from starlette.requests import Request
-        from starlette.responses import JSONResponse
+        from starlette.responses import JSONResponse, Response, StreamingResponse
         from starlette.routing import Mount, Route
         from starlette.staticfiles import StaticFiles
+        from starlette.types import Receive, Scope, Send
     except ImportError:
         logging.error("starlette or uvicorn is not installed. Please install the 'web' optional dependencies.")
         sys.exit(1)
 
+    from noqx.batch import error_status, solve_batch, split_lines
+    from noqx.flight import SingleFlight, request_key
+    from noqx.hint import run_hint
+    from noqx.pool import SolverPool
+
+    if args.warm_cache and __name__ == "main":
+        # the solvers are loaded in the app module only, and the warmed programs are copied to the solver workers
+        logging.debug("Warming caches...")
+        logging.info(f"Caches warmed with {warm_caches()}.")
+
+    pool = SolverPool(workers=args.workers, queue_size=args.queue_size) if args.workers > 0 else None
+    if pool is None and __name__ == "main":  # the puzzles are solved in the app module without workers
+        if Config.memory_limit > 0:  # the server process would run out of memory with a large puzzle
+            logging.warning("The memory limit is only applied to the solver workers, and it is ignored without workers.")
+            Config.memory_limit = 0
+
+        if Config.ground_time_limit > 0:  # the grounder cannot be interrupted in the server process
+            logging.warning("The grounding time limit is only checked after the grounding ends without workers.")
+
+    flight = SingleFlight()  # the identical requests in flight share a single solving process
+
+    class DuplexStreamingResponse(StreamingResponse):
+        """A streaming response that is sent while the request body is still being read.
+
+        * The streaming response of starlette listens for the disconnection by receiving the request messages, which would drop the chunks of the request body not read yet. Here the disconnection is found by reading the request body instead.
+        """
+
+        async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+            await self.stream_response(send)
+
+    @asynccontextmanager
+    async def lifespan(_: Starlette):
+        """Start the solver workers with the server."""
+        if pool is not None:
+            await pool.start()
+
+        yield
+
+        if pool is not None:
+            await pool.close()
+
+    def error_response(err: Exception) -> JSONResponse:
+        """Convert an error raised during solving to a response with the corresponding status code."""
+        status = error_status(err)
+        if status in (400, 500):
+            logging.error(traceback.format_exc())
+
+        return JSONResponse({"detail": "Unknown error." if status == 500 else str(err)}, status_code=status)
+
     async def solver_api(request: Request) -> JSONResponse:
         """The solver endpoint of the server."""
         try:
@@ -302,27 +377,106 @@ else:
             puzzle_name: str = body["puzzle_name"]
             puzzle: str = body["puzzle"]
             param: Dict[str, Any] = body["param"]
-            result = run_solver(puzzle_name, puzzle, param)
+            mode: str = body.get("mode", "enumerate")
+            stats: bool = bool(body.get("stats", False))
+            key = request_key("solve", puzzle_name, puzzle, param, mode, stats)
+            if pool is not None:
+                result = await flight.run(key, lambda: pool.solve(puzzle_name, puzzle, param, mode, stats))
+            else:
+                result = await flight.run(key, lambda: run_in_threadpool(run_solver, puzzle_name, puzzle, param, mode, stats))
             return JSONResponse(result)
-        except ValueError as err:
-            logging.error(traceback.format_exc())
-            return JSONResponse({"detail": str(err)}, status_code=400)
-        except TimeoutError as err:
-            return JSONResponse({"detail": str(err)}, status_code=504)
-        except Exception:  # pragma: no cover
-            logging.error(traceback.format_exc())
-            return JSONResponse({"detail": "Unknown error."}, status_code=500)
+        except Exception as err:
+            return error_response(err)
+
+    async def solver_stream_api(request: Request) -> Response:
+        """The streaming solver endpoint of the server, which sends every solution as a line of JSON once it is found."""
+        try:
+            body = await request.json()
+            puzzle_name: str = body["puzzle_name"]
+            puzzle: str = body["puzzle"]
+            param: Dict[str, Any] = body["param"]
+            mode: str = body.get("mode", "enumerate")
+            key = request_key("stream", puzzle_name, puzzle, param, mode)
+            if pool is not None:
+                solutions = flight.stream(key, lambda: pool.solve_stream(puzzle_name, puzzle, param, mode))
+            else:
+                solutions = flight.stream(key, lambda: iterate_in_threadpool(iter_solver(puzzle_name, puzzle, param, mode)))
+
+            first_solution: Optional[str] = await solutions.__anext__()  # report the early errors with status codes
+        except StopAsyncIteration:
+            first_solution = None
+        except Exception as err:
+            return error_response(err)
+
+        async def ndjson_lines() -> AsyncIterator[str]:
+            if first_solution is None:
+                return
+
+            yield json.dumps({"url": first_solution}) + "\n"
+            try:
+                async for solution in solutions:
+                    yield json.dumps({"url": solution}) + "\n"
+            except TimeoutError as err:
+                yield json.dumps({"detail": str(err), "status": 504}) + "\n"
+            except Exception:  # pragma: no cover
+                logging.error(traceback.format_exc())
+                yield json.dumps({"detail": "Unknown error.", "status": 500}) + "\n"
+
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+    async def batch_api(request: Request) -> Response:
+        """The batch solver endpoint of the server, which reads every puzzle as a line of JSON and sends every result as a line of JSON once it is solved."""
+
+        async def ndjson_lines() -> AsyncIterator[str]:
+            lines = split_lines(request.stream())  # the puzzles are read while the results are sent
+            async for result in solve_batch(lines, pool, pool.workers if pool is not None else 1):
+                yield json.dumps(result) + "\n"
+
+        return DuplexStreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+    async def hint_api(request: Request) -> JSONResponse:
+        """The hint endpoint of the server, which finds a forced deduction of the puzzle with the cells fixed by the user."""
+        try:
+            body = await request.json()
+            puzzle_name: str = body["puzzle_name"]
+            puzzle: str = body["puzzle"]
+            param: Dict[str, Any] = body["param"]
+            fixed: List[str] = list(body.get("fixed", []))
+            cell: Optional[Tuple[int, int]] = tuple(body["cell"]) if body.get("cell") is not None else None  # type: ignore
+            if pool is not None:
+                result = await pool.run(run_hint, puzzle_name, puzzle, param, fixed, cell)
+            else:
+                result = await run_in_threadpool(run_hint, puzzle_name, puzzle, param, fixed, cell)
+            return JSONResponse(result)
+        except Exception as err:
+            return error_response(err)
+
+    async def metrics_api(_: Request) -> JSONResponse:
+        """The metrics endpoint of the server, where the caches are reported by the server process or a solver worker."""
+        try:
+            caches = cache_stats() if pool is None else await pool.run(cache_stats, timeout=5)
+        except (asyncio.QueueFull, TimeoutError):
+            caches = None
+
+        pending = pool.pending if pool is not None else 0
+        return JSONResponse({"single_flight": flight.stats(), "pending": pending, "caches": caches})
 
     routes = [
         Mount(
             "/api",
             name="api",
-            routes=[Route("/solve/", endpoint=solver_api, methods=["POST"])],
+            routes=[
+                Route("/solve/", endpoint=solver_api, methods=["POST"]),
+                Route("/solve/stream/", endpoint=solver_stream_api, methods=["POST"]),
+                Route("/solve/batch/", endpoint=batch_api, methods=["POST"]),
+                Route("/hint/", endpoint=hint_api, methods=["POST"]),
+                Route("/metrics/", endpoint=metrics_api, methods=["GET"]),
+            ],
         ),
         Mount("/penpa-edit/", StaticFiles(directory="penpa-edit", html=True), name="penpa-edit"),
         Mount("/", StaticFiles(directory="site", html=True), name="docs"),
     ]
-    app = Starlette(routes=routes)
+    app = Starlette(routes=routes, lifespan=lifespan)
     environ["DEBUG"] = "TRUE" if args.debug else "FALSE"
 
     # start the server
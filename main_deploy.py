@@ -4,10 +4,26 @@ from typing import Any, Dict
 
 from pyscript import window  # type: ignore  # noqa: I001
 
-from noqx.manager import generate_program, load_solver, prepare_puzzle, store_solution
+from noqx.manager import generate_program, prepare_puzzle, register_solver, store_solution
 from noqx.puzzle import Puzzle
 
 
+def _install_solver(solver_name: str, source: str):
+    try:
+        with open(f"solver/{solver_name}.py", "w") as f:
+            f.write(source)
+
+        return {
+            "success": True,
+            "result": solver_name,
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "result": str(e),
+        }
+
+
 def _prepare_puzzle(puzzle_name: str, puzzle_content: str, param: Dict[str, Any]):
     try:
         return {
@@ -48,8 +64,9 @@ def _store_solution(puzzle: Puzzle, model_str: str):
 
 
 for solver_name in window.puzzle_list:
-    load_solver("solver", solver_name)
+    register_solver("solver", solver_name)  # the solver module is installed by the frontend on first use
 
+window.install_solver = _install_solver
 window.prepare_puzzle = _prepare_puzzle
 window.generate_program = _generate_program
 window.store_solution = _store_solution
@@ -0,0 +1,252 @@
+"""Solve many puzzles in one call, with the results streamed as lines of JSON once they are solved.
+
+* Every input line is a JSON object with the `puzzle_name`, `puzzle` and optional `param`, `mode`, `stats` and `id` fields, which are the same as the body of the `/api/solve/` endpoint. The `id` is a string or an integer, which defaults to the index of the line.
+
+* Every output line is a JSON object with the `id`, the `status` code (see `error_status`), and either the fields of the result or the `detail` of the error.
+
+* Usage: `python -m noqx.batch [INPUT] [-o OUTPUT] [-w WORKERS] [-tl TIME_LIMIT] [-s SOLVER_DIR]`. The puzzles are read from `INPUT` (default to stdin). If `OUTPUT` exists, it is used as the checkpoint of a previous run: the puzzles with a final status are skipped, and the new results are appended to it.
+"""
+
+import argparse
+import asyncio
+import codecs
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import IO, Any, AsyncIterable, AsyncIterator, Collection, Dict, Iterable, Optional, Set, Union
+
+from noqx.clingo import Config, run_solver
+from noqx.pool import SolverPool
+
+# the results with these status codes are solved again when resuming from a checkpoint
+RETRYABLE_STATUS = (500, 503, 504)
+
+
+def error_status(err: Exception) -> int:
+    """Get the status code of an error raised during solving.
+
+    * `400` for invalid puzzles or parameters, `413` for exceeding the memory limit, `503` for a full queue, `504` for exceeding the time limit, and `500` for the other errors.
+
+    Args:
+        err: The error raised during solving.
+    """
+    if isinstance(err, (ValueError, KeyError, TypeError)):
+        return 400
+
+    if isinstance(err, TimeoutError):
+        return 504
+
+    if isinstance(err, MemoryError):
+        return 413
+
+    if isinstance(err, asyncio.QueueFull):
+        return 503
+
+    return 500
+
+
+def valid_id(identifier: Any) -> bool:
+    """Check whether an identifier is a string or an integer."""
+    return isinstance(identifier, (str, int)) and not isinstance(identifier, bool)
+
+
+def item_id(line: str, index: int) -> Union[str, int]:
+    """Get the identifier of an input line, or the index of the line if it has no valid identifier."""
+    try:
+        item = json.loads(line)
+    except ValueError:
+        return index
+
+    identifier = item.get("id", index) if isinstance(item, dict) else index
+    return identifier if valid_id(identifier) else index
+
+
+async def solve_item(line: str, index: int, pool: Optional[SolverPool]) -> Dict[str, Any]:
+    """Solve the puzzle of an input line and get the output line.
+
+    * If the pool is full of other jobs, the puzzle waits for a free slot of the pool.
+
+    Args:
+        line: The input line.
+        index: The index of the input line.
+        pool: The pool of solver workers, or `None` to solve in the threads of the event loop.
+    """
+    identifier = item_id(line, index)
+    try:
+        item = json.loads(line)
+        if not isinstance(item, dict):
+            raise ValueError("The puzzle is not a JSON object.")
+
+        if not valid_id(item.get("id", index)):
+            raise ValueError(f"Invalid id: {item['id']}.")
+
+        solve_args = (item["puzzle_name"], item["puzzle"], item.get("param", {}), item.get("mode", "enumerate"))
+        stats = bool(item.get("stats", False))
+        if pool is not None:
+            result = await pool.solve(*solve_args, stats, wait=True)  # the pool is shared with other requests
+        else:
+            result = await asyncio.get_event_loop().run_in_executor(None, run_solver, *solve_args, stats)
+
+        return {"id": identifier, "status": 200, **result}
+    except Exception as err:
+        status = error_status(err)
+        return {"id": identifier, "status": status, "detail": "Unknown error." if status == 500 else str(err)}
+
+
+async def solve_batch(
+    lines: AsyncIterable[str], pool: Optional[SolverPool], concurrency: int, skip: Collection[Any] = ()
+) -> AsyncIterator[Dict[str, Any]]:
+    """Solve the puzzles of the input lines concurrently, and yield the output lines in the order of completion.
+
+    * At most `concurrency` puzzles are solved at the same time, and the input lines are only read when a slot is free, so the input can be longer than the memory.
+    * If the iteration is closed early, the puzzles still being solved are cancelled.
+
+    Args:
+        lines: The input lines, the blank lines are ignored.
+        pool: The pool of solver workers, or `None` to solve in the threads of the event loop.
+        concurrency: The maximum number of puzzles solved at the same time.
+        skip: The identifiers of the puzzles to be skipped.
+    """
+    running: Set[asyncio.Future[Dict[str, Any]]] = set()
+    index = 0
+    try:
+        async for line in lines:
+            if not line.strip():
+                continue
+
+            if item_id(line, index) not in skip:
+                running.add(asyncio.ensure_future(solve_item(line, index, pool)))
+
+            index += 1
+            while len(running) >= max(1, concurrency):
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+
+        while running:
+            done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:  # the output is closed early, so the puzzles still running release their pool slots and workers
+        for task in running:
+            task.cancel()
+
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+async def read_lines(f: IO[str]) -> AsyncIterator[str]:
+    """Read the lines of a file without blocking the event loop."""
+    loop = asyncio.get_event_loop()
+    while True:
+        line = await loop.run_in_executor(None, f.readline)
+        if not line:
+            break
+
+        yield line
+
+
+async def split_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split a stream of UTF-8 encoded chunks into lines, so the lines are read without loading the whole stream.
+
+    Args:
+        chunks: The chunks of the stream, which may end in the middle of a line or a character.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+def load_checkpoint(lines: Iterable[str]) -> Set[Any]:
+    """Get the identifiers of the puzzles with a final status from the output lines of a previous run.
+
+    * A truncated last line (e.g., the previous run is killed) and the lines without a valid identifier are ignored.
+    """
+    finished = set()
+    for line in lines:
+        try:
+            result = json.loads(line)
+        except ValueError:
+            continue
+
+        if not isinstance(result, dict) or not valid_id(result.get("id")):
+            continue
+
+        if result.get("status") not in RETRYABLE_STATUS:
+            finished.add(result["id"])
+
+    return finished
+
+
+async def run_batch(
+    input_file: IO[str], output_file: IO[str], workers: int, skip: Collection[Any] = (), solver_dir: str = "solver"
+) -> Dict[int, int]:
+    """Solve the puzzles from the input file in a new pool, and write the output lines once the puzzles are solved.
+
+    Args:
+        input_file: The file of input lines.
+        output_file: The file of output lines.
+        workers: The number of solver worker processes.
+        skip: The identifiers of the puzzles to be skipped.
+        solver_dir: The directory where the solvers are located.
+
+    Returns:
+        The number of results for every status code.
+    """
+    counts: Dict[int, int] = {}
+    pool = SolverPool(workers=workers, queue_size=0, solver_dir=solver_dir)
+    await pool.start()
+    try:
+        async for result in solve_batch(read_lines(input_file), pool, workers, skip):
+            output_file.write(json.dumps(result) + "\n")
+            output_file.flush()  # every line is a checkpoint
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+    finally:
+        await pool.close()
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve many puzzles from lines of JSON.")
+    parser.add_argument("input", nargs="?", default="-", help="the input file, default to stdin.")
+    parser.add_argument("-o", "--output", type=str, default=None, help="the output file and checkpoint, default to stdout.")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="solver worker processes.")
+    parser.add_argument("-tl", "--time-limit", type=int, default=Config.time_limit, help="time limit in seconds.")
+    parser.add_argument("-s", "--solver-dir", type=str, default="solver", help="the directory of the solvers.")
+    args = parser.parse_args()
+
+    Config.time_limit = args.time_limit
+    skip: Set[Any] = set()
+    if args.output is not None and os.path.exists(args.output):
+        with open(args.output, encoding="utf-8") as f:
+            lines = f.readlines()
+            skip = load_checkpoint(lines)
+
+        if lines and not lines[-1].endswith("\n"):  # the previous run is killed while writing a line
+            with open(args.output, "a", encoding="utf-8") as f:
+                f.write("\n")
+
+        print(f"Resuming from {args.output} with {len(skip)} finished puzzles.", file=sys.stderr)
+
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        input_file = sys.stdin if args.input == "-" else stack.enter_context(open(args.input, encoding="utf-8"))
+        output_file = sys.stdout if args.output is None else stack.enter_context(open(args.output, "a", encoding="utf-8"))
+        counts = asyncio.run(run_batch(input_file, output_file, args.workers, skip, args.solver_dir))
+
+    summary = ", ".join(f"{count} x {status}" for status, count in sorted(counts.items()))
+    print(f"Solved {sum(counts.values())} puzzles in {time.perf_counter() - start:.1f} seconds ({summary}).", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""The content-addressed caches for the solutions and the ground programs generated by [Clingo](https://potassco.org/clingo/)."""
+
+import contextlib
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from noqx.manager import get_solver, problem_data
+from noqx.puzzle import Puzzle
+
+# the version of the cache keys, which is bumped to drop the stored solutions once the keys change
+CACHE_SCHEMA = 2
+
+_module_versions: Dict[str, Tuple[int, int, str]] = {}
+
+
+def solver_version(puzzle_name: str) -> str:
+    """Get the version of a solver module by hashing its source file.
+
+    * The digest is recomputed only when the modification time or the size of the source file changes, so an edited solver will never reuse the stale solutions.
+
+    Args:
+        puzzle_name: The name of the puzzle.
+    """
+    module = sys.modules[get_solver(puzzle_name).__class__.__module__]
+    path = getattr(module, "__file__", None)
+    if path is None:  # pragma: no cover
+        return "unknown"
+
+    stat = os.stat(path)
+    version = _module_versions.get(path)
+    if version is None or version[:2] != (stat.st_mtime_ns, stat.st_size):
+        with open(path, "rb") as f:
+            version = (stat.st_mtime_ns, stat.st_size, hashlib.sha256(f.read()).hexdigest())
+
+        _module_versions[path] = version
+
+    return version[2]
+
+
+def puzzle_digest(puzzle: Puzzle, param: Dict[str, Any], limits: Tuple[Any, ...] = ()) -> str:
+    """Generate a cache key from the decoded puzzle.
+
+    * The key contains the puzzle name, the normalized puzzle elements, the problem data from `noqx.manager.problem_data`, the sorted parameters, the solver limits, the version of the solver module and `CACHE_SCHEMA`. Different payloads of the same board (e.g., with different styles in [Penpa+](https://swaroopg92.github.io/penpa-edit/)) share the same key.
+
+    Args:
+        puzzle: The decoded `Puzzle` object.
+        param: The parameters for the puzzle.
+        limits: The limits of the solver that might change the solutions.
+    """
+    content = (
+        puzzle.puzzle_name,
+        puzzle.row,
+        puzzle.col,
+        tuple(puzzle.margin),
+        sorted(puzzle.surface.items()),
+        sorted(puzzle.text.items()),
+        sorted(puzzle.symbol.items()),
+        sorted(puzzle.edge.items()),
+        sorted(puzzle.line.items()),
+        problem_data(puzzle),
+        sorted((str(k), repr(v)) for k, v in param.items()),
+        limits,
+        solver_version(puzzle.puzzle_name),
+        CACHE_SCHEMA,
+    )
+    return hashlib.sha256(repr(content).encode()).hexdigest()
+
+
+class SolutionCache:
+    """A two-tier LRU cache that stores the raw models of the solved puzzles.
+
+    * The first tier is an in-memory LRU dictionary. The second tier is an optional [SQLite](https://www.sqlite.org/) database on disk, which is shared by all the processes using the same path, and the least recently used entries are evicted when the total size exceeds the limit.
+
+    * The raw models are stored instead of the encoded URLs, so the solutions can always be packed into the payload of the current request.
+    """
+
+    def __init__(self, max_entries: int = 256, path: Optional[str] = None, max_bytes: int = 64 * 1024 * 1024):
+        """Initialize the cache.
+
+        Args:
+            max_entries: The maximum number of entries in the memory tier.
+            path: The path of the SQLite database. If it is `None`, the disk tier is disabled.
+            max_bytes: The maximum size (in bytes) of the stored models in the disk tier.
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        self._memory: OrderedDict[str, List[str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = -1
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Get the database connection of the current process."""
+        if self.path is None:
+            return None
+
+        if self._conn is None or self._pid != os.getpid():  # a forked process needs a new connection
+            self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS solution (key TEXT PRIMARY KEY, model TEXT, size INTEGER, accessed REAL)"
+            )
+            self._conn.commit()
+            self._pid = os.getpid()
+
+        return self._conn
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Get the models from the cache.
+
+        Args:
+            key: The cache key generated by `puzzle_digest`.
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return list(self._memory[key])
+
+            conn = self._connect()
+            if conn is not None:
+                row = conn.execute("SELECT model FROM solution WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE solution SET accessed = ? WHERE key = ?", (time.time(), key))
+                    conn.commit()
+                    models = row[0].split("\n") if row[0] else []
+                    self._store_memory(key, models)
+                    self.hits += 1
+                    return list(models)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, models: List[str]):
+        """Store the models into the cache.
+
+        Args:
+            key: The cache key generated by `puzzle_digest`.
+            models: The raw models generated by the [Clingo](https://potassco.org/clingo/) solver.
+        """
+        with self._lock:
+            self._store_memory(key, list(models))
+
+            conn = self._connect()
+            if conn is not None:
+                data = "\n".join(models)
+                conn.execute("INSERT OR REPLACE INTO solution VALUES (?, ?, ?, ?)", (key, data, len(data), time.time()))
+                total_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM solution").fetchone()[0]
+                while total_size > self.max_bytes:
+                    row = conn.execute("SELECT key, size FROM solution ORDER BY accessed LIMIT 1").fetchone()
+                    conn.execute("DELETE FROM solution WHERE key = ?", (row[0],))
+                    total_size -= row[1]
+
+                conn.commit()
+
+    def _store_memory(self, key: str, models: List[str]):
+        """Store the models into the memory tier and evict the least recently used entries."""
+        if self.max_entries <= 0:
+            return
+
+        self._memory[key] = models
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        """Remove all the entries in both tiers and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            conn = self._connect()
+            if conn is not None:
+                conn.execute("DELETE FROM solution")
+                conn.commit()
+
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get the statistics of the cache."""
+        with self._lock:
+            disk_entries, disk_bytes = 0, 0
+            conn = self._connect()
+            if conn is not None:
+                disk_entries, disk_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM solution").fetchone()
+
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "disk_bytes": disk_bytes,
+            }
+
+
+class GroundCache:
+    """An on-disk cache of the ground programs in the [aspif](https://potassco.org/clingo/) format, so the identical programs skip the grounding.
+
+    * Every ground program is stored as a file named by its key in the cache directory, which is shared by all the processes using the same path. A new file is written to a temporary path and renamed, so the readers never see a partial file.
+
+    * The least recently used files are removed when the total size exceeds the limit. A file is touched on every hit, so its modification time is the access time.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        """Initialize the cache, and create the cache directory if it does not exist.
+
+        Args:
+            path: The directory of the cache files.
+            max_bytes: The maximum total size (in bytes) of the cache files.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(program: str, arguments: List[str], version: str) -> str:
+        """Generate a cache key from the program and the options that change the ground program.
+
+        Args:
+            program: The ASP program to be grounded.
+            arguments: The command-line arguments of the grounder, e.g., the constants.
+            version: The version of [Clingo](https://potassco.org/clingo/).
+        """
+        return hashlib.sha256(f"{version}\n{arguments}\n{program}".encode()).hexdigest()
+
+    def _file(self, key: str) -> str:
+        """Get the path of the cache file."""
+        return os.path.join(self.path, f"{key}.aspif")
+
+    def get(self, key: str) -> Optional[str]:
+        """Get the path of a ground program from the cache.
+
+        Args:
+            key: The cache key generated by `key`.
+        """
+        path = self._file(key)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+
+            return None
+
+        with self._lock:
+            self.hits += 1
+
+        return path
+
+    def put(self, key: str, dump: Callable[[str], None]) -> str:
+        """Store a ground program into the cache and remove the least recently used files.
+
+        Args:
+            key: The cache key generated by `key`.
+            dump: The function writing the ground program to the given path.
+
+        Returns:
+            The path of the ground program.
+        """
+        path = self._file(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            dump(temp_path)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        with self._lock:
+            self.stores += 1
+            self._evict(path)
+
+        return path
+
+    def discard(self, key: str):
+        """Remove a ground program from the cache, e.g., a file which cannot be loaded.
+
+        Args:
+            key: The cache key generated by `key`.
+        """
+        with contextlib.suppress(OSError):
+            os.remove(self._file(key))
+
+    def _files(self) -> List[Tuple[float, int, str]]:
+        """List the cache files in the format of (`mtime`, `size`, `path`)."""
+        files = []
+        for filename in os.listdir(self.path):
+            if filename.endswith(".aspif"):
+                try:
+                    stat = os.stat(os.path.join(self.path, filename))
+                except OSError:  # removed by another process
+                    continue
+
+                files.append((stat.st_mtime, stat.st_size, os.path.join(self.path, filename)))
+
+        return files
+
+    def _evict(self, keep: str):
+        """Remove the least recently used files beyond the size limit, except the newly stored one."""
+        files = sorted(self._files())
+        total_size = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total_size <= self.max_bytes:
+                break
+
+            if path != keep:
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+
+                total_size -= size
+
+    def clear(self):
+        """Remove all the cache files and reset the counters."""
+        with self._lock:
+            for _, _, path in self._files():
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+
+            self.hits = 0
+            self.misses = 0
+            self.stores = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get the statistics of the cache."""
+        with self._lock:
+            files = self._files()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "disk_entries": len(files),
+                "disk_bytes": sum(size for _, size, _ in files),
+            }
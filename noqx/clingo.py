@@ -1,14 +1,30 @@
 """The [Clingo](https://potassco.org/clingo/) backend that generates solutions for the given ASP problem."""
 
+import hashlib
 import logging
+import re
+import sys
+import threading
 import time
-from typing import Any, Dict, List
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from clingo.control import Control
+from clingo import __version__ as clingo_version
+from clingo.backend import HeuristicType
+from clingo.control import BackendType, Control
 from clingo.core import MessageCode
 from clingo.solving import Model
+from clingo.symbol import Function
 
-from noqx.manager import generate_program, prepare_puzzle, store_solution
+from noqx.cache import GroundCache, SolutionCache, puzzle_digest
+from noqx.manager import generate_program, get_solver, prepare_puzzle, program_cache, store_solution, warm_program_cache
+from noqx.propagator import ConnectivityPropagator
+from noqx.puzzle import Puzzle
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore  # not available on Windows
 
 
 def clingo_logging_handler(code: MessageCode, message: str) -> None:  # pragma: no cover
@@ -39,20 +55,231 @@ class Config:
         time_limit: The time limit (in seconds) for solving a puzzle (default = 30).
         max_solutions_to_find: The maximum number of solutions to find (default = 10).
         parallel_threads: The number of parallel threads to use for solving (default = 1).
+        cache_size: The maximum number of solved puzzles kept in memory, `0` disables the memory cache (default = 256).
+        cache_path: The path of the on-disk solution cache, `None` disables the disk cache (default = None).
+        cache_disk_size: The maximum size (in bytes) of the on-disk solution cache (default = 64 MiB).
+        connectivity_propagator: Whether to check the connectivity with `noqx.propagator.ConnectivityPropagator` for the rules using the `propagator` backend (default = True).
+        session_size: The maximum number of grounded programs with guarded parameters kept in memory for multi-shot solving, `0` disables the reuse (default = 8). It also limits the grounded puzzles kept by `noqx.hint`.
+        ground_time_limit: The time limit (in seconds) for grounding a puzzle, `0` disables the limit (default = 30). The grounding cannot be interrupted, see `set_ground_timeout_handler` for details.
+        memory_limit: The maximum address space (in MiB) of a solver worker process in `noqx.pool.SolverPool`, `0` disables the limit (default = 0). The limit is not applied to the process solving without workers.
+        portfolio: The number of threads racing on the same ground program with the configurations in `PORTFOLIO`, which overrides `parallel_threads`. `0` or `1` disables the portfolio (default = 0).
+        program_cache_size: The maximum number of generated programs kept in `noqx.manager.program_cache`, `0` disables the program cache (default = 256).
+        ground_cache_path: The directory of the on-disk ground program cache, `None` disables the ground cache (default = None).
+        ground_cache_disk_size: The maximum size (in bytes) of the on-disk ground program cache (default = 256 MiB).
     """
 
     time_limit: int = 30
     max_solutions_to_find: int = 10
     parallel_threads: int = 1
+    cache_size: int = 256
+    cache_path: Optional[str] = None
+    cache_disk_size: int = 64 * 1024 * 1024
+    connectivity_propagator: bool = True
+    session_size: int = 8
+    ground_time_limit: int = 30
+    memory_limit: int = 0
+    portfolio: int = 0
+    program_cache_size: int = 256
+    ground_cache_path: Optional[str] = None
+    ground_cache_disk_size: int = 256 * 1024 * 1024
+
+
+# the leading configurations of the built-in clasp portfolio, which are assigned to the threads in this order
+PORTFOLIO = ("tweety", "trendy", "frumpy", "crafty", "jumpy", "handy")
+# the single configurations of clasp, which are assigned to all the threads instead of the portfolio
+CONFIGURATIONS = ("frumpy", "jumpy", "tweety", "handy", "crafty", "trendy")
+DEFAULT_SOLVER_CONFIG: Dict[str, Any] = {"trans-ext": "dynamic", "eq": 1}
+DOMAIN_MODIFIERS = {
+    "level": HeuristicType.Level,
+    "sign": HeuristicType.Sign,
+    "factor": HeuristicType.Factor,
+    "init": HeuristicType.Init,
+    "true": HeuristicType.True_,
+    "false": HeuristicType.False_,
+}
+PARAM_EXTERNAL = re.compile(r"^#external noqx_param\((\w+)\)\. \[(true|false)\]$", re.M)
+
+_solution_cache: Optional[SolutionCache] = None
+_ground_cache: Optional[GroundCache] = None
+_ground_timeout_handler: Optional[Callable[[], None]] = None
+
+
+def get_solution_cache() -> SolutionCache:
+    """Get the solution cache of the current process, which is created with the settings from `Config` on first use."""
+    global _solution_cache
+    if _solution_cache is None:
+        _solution_cache = SolutionCache(Config.cache_size, Config.cache_path, Config.cache_disk_size)
+
+    return _solution_cache
+
+
+def get_ground_cache() -> Optional[GroundCache]:
+    """Get the ground program cache of the current process, which is created with the settings from `Config` on first use.
+
+    * `None` is returned if `Config.ground_cache_path` is not set.
+    """
+    global _ground_cache
+    if Config.ground_cache_path is None:
+        return None
+
+    if _ground_cache is None or _ground_cache.path != Config.ground_cache_path:
+        _ground_cache = GroundCache(Config.ground_cache_path, Config.ground_cache_disk_size)
+
+    return _ground_cache
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Get the statistics of the solution cache, the program cache and the ground program cache of the current process."""
+    ground_cache = get_ground_cache()
+    return {
+        "solution": get_solution_cache().stats(),
+        "program": program_cache.stats(),
+        "ground": ground_cache.stats() if ground_cache is not None else None,
+    }
+
+
+def peak_memory() -> int:
+    """Get the peak memory (in MiB) of the current process, or `0` if it is not available."""
+    if resource is None:  # pragma: no cover
+        return 0
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // (1024 * 1024) if sys.platform == "darwin" else peak // 1024  # bytes on macOS, KiB on Linux
+
+
+def set_ground_timeout_handler(handler: Optional[Callable[[], None]]):
+    """Set the handler called by a watchdog thread once the grounding exceeds `Config.ground_time_limit`.
+
+    * The grounder cannot be interrupted, so the handler should end the process, e.g., the worker processes of `noqx.pool.SolverPool` report the error to the pool and exit. Without a handler, the limit is only checked after the grounding ends.
+
+    Args:
+        handler: The function called without arguments, or `None` to remove the handler.
+    """
+    global _ground_timeout_handler
+    _ground_timeout_handler = handler
+
+
+def config_arguments(solver_config: Dict[str, Any]) -> List[str]:
+    """Convert a solver configuration (see `noqx.manager.Solver.solver_config`) to the command-line arguments of [Clingo](https://potassco.org/clingo/).
+
+    * The default options in `DEFAULT_SOLVER_CONFIG` are overridden by the solver configuration. The domain heuristics are not converted since they are applied on the ground program.
+
+    Args:
+        solver_config: The solver configuration.
+    """
+    config = {**DEFAULT_SOLVER_CONFIG, **solver_config}
+    if config.get("domain"):
+        config.setdefault("heuristic", "Domain")
+
+    return [f"--{key}={value}" for key, value in config.items() if key != "domain"]
+
+
+def parse_domain(domain: Dict[str, str]) -> List[Tuple[str, int, HeuristicType, int]]:
+    """Parse the domain heuristics of a solver configuration into (`name`, `arity`, `modifier`, `bias`) tuples.
+
+    Args:
+        domain: The predicate signatures mapped to the modifiers with optional biases, e.g., `{"black/2": "false"}`.
+
+    Raises:
+        ValueError: If a signature or a modifier is invalid.
+    """
+    heuristics = []
+    for signature, modifier in domain.items():
+        name, _, arity = signature.partition("/")
+        _type, _, bias = str(modifier).partition(",")
+        valid_bias = bias == "" or bias.strip().lstrip("-").isdigit()
+        if not arity.isdigit() or _type not in DOMAIN_MODIFIERS or not valid_bias:
+            raise ValueError(f"Invalid domain heuristic: {signature} {modifier}.")
+
+        heuristics.append((name, int(arity), DOMAIN_MODIFIERS[_type], int(bias) if bias else 1))
+
+    return heuristics
+
+
+def parse_mode(mode: str) -> Tuple[str, int]:
+    """Parse a solve mode into the mode name and the maximum number of models to find.
+
+    * `first`: find the first solution only.
+    * `unique`: find at most two solutions to check the uniqueness, only the first one is packed.
+    * `enumerate:N`: find at most `N` solutions, `enumerate` without a number uses `Config.max_solutions_to_find`.
+    * `count`: count all the solutions without packing, `count:N` stops counting at `N` solutions.
+
+    Args:
+        mode: The solve mode.
+
+    Raises:
+        ValueError: If the solve mode is invalid.
+    """
+    name, _, limit = str(mode).partition(":")
+    if name == "enumerate":
+        if limit == "":
+            return name, Config.max_solutions_to_find
+
+        if limit.isdigit() and int(limit) > 0:
+            return name, int(limit)
+
+    elif name == "count" and limit.isdigit() and int(limit) > 0:
+        return name, int(limit)
+
+    elif limit == "" and name in ("first", "unique", "count"):
+        return name, {"first": 1, "unique": 2, "count": 0}[name]
+
+    raise ValueError(f"Invalid solve mode: {mode}.")
+
+
+def dump_ground(program: str, arguments: List[str], path: str):
+    """Ground the program and write the ground program to a file in the [aspif](https://potassco.org/clingo/) format.
+
+    * The ground program is passed to the file only, and the (empty) solving step closes the output.
+
+    Args:
+        program: The ASP program to be grounded.
+        arguments: The command-line arguments of the grounder, e.g., the constants.
+        path: The path of the output file.
+    """
+    control = Control(arguments, logger=clingo_logging_handler)
+    control.register_backend(BackendType.Aspif, path, replace=True)
+    control.add(program=program)
+    control.ground()
+    control.solve()
+    del control  # the output file is flushed when the control object is released
 
 
 class ClingoSolver:
     """The [Clingo](https://potassco.org/clingo/) solver backend."""
 
-    def __init__(self):
-        """Initialize a solver instance and a model container."""
-        self.clingo_instance: Control = Control(logger=clingo_logging_handler)
+    def __init__(self, max_models: Optional[int] = None, solver_config: Optional[Dict[str, Any]] = None):
+        """Initialize a solver instance and a model container.
+
+        Args:
+            max_models: The maximum number of models to find, `0` finds all the models. If it is `None`, `Config.max_solutions_to_find` is used.
+            solver_config: The [Clingo](https://potassco.org/clingo/) options tuned for the puzzle, see `noqx.manager.Solver.solver_config`.
+
+        Raises:
+            ValueError: If the solver configuration is invalid.
+        """
+        self.use_propagator = Config.connectivity_propagator
+        self.portfolio = Config.portfolio if Config.portfolio > 1 else 0
+        self.solver_config: Dict[str, Any] = dict(solver_config or {})
+        self.domain = parse_domain(self.solver_config.get("domain", {}))
+        arguments = ["-c", "connectivity_propagator=1"] if self.use_propagator else []
+        if self.portfolio:
+            self.solver_config.pop("parallel-mode", None)
+            arguments.append(f"--parallel-mode={self.portfolio},compete")
+
+        arguments.extend(config_arguments(self.solver_config))
+        self.arguments = arguments
+        try:
+            self.clingo_instance: Control = Control(arguments, logger=clingo_logging_handler)
+        except RuntimeError as err:
+            raise ValueError(f"Invalid solver configuration: {err}") from err
+
+        self.max_models = Config.max_solutions_to_find if max_models is None else max_models
         self.model: List[str] = []
+        self.ground_time = 0.0
+        self.solve_time = 0.0
+        self.ground_cached: Optional[bool] = None
+        self.base: Optional[str] = None
 
     def store_model(self, model: Model):  # pragma: no cover
         """A wrapper to store the model on solving and convert the `Model` object to `str`.
@@ -62,64 +289,545 @@ class ClingoSolver:
         """
         self.model.append(str(model))
 
+    def ground(self, program: str):
+        """Configure the solver instance and ground the ASP problem.
+
+        * The solver instance configurations can be modified by the settings from `Config` class, and the options in the solver configuration. The number of threads from `Config.parallel_threads` is used unless the solver configuration sets the `parallel-mode` option.
+
+        * The domain heuristics of the solver configuration are added to the ground program for the atoms which are not facts.
+
+        * If `Config.portfolio` is enabled, the threads are configured by the built-in portfolio of clasp, and they compete for the same search, so the first thread finishing the search ends it for all the threads. See `PORTFOLIO` for the configurations.
+
+        * The grounding time (in seconds) is recorded in `ground_time`. The grounding is limited by `Config.ground_time_limit` and the memory limit of the process.
+
+        * If `Config.connectivity_propagator` is enabled and the program contains `propagate_connected` atoms, a `noqx.propagator.ConnectivityPropagator` is registered, and the flood-fill fallbacks are dropped by the `connectivity_propagator` constant.
+
+        * If the ground program cache is enabled (see `get_ground_cache`), the ground program is loaded from the cache, or grounded into the cache on a miss. Whether the ground program is loaded from the cache is recorded in `ground_cached`. The ground program only keeps the symbols of the shown atoms, so the programs with external atoms, propagators or domain heuristics are always grounded. If the cached file cannot be loaded (e.g., it is evicted by another process), the entry is dropped and the program is grounded as usual.
+
+        Args:
+            program: The ASP program to be grounded.
+
+        Raises:
+            TimeoutError: If the grounding exceeds `Config.ground_time_limit`.
+            MemoryError: If the grounding exceeds the memory limit.
+        """
+        start = time.perf_counter()
+        if self.use_propagator and "propagate_connected(" in program:
+            self.clingo_instance.register_propagator(ConnectivityPropagator())  # type: ignore
+
+        watchdog = None
+        if Config.ground_time_limit > 0 and _ground_timeout_handler is not None:
+            watchdog = threading.Timer(Config.ground_time_limit, _ground_timeout_handler)
+            watchdog.daemon = True
+            watchdog.start()
+
+        try:
+            self._load(program)
+            self.clingo_instance.ground()
+        except MemoryError:
+            limit = f" of {Config.memory_limit} MiB" if Config.memory_limit > 0 else ""
+            elapsed = time.perf_counter() - start
+            raise MemoryError(
+                f"Grounding exceeded the memory limit{limit} after {elapsed:.1f} seconds ({peak_memory()} MiB peak memory)."
+            ) from None
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+
+        # the solver instance is configured after the grounding, since `_load` may replace it
+        if not self.portfolio and "parallel-mode" not in self.solver_config:
+            self.clingo_instance.configuration.solve.parallel_mode = Config.parallel_threads  # type: ignore
+
+        self.clingo_instance.configuration.solve.models = self.max_models  # type: ignore
+        if self.domain:
+            with self.clingo_instance.backend() as backend:
+                for name, arity, modifier, bias in self.domain:
+                    for atom in self.clingo_instance.symbolic_atoms.by_signature(name, arity):
+                        if not atom.is_fact:
+                            backend.add_heuristic(atom.literal, modifier, bias, 1, [])
+
+        self.ground_time = time.perf_counter() - start
+        if 0 < Config.ground_time_limit < self.ground_time:
+            atoms = len(self.clingo_instance.symbolic_atoms)
+            raise TimeoutError(
+                f"Grounding time limit exceeded ({self.ground_time:.1f} seconds, {atoms} atoms, {peak_memory()} MiB peak memory)."
+            )
+
+        self.base = split_params(program)[0]
+
+    def _load(self, program: str):
+        """Add the program to the solver instance, or load its ground program from the ground program cache."""
+        ground_cache = get_ground_cache()
+        if (
+            ground_cache is None
+            or self.domain
+            or "#external" in program
+            or (self.use_propagator and "propagate_connected(" in program)
+        ):
+            self.clingo_instance.add(program=program)
+            return
+
+        key = GroundCache.key(program, self.arguments, clingo_version)
+        path = ground_cache.get(key)
+        self.ground_cached = path is not None
+        if path is None:
+            path = ground_cache.put(key, lambda temp_path: dump_ground(program, self.arguments, temp_path))
+
+        try:
+            self.clingo_instance.load_aspif([path])
+        except (RuntimeError, OSError):
+            logging.warning("[Cache] Ground program cannot be loaded, grounding again.")
+            ground_cache.discard(key)
+            self.ground_cached = False
+            self.clingo_instance = Control(
+                self.arguments, logger=clingo_logging_handler
+            )  # a failed load leaves the parser broken
+            self.clingo_instance.add(program=program)
+
+    def prepare(self, program: str):
+        """Ground the ASP problem on first use, or reuse the grounded program for another shot.
+
+        * The grounded program is reused if the program only differs in the defaults of the guarded parameters (see `noqx.manager.Solver.add_param_line`). The external atoms are assigned to the new values, and the models and the timings of the previous shot are cleared.
+
+        Args:
+            program: The ASP program to be solved.
+
+        Raises:
+            ValueError: If the solver is grounded with a different program.
+        """
+        if self.base is None:
+            self.ground(program)
+            return
+
+        base, values = split_params(program)
+        if base != self.base:
+            raise ValueError("The program differs from the grounded program.")
+
+        for param, value in values.items():
+            self.clingo_instance.assign_external(Function("noqx_param", [Function(param)]), value)
+
+        self.clingo_instance.configuration.solve.models = self.max_models  # type: ignore
+        self.model = []
+        self.ground_time = 0.0
+        self.solve_time = 0.0
+
     def solve(self, program: str):
         """Solve the ASP problem.
 
         * The solver instance configurations can be modified by the settings from `Config` class.
 
+        * The searching time (in seconds) is recorded in `solve_time`.
+
         Args:
             program: The ASP program to be solved.
         """
-        self.clingo_instance.configuration.asp.trans_ext = "dynamic"  # type: ignore
-        self.clingo_instance.configuration.asp.eq = 1  # type: ignore
-        self.clingo_instance.configuration.solve.parallel_mode = Config.parallel_threads  # type: ignore
-        self.clingo_instance.configuration.solve.models = Config.max_solutions_to_find  # type: ignore
-        self.clingo_instance.add(program=program)
-        self.clingo_instance.ground()
+        self.prepare(program)
+        start = time.perf_counter()
         with self.clingo_instance.solve(on_model=self.store_model, async_=True) as handle:  # type: ignore
             handle.wait(Config.time_limit)
             handle.cancel()
 
+        self.solve_time = time.perf_counter() - start
+
+    def iter_solve(self, program: str) -> Iterator[str]:
+        """Solve the ASP problem and yield the models as soon as they are found.
+
+        * The iteration stops when the search is exhausted, `max_models` models are found, or the search exceeds `Config.time_limit`. The search is cancelled if the iteration is closed early.
+
+        * The searching time (in seconds) is recorded in `solve_time`, excluding the time spent by the consumer between two models.
+
+        Args:
+            program: The ASP program to be solved.
+        """
+        self.prepare(program)
+        deadline = time.perf_counter() + Config.time_limit
+        with self.clingo_instance.solve(yield_=True, async_=True) as handle:  # type: ignore
+            while True:
+                start = time.perf_counter()
+                handle.resume()
+                finished = handle.wait(max(0.0, deadline - start))
+                self.solve_time += time.perf_counter() - start
+                if not finished:
+                    break  # time limit exceeded, the search is cancelled on exit
+
+                model = handle.model()
+                if model is None:
+                    break
+
+                self.store_model(model)
+                yield self.model[-1]
+
+    def count(self, program: str) -> Tuple[int, bool]:
+        """Count the models of the ASP problem without storing them.
+
+        * The models are neither converted to strings nor kept in `model`, so counting a large number of models only costs the search. The counting stops when the search is exhausted, `max_models` models are found, or the search exceeds `Config.time_limit`.
+
+        * The search looks for one more model than `max_models`, so the count is exact if the search is exhausted with exactly `max_models` models.
+
+        * The searching time (in seconds) is recorded in `solve_time`.
+
+        Args:
+            program: The ASP program to be solved.
+
+        Returns:
+            The number of models found, and whether it is exact, i.e., the search is exhausted within `max_models` models.
+        """
+        self.prepare(program)
+        if self.max_models > 0:
+            self.clingo_instance.configuration.solve.models = self.max_models + 1  # type: ignore
+
+        counter = [0]
+
+        def on_model(_: Model):  # pragma: no cover
+            counter[0] += 1
+
+        start = time.perf_counter()
+        with self.clingo_instance.solve(on_model=on_model, async_=True) as handle:  # type: ignore
+            finished = handle.wait(Config.time_limit)
+            handle.cancel()
+            exhausted = finished and handle.get().exhausted
+
+        self.solve_time = time.perf_counter() - start
+        if 0 < self.max_models < counter[0]:
+            return self.max_models, False
+
+        return counter[0], exhausted
+
     def solution(self) -> List[str]:
         """Get the solutions from the model container."""
         return self.model
 
+    def statistics(self) -> Dict[str, Any]:
+        """Get the statistics of the ground program and the search after solving.
+
+        * The statistics include the size of the ground program (`atoms`, `rules` and `bodies`), the search effort (`choices`, `conflicts` and `restarts`), the number of `models` and whether the search space is `exhausted`. An empty dictionary is returned if the statistics are not available.
+
+        * In the portfolio mode, the configuration of the thread that ends the search is reported as the `winner`. If the solver configuration sets a single `configuration`, all the threads run it, so it is the winner. The winner is left out for a portfolio read from a file.
+        """
+        try:
+            stats = self.clingo_instance.statistics
+            lp = stats["problem"]["lp"]
+            solvers = stats["solving"]["solvers"]
+            result: Dict[str, Any] = {
+                "atoms": int(lp["atoms"]),
+                "rules": int(lp["rules"]),
+                "bodies": int(lp["bodies"]),
+                "choices": int(solvers["choices"]),
+                "conflicts": int(solvers["conflicts"]),
+                "restarts": int(solvers["restarts"]),
+                "models": int(stats["summary"]["models"]["enumerated"]),
+                "exhausted": bool(stats["summary"]["exhausted"]),
+            }
+            configuration = str(self.solver_config.get("configuration", "auto"))
+            if self.portfolio and configuration in ("auto", "many"):
+                winner = int(stats["summary"]["winner"])
+                result["winner"] = PORTFOLIO[winner] if winner < len(PORTFOLIO) else f"many-{winner}"
+            elif self.portfolio and configuration in CONFIGURATIONS:
+                result["winner"] = configuration
+
+            return result
+        except (KeyError, RuntimeError):  # pragma: no cover
+            return {}
+
+
+def split_params(program: str) -> Tuple[str, Dict[str, bool]]:
+    """Split a program into the part without the defaults of the guarded parameters and the parameter values.
+
+    Args:
+        program: The ASP program generated by the solver.
+    """
+    values = {param: value == "true" for param, value in PARAM_EXTERNAL.findall(program)}
+    return PARAM_EXTERNAL.sub(lambda match: f"#external noqx_param({match.group(1)}).", program), values
+
+
+_sessions: "OrderedDict[str, ClingoSolver]" = OrderedDict()
+_sessions_lock = threading.Lock()
 
-def run_solver(puzzle_name: str, puzzle_content: str, param: Dict[str, Any]) -> Dict[str, List[str]]:
-    """Run the solver and get the list of converted [Penpa+](https://swaroopg92.github.io/penpa-edit/) solution URLs.
 
-    * This is a connector for the [Clingo](https://potassco.org/clingo/) solver, the puzzle, and the solutions. The connector prepares the puzzle, generates the program, runs the solver, and stores the solutions in a sequence. The solution time is also recorded for performance analysis.
+def acquire_session(program: str, max_models: int, solver_config: Optional[Dict[str, Any]] = None) -> Tuple[ClingoSolver, str]:
+    """Take a grounded solver of the program out of the session pool, or create a new solver.
+
+    * Only the programs with guarded parameters are kept in the pool. The sessions are keyed by the program without the parameter defaults, so a board solved with other parameters reuses the grounded program.
+
+    * The solver is removed from the pool while it is solving, so a session is never shared by two searches at the same time. It should be returned by `release_session` after the search.
+
+    Args:
+        program: The ASP program to be solved.
+        max_models: The maximum number of models to find, `0` finds all the models.
+        solver_config: The [Clingo](https://potassco.org/clingo/) options tuned for the puzzle.
+
+    Returns:
+        The solver and the session key, which is empty if the program cannot be reused.
+    """
+    if Config.session_size <= 0 or "#external noqx_param(" not in program:
+        return ClingoSolver(max_models, solver_config), ""
+
+    base = split_params(program)[0]
+    settings = (max_models, Config.parallel_threads, Config.portfolio, Config.connectivity_propagator, solver_config)
+    key = hashlib.sha256(f"{settings}\n{base}".encode()).hexdigest()
+    with _sessions_lock:
+        solver = _sessions.pop(key, None)
+
+    if solver is None:
+        return ClingoSolver(max_models, solver_config), key
+
+    logging.debug("[Solver] Grounded program reused.")
+    return solver, key
+
+
+def release_session(solver: ClingoSolver, key: str):
+    """Return a solver to the session pool, and drop the least recently used sessions beyond `Config.session_size`.
+
+    Args:
+        solver: The solver taken by `acquire_session`.
+        key: The session key from `acquire_session`.
+    """
+    if key == "" or solver.base is None:
+        return
+
+    with _sessions_lock:
+        _sessions[key] = solver
+        while len(_sessions) > Config.session_size:
+            _sessions.popitem(last=False)
+
+
+def iter_models(
+    puzzle_name: str,
+    puzzle_content: str,
+    param: Dict[str, Any],
+    max_models: int,
+    stats: Optional[Dict[str, Any]] = None,
+) -> Iterator[Tuple[Puzzle, str]]:
+    """Run the solver and yield the decoded puzzle with every raw model as soon as it is found.
+
+    * This is a connector for the [Clingo](https://potassco.org/clingo/) solver and the puzzle. The connector prepares the puzzle, generates the program and runs the solver. The solution time is also recorded for performance analysis.
+
+    * The models of a solved puzzle are stored in the solution cache, so the same board with the same parameters skips the program generation and solving next time.
+
+    * The grounded programs with guarded parameters are kept as sessions (see `acquire_session`), so the same board with other parameters is solved again without grounding.
+
+    * If a `stats` dictionary is given, it is filled with the timings (in milliseconds) of the `decode`, `generate`, `ground` and `solve` phases, whether the models are `cached`, whether the ground program is loaded from the ground program cache (`ground_cached`, `None` if the cache is not used), and the statistics from `ClingoSolver.statistics` once the iteration ends.
 
     Args:
         puzzle_name: The name of the puzzle.
         puzzle_content: The puzzle content exported in [Penpa+](https://swaroopg92.github.io/penpa-edit/) format.
         param: Additional parameters for the puzzle.
+        max_models: The maximum number of models to find, `0` finds all the models.
+        stats: A dictionary to collect the statistics of the solving process.
 
     Raises:
-        TimeoutError: If the solving process exceeds the time limit defined in `Config.time_limit`.
+        TimeoutError: If the solving process exceeds the time limit defined in `Config.time_limit`. The models found before are still yielded.
     """
     start = time.perf_counter()  # start the counter
     puzzle = prepare_puzzle(puzzle_name, puzzle_content, param)
+    decode_stop = time.perf_counter()
     logging.debug(f"[Solver] {str(puzzle_name).capitalize()} board unpacked.")
 
-    program = generate_program(puzzle)
+    cache = get_solution_cache()
+    cache_key = puzzle_digest(puzzle, param, (Config.time_limit, max_models))
+    models: Optional[Iterable[str]] = cache.get(cache_key)
+    generate_time = 0.0
+    solver: Optional[ClingoSolver] = None
+    session_key = ""
+
+    if models is None:
+        program = generate_program(puzzle)
+        generate_time = time.perf_counter() - decode_stop
+        solver, session_key = acquire_session(program, max_models, get_solver(puzzle.puzzle_name).solver_config)
+        models = solver.iter_solve(program)
+    else:
+        logging.debug(f"[Cache] {str(puzzle_name).capitalize()} solution found in cache.")
 
-    instance = ClingoSolver()
-    instance.solve(program)
-
-    solutions: List[str] = []
-    for solution in instance.solution():
-        solution = store_solution(puzzle, solution)
-        solutions.append(solution.encode())
-        logging.debug(f"[Solver] {str(puzzle_name).capitalize()} board packed.")
+    found: List[str] = []
+    for model in models:
+        found.append(model)
+        yield puzzle, model
 
     stop = time.perf_counter()  # stop the counter
 
+    if stats is not None:
+        stats["decode_ms"] = (decode_stop - start) * 1000
+        stats["generate_ms"] = generate_time * 1000
+        stats["ground_ms"] = solver.ground_time * 1000 if solver else 0.0
+        stats["ground_cached"] = solver.ground_cached if solver else None
+        stats["solve_ms"] = solver.solve_time * 1000 if solver else 0.0
+        stats["cached"] = solver is None
+        stats.update(solver.statistics() if solver else {})
+        stats["models"] = len(found)
+
+    if solver is not None:
+        release_session(solver, session_key)
+
     if (stop - start) >= Config.time_limit:
         logging.warning(f"[Solver] {str(puzzle_name).capitalize()} puzzle timed out.")
         raise TimeoutError("Time limit exceeded.")
 
+    cache.put(cache_key, found)
     logging.info(f"[Solver] {str(puzzle_name).capitalize()} puzzle solved.")
     logging.info(f"[Stats] {str(puzzle_name).capitalize()} solver took {stop - start} seconds.")
 
-    return {"url": solutions}
+
+def count_models(
+    puzzle_name: str,
+    puzzle_content: str,
+    param: Dict[str, Any],
+    max_models: int,
+    stats: Optional[Dict[str, Any]] = None,
+) -> Tuple[int, bool]:
+    """Run the solver and count the models without storing or packing them.
+
+    * The counts are not stored in the solution cache, and the grounded programs with guarded parameters are kept as sessions (see `acquire_session`).
+
+    * If a `stats` dictionary is given, it is filled with the same statistics as `iter_models`.
+
+    Args:
+        puzzle_name: The name of the puzzle.
+        puzzle_content: The puzzle content exported in [Penpa+](https://swaroopg92.github.io/penpa-edit/) format.
+        param: Additional parameters for the puzzle.
+        max_models: The maximum number of models to count, `0` counts all the models.
+        stats: A dictionary to collect the statistics of the solving process.
+
+    Returns:
+        The number of models, and whether it is exact. The count is not exact if there are more than `max_models` models or the counting exceeds the time limit defined in `Config.time_limit`.
+    """
+    start = time.perf_counter()
+    puzzle = prepare_puzzle(puzzle_name, puzzle_content, param)
+    decode_stop = time.perf_counter()
+
+    program = generate_program(puzzle)
+    generate_stop = time.perf_counter()
+    solver, session_key = acquire_session(program, max_models, get_solver(puzzle.puzzle_name).solver_config)
+    count, exact = solver.count(program)
+
+    if stats is not None:
+        stats["decode_ms"] = (decode_stop - start) * 1000
+        stats["generate_ms"] = (generate_stop - decode_stop) * 1000
+        stats["ground_ms"] = solver.ground_time * 1000
+        stats["ground_cached"] = solver.ground_cached
+        stats["solve_ms"] = solver.solve_time * 1000
+        stats["cached"] = False
+        stats.update(solver.statistics())
+        stats["models"] = count
+
+    release_session(solver, session_key)
+    if not exact and (max_models == 0 or count < max_models):
+        logging.warning(f"[Solver] {str(puzzle_name).capitalize()} puzzle counting timed out.")
+
+    logging.info(f"[Solver] {str(puzzle_name).capitalize()} puzzle counted with {count} solutions.")
+    return count, exact
+
+
+def iter_solver(puzzle_name: str, puzzle_content: str, param: Dict[str, Any], mode: str = "enumerate") -> Iterator[str]:
+    """Run the solver and yield the converted [Penpa+](https://swaroopg92.github.io/penpa-edit/) solution URLs as soon as they are found.
+
+    * Every model reported by `iter_models` is packed once it is found. In the `unique` mode, only the first model is packed, and the search continues until the second model is found or the search is exhausted.
+
+    Args:
+        puzzle_name: The name of the puzzle.
+        puzzle_content: The puzzle content exported in [Penpa+](https://swaroopg92.github.io/penpa-edit/) format.
+        param: Additional parameters for the puzzle.
+        mode: The solve mode, see `parse_mode` for details. The `count` mode is not supported since no solution is packed.
+
+    Raises:
+        ValueError: If the solve mode is invalid or `count`.
+        TimeoutError: If the solving process exceeds the time limit defined in `Config.time_limit`. The solutions found before are still yielded.
+    """
+    mode_name, max_models = parse_mode(mode)
+    if mode_name == "count":
+        raise ValueError("The count mode does not produce any solution.")
+
+    for index, (puzzle, model) in enumerate(iter_models(puzzle_name, puzzle_content, param, max_models)):
+        if mode_name == "unique" and index > 0:
+            continue
+
+        solution = store_solution(puzzle, model)
+        yield solution.encode()
+        logging.debug(f"[Solver] {str(puzzle_name).capitalize()} board packed.")
+
+
+def run_solver(
+    puzzle_name: str, puzzle_content: str, param: Dict[str, Any], mode: str = "enumerate", stats: bool = False
+) -> Dict[str, Any]:
+    """Run the solver and get the result of the given solve mode.
+
+    * In the `first` and `enumerate` modes, the result contains the list of converted [Penpa+](https://swaroopg92.github.io/penpa-edit/) solution URLs in `url`.
+
+    * In the `unique` mode, the result contains the URL of the first solution in `url`, and whether the solution is unique in `unique`.
+
+    * In the `count` mode, the result contains the number of solutions in `count`, and whether the number is `exact`. The solutions are counted by `count_models` without storing or packing them, and a search stopped by the cap or the time limit reports the solutions found before.
+
+    * If `stats` is enabled, the result also contains the statistics from `iter_models` in `stats`, with the packing time (in milliseconds) in `pack_ms`. It helps to find out whether the grounding or the search is the bottleneck of a slow puzzle.
+
+    Args:
+        puzzle_name: The name of the puzzle.
+        puzzle_content: The puzzle content exported in [Penpa+](https://swaroopg92.github.io/penpa-edit/) format.
+        param: Additional parameters for the puzzle.
+        mode: The solve mode, see `parse_mode` for details.
+        stats: Whether to include the statistics of the solving process.
+
+    Raises:
+        ValueError: If the solve mode is invalid.
+        TimeoutError: If the solving process exceeds the time limit defined in `Config.time_limit`, except in the `count` mode.
+    """
+    mode_name, max_models = parse_mode(mode)
+    if mode_name == "count":
+        solver_stats: Dict[str, Any] = {}
+        count, exact = count_models(puzzle_name, puzzle_content, param, max_models, solver_stats)
+        result: Dict[str, Any] = {"count": count, "exact": exact}
+        if stats:
+            solver_stats["pack_ms"] = 0.0
+            result["stats"] = solver_stats
+
+        return result
+
+    count = 0
+    pack_time = 0.0
+    urls: List[str] = []
+    solver_stats = {}
+    for puzzle, model in iter_models(puzzle_name, puzzle_content, param, max_models, solver_stats):
+        count += 1
+        if mode_name == "unique" and count > 1:
+            continue
+
+        pack_start = time.perf_counter()
+        solution = store_solution(puzzle, model)
+        urls.append(solution.encode())
+        pack_time += time.perf_counter() - pack_start
+        logging.debug(f"[Solver] {str(puzzle_name).capitalize()} board packed.")
+
+    result = {"url": urls}
+    if mode_name == "unique":
+        result["unique"] = count == 1
+
+    if stats:
+        solver_stats["pack_ms"] = pack_time * 1000
+        result["stats"] = solver_stats
+
+    return result
+
+
+def warm_caches(puzzle_names: Optional[List[str]] = None) -> Dict[str, int]:
+    """Generate the programs of the solver examples into the program cache, and ground them into the ground program cache if it is enabled.
+
+    * See `noqx.manager.warm_program_cache` for the examples used. The programs are grounded with the solver configurations of the puzzles, and the programs which cannot use the ground program cache are skipped.
+
+    Args:
+        puzzle_names: The puzzles to be warmed, all the puzzles are warmed if it is `None`.
+
+    Returns:
+        The number of `programs` generated and the number of ground programs stored (`grounded`).
+    """
+    programs = warm_program_cache(puzzle_names)
+    grounded = 0
+    if get_ground_cache() is not None:
+        for puzzle_name, program in programs:
+            solver = ClingoSolver(solver_config=get_solver(puzzle_name).solver_config)
+            try:
+                solver.ground(program)
+            except (TimeoutError, MemoryError):
+                continue
+
+            if solver.ground_cached is False:
+                grounded += 1
+
+    return {"programs": len(programs), "grounded": grounded}
@@ -0,0 +1,145 @@
+"""Coalesce the identical requests in flight, so they share a single solving process."""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+
+def request_key(*parts: Any) -> str:
+    """Generate the key of a request from its JSON-serializable parts, where the keys of the dictionaries are sorted."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class _Broadcast:
+    """An asynchronous iterator shared by many subscribers, where every subscriber receives all the items from the start."""
+
+    def __init__(self, source: AsyncIterator[Any]):
+        """Start iterating the source in a background task."""
+        self.items: List[Any] = []
+        self.error: Optional[BaseException] = None
+        self.done = False
+        self.subscribers = 0
+        self._changed = asyncio.Event()
+        self.task = asyncio.ensure_future(self._pump(source))
+
+    def _notify(self):
+        """Wake up the subscribers waiting for new items."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _pump(self, source: AsyncIterator[Any]):
+        """Iterate the source and notify the subscribers for every item."""
+        try:
+            async for item in source:
+                self.items.append(item)
+                self._notify()
+        except Exception as err:
+            self.error = err
+        finally:
+            self.done = True
+            self._notify()
+
+    def subscribe(self) -> AsyncIterator[Any]:
+        """Yield all the items of the source, and raise the error of the source if any.
+
+        * If all the subscribers leave before the source is exhausted, the source is cancelled.
+        """
+        self.subscribers += 1  # counted before the iteration starts, so the source is kept for the new subscriber
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        """Yield the items for a subscriber."""
+        index = 0
+        try:
+            while True:
+                while index < len(self.items):
+                    yield self.items[index]
+                    index += 1
+
+                if self.done:
+                    if self.error is not None:
+                        raise self.error
+
+                    return
+
+                await self._changed.wait()
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done:
+                self.task.cancel()
+
+
+class SingleFlight:
+    """Coalesce the concurrent requests with the same key, so only the first request starts a solving process and the others attach to it.
+
+    * All the requests with the same key receive the same result or the same error. The key is released once the process finishes, so the later requests start a new process (or hit the solution cache).
+
+    * The process keeps running if some of the requests are cancelled, e.g., the clients disconnect. A streaming process is cancelled if all of its requests leave.
+
+    * The metrics are available by `stats`, where `coalesced` is the number of saved solving processes.
+    """
+
+    def __init__(self):
+        """Initialize the coalescer without any requests in flight."""
+        self.requests = 0
+        self.coalesced = 0
+        self._calls: Dict[str, asyncio.Future[Any]] = {}
+        self._streams: Dict[str, _Broadcast] = {}
+
+    def _attach(self, existing: bool):
+        """Record a request."""
+        self.requests += 1
+        if existing:
+            self.coalesced += 1
+
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run the function for the first request with the key, and share its result with the concurrent requests.
+
+        Args:
+            key: The key of the request, see `request_key`.
+            func: The function starting the solving process.
+        """
+        task = self._calls.get(key)
+        self._attach(task is not None)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        return await asyncio.shield(task)
+
+    def stream(self, key: str, func: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """Iterate the items from the function for the first request with the key, and share them with the concurrent requests.
+
+        * A request attached later receives the items found before it attaches as well.
+
+        Args:
+            key: The key of the request, see `request_key`.
+            func: The function starting the streaming solving process.
+        """
+        broadcast = self._streams.get(key)
+        if broadcast is not None and broadcast.done:
+            broadcast = None  # the finished stream is waiting for its subscribers to drain
+
+        self._attach(broadcast is not None)
+        if broadcast is None:
+            broadcast = _Broadcast(func())
+            self._streams[key] = broadcast
+            broadcast.task.add_done_callback(lambda _: self._release(key, broadcast))
+
+        return broadcast.subscribe()
+
+    def _release(self, key: str, broadcast: _Broadcast):
+        """Release the key of a finished stream."""
+        if self._streams.get(key) is broadcast:
+            del self._streams[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Get the metrics of the coalescer.
+
+        * `requests`: The number of requests.
+        * `coalesced`: The number of requests attached to a process started by another request.
+        * `in_flight`: The number of processes running.
+        """
+        return {"requests": self.requests, "coalesced": self.coalesced, "in_flight": len(self._calls) + len(self._streams)}
@@ -0,0 +1,254 @@
+"""The hint engine that finds the forced deductions of a puzzle for interactive solving."""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from clingo.solving import Model
+from clingo.symbol import Symbol, SymbolType, parse_term
+
+from noqx.clingo import ClingoSolver, Config
+from noqx.manager import generate_program, get_solver, prepare_puzzle, store_solution
+from noqx.puzzle import Puzzle
+
+# the shown signatures of a program, see `noqx.rule.common.display`
+SHOW_SIGNATURE = re.compile(r"^#show (\w+)/(\d+)\.$", re.M)
+# the maximum number of consequences kept for the different fixed atoms of a session
+MAX_RESULTS = 32
+
+_sessions: "OrderedDict[str, HintSession]" = OrderedDict()
+_sessions_lock = threading.Lock()
+
+
+def parse_fixed(fixed: Sequence[str]) -> List[Tuple[Symbol, bool]]:
+    """Parse the atoms fixed by the user into [Clingo](https://potassco.org/clingo/) assumptions.
+
+    * An atom is assumed to be true, e.g., `black(1,2)`, and an atom with a leading `not` is assumed to be false, e.g., `not black(1,2)`.
+
+    Args:
+        fixed: The fixed atoms.
+
+    Raises:
+        ValueError: If an atom is invalid.
+    """
+    assumptions = []
+    for atom in fixed:
+        text = str(atom).strip()
+        value = not text.startswith("not ")
+        try:
+            symbol = parse_term(text if value else text[4:])
+        except RuntimeError as err:
+            raise ValueError(f"Invalid atom: {atom}.") from err
+
+        if symbol.type != SymbolType.Function or not symbol.positive:
+            raise ValueError(f"Invalid atom: {atom}.")
+
+        assumptions.append((symbol, value))
+
+    return assumptions
+
+
+def atom_cell(symbol: Symbol) -> Optional[Tuple[int, int]]:
+    """Get the cell of an atom from its first two arguments, or `None` if they are not numbers."""
+    args = symbol.arguments
+    if len(args) < 2 or args[0].type != SymbolType.Number or args[1].type != SymbolType.Number:
+        return None
+
+    return args[0].number, args[1].number
+
+
+class HintSession:
+    """A grounded puzzle that answers the hint queries with the consequences of the fixed atoms.
+
+    * The program is grounded once, and the fixed atoms are passed to the solver as assumptions, so fixing more cells does not ground the program again.
+
+    * The consequences of the same fixed atoms are kept for the next queries (see `MAX_RESULTS`).
+    """
+
+    def __init__(self, puzzle_name: str, puzzle_content: str, param: Dict[str, Any]):
+        """Decode the puzzle, generate the program and ground it.
+
+        Args:
+            puzzle_name: The name of the puzzle.
+            puzzle_content: The puzzle content exported in [Penpa+](https://swaroopg92.github.io/penpa-edit/) format.
+            param: Additional parameters for the puzzle.
+
+        Raises:
+            TimeoutError: If the grounding exceeds `Config.ground_time_limit`.
+            MemoryError: If the grounding exceeds the memory limit.
+        """
+        self.puzzle: Puzzle = prepare_puzzle(puzzle_name, puzzle_content, param)
+        self.program = generate_program(self.puzzle)
+        self.signatures = [(name, int(arity)) for name, arity in SHOW_SIGNATURE.findall(self.program)]
+        self.solver = ClingoSolver(0, get_solver(self.puzzle.puzzle_name).solver_config)
+        self.solver.ground(self.program)
+        self.lock = threading.Lock()
+        self.results: OrderedDict[Tuple[FrozenSet[Tuple[Symbol, bool]], str], Optional[Set[Symbol]]] = OrderedDict()
+        self.given: Dict[Symbol, bool] = {}
+
+    def consequences(self, assumptions: List[Tuple[Symbol, bool]], enum_mode: str = "cautious") -> Optional[Set[Symbol]]:
+        """Get the shown atoms true in all the models (`cautious`), or in any model (`brave`) under the assumptions.
+
+        * The consequences are only sound once the search is exhausted, so the search is not stopped after a number of models.
+
+        Args:
+            assumptions: The fixed atoms with their values.
+            enum_mode: The enumeration mode of [Clingo](https://potassco.org/clingo/), `cautious` or `brave`.
+
+        Returns:
+            The consequences, or `None` if there is no model under the assumptions.
+
+        Raises:
+            TimeoutError: If the search is not exhausted within `Config.time_limit`.
+        """
+        key = (frozenset(assumptions), enum_mode)
+        with self.lock:
+            if key in self.results:
+                self.results.move_to_end(key)
+                return self.results[key]
+
+            last: List[Set[Symbol]] = []
+
+            def on_model(model: Model):  # pragma: no cover
+                last[:] = [set(model.symbols(shown=True))]
+
+            control = self.solver.clingo_instance
+            control.configuration.solve.enum_mode = enum_mode  # type: ignore
+            start = time.perf_counter()
+            with control.solve(assumptions=assumptions, on_model=on_model, async_=True) as handle:  # type: ignore
+                finished = handle.wait(Config.time_limit)
+                handle.cancel()
+
+            self.solver.solve_time = time.perf_counter() - start
+            if not finished:
+                raise TimeoutError("Time limit exceeded.")
+
+            result = last[0] if last else None
+            self.results[key] = result
+            while len(self.results) > MAX_RESULTS:
+                self.results.popitem(last=False)
+
+            return result
+
+    def is_given(self, symbol: Symbol) -> bool:
+        """Check whether the element of an atom is already on the board, e.g., a given number of a number puzzle."""
+        if symbol not in self.given:
+            element = store_solution(self.puzzle, str(symbol))
+            self.given[symbol] = all(
+                getattr(self.puzzle, attr).get(point) == value
+                for attr in ("surface", "text", "symbol", "edge", "line")
+                for point, value in getattr(element, attr).items()
+            )
+
+        return self.given[symbol]
+
+    def candidates(self, r: int, c: int) -> Set[Symbol]:
+        """Get the ground atoms of the shown signatures on a cell."""
+        atoms = set()
+        for name, arity in self.signatures:
+            for atom in self.solver.clingo_instance.symbolic_atoms.by_signature(name, arity):
+                if atom_cell(atom.symbol) == (r, c):
+                    atoms.add(atom.symbol)
+
+        return atoms
+
+    def hint(self, fixed: Sequence[str] = (), cell: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+        """Find a forced deduction of the puzzle with the fixed atoms, and the forced atoms of a cell.
+
+        * The forced atoms are the cautious consequences which are not on the board and not fixed. The hint is the first forced atom in the row-major order, with its element packed as a [Penpa+](https://swaroopg92.github.io/penpa-edit/) URL.
+
+        * If a cell is given, the result contains the atoms of the cell that are true in all the models (`forced`) and the atoms that are false in all the models (`excluded`). The excluded atoms are found by the brave consequences, which are computed on the first cell query only.
+
+        * If there is no model with the fixed atoms, `conflict` is set and no hint is given.
+
+        Args:
+            fixed: The atoms fixed by the user, see `parse_fixed`.
+            cell: The row and the column of the cell to be queried.
+
+        Raises:
+            ValueError: If a fixed atom is invalid.
+            TimeoutError: If the search is not exhausted within `Config.time_limit`.
+        """
+        assumptions = parse_fixed(fixed)
+        cautious = self.consequences(assumptions)
+        if cautious is None:
+            return {"conflict": True, "forced": 0, "hint": None, "cell": None}
+
+        known = {symbol for symbol, value in assumptions if value}
+        forced = sorted(
+            (atom_cell(symbol), str(symbol), symbol)
+            for symbol in cautious
+            if symbol not in known and atom_cell(symbol) is not None and not self.is_given(symbol)
+        )
+        result: Dict[str, Any] = {"conflict": False, "forced": len(forced), "hint": None, "cell": None}
+        if forced:
+            (r, c), atom, _ = forced[0]
+            url = store_solution(self.puzzle, atom).encode()
+            result["hint"] = {"atom": atom, "row": r, "col": c, "url": url}
+
+        if cell is not None:
+            r, c = int(cell[0]), int(cell[1])
+            brave = self.consequences(assumptions, "brave") or set()
+            candidates = self.candidates(r, c)
+            result["cell"] = {
+                "row": r,
+                "col": c,
+                "forced": sorted(str(symbol) for symbol in candidates & cautious),
+                "excluded": sorted(str(symbol) for symbol in candidates - brave),
+            }
+
+        return result
+
+
+def get_session(puzzle_name: str, puzzle_content: str, param: Dict[str, Any]) -> HintSession:
+    """Get the hint session of a puzzle, or create a new session.
+
+    * The sessions are keyed by the puzzle and the parameters, and the least recently used sessions beyond `Config.session_size` are dropped.
+
+    Args:
+        puzzle_name: The name of the puzzle.
+        puzzle_content: The puzzle content exported in [Penpa+](https://swaroopg92.github.io/penpa-edit/) format.
+        param: Additional parameters for the puzzle.
+    """
+    key = hashlib.sha256(f"{puzzle_name}\n{sorted(param.items())}\n{puzzle_content}".encode()).hexdigest()
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is not None:
+            _sessions.move_to_end(key)
+            return session
+
+    session = HintSession(puzzle_name, puzzle_content, param)
+    with _sessions_lock:
+        session = _sessions.setdefault(key, session)  # another thread may create the same session
+        while len(_sessions) > max(Config.session_size, 1):
+            _sessions.popitem(last=False)
+
+    return session
+
+
+def run_hint(
+    puzzle_name: str,
+    puzzle_content: str,
+    param: Dict[str, Any],
+    fixed: Sequence[str] = (),
+    cell: Optional[Tuple[int, int]] = None,
+) -> Dict[str, Any]:
+    """Find a forced deduction of the puzzle with the fixed atoms, see `HintSession.hint` for the result.
+
+    * The grounded puzzles are kept as sessions (see `get_session`), so the queries on the same puzzle only run the search.
+
+    Args:
+        puzzle_name: The name of the puzzle.
+        puzzle_content: The puzzle content exported in [Penpa+](https://swaroopg92.github.io/penpa-edit/) format.
+        param: Additional parameters for the puzzle.
+        fixed: The atoms fixed by the user, see `parse_fixed`.
+        cell: The row and the column of the cell to be queried.
+
+    Raises:
+        ValueError: If the puzzle or a fixed atom is invalid.
+        TimeoutError: If the search is not exhausted within `Config.time_limit`.
+    """
+    return get_session(puzzle_name, puzzle_content, param).hint(fixed, cell)
@@ -1,11 +1,46 @@
 """The unified manager for solvers."""
 
-from typing import Any, Dict, List
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 from noqx.puzzle import Color, Direction, Point, Puzzle
 from noqx.puzzle.penpa import PenpaPuzzle
+from noqx.rule import reachable
+from noqx.rule.helper import fail_false
+
+try:
+    from threading import Lock
+except ImportError:  # pragma: no cover
+
+    class Lock:  # type: ignore
+        """A no-op lock for MicroPython, where the programs are generated in a single thread."""
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args: Any):
+            return False
+
 
 modules: Dict[str, "Solver"] = {}
+lazy_modules: Dict[str, Tuple[str, str]] = {}  # registered solvers to be imported on first use: (solver_dir, solver_name)
+_metadata_index: Dict[str, Dict[str, Any]] = {}
+GUARDABLE_AGGREGATES = ("#count", "#sum", "#min", "#max")  # the aggregates allowed in the heads of guarded rules
+PROBLEM_KEYS = ("killercages", "arrows", "thermo")  # the problem data read by the solvers besides the puzzle elements
+
+
+def _import_solver(solver_dir: str, solver_name: str) -> None:
+    """Import a solver module and record the solver instances."""
+    module = __import__(f"{solver_dir}.{solver_name}")
+    module_attr = getattr(module, solver_name)
+
+    for attr_name in dir(module_attr):
+        attr = getattr(module_attr, attr_name)
+
+        if isinstance(attr, type) and issubclass(attr, Solver) and attr is not Solver:
+            puzzle_name = solver_name.lower()
+            modules[puzzle_name] = attr()
+            lazy_modules.pop(puzzle_name, None)
 
 
 def load_solver(solver_dir: str, solver_name: str) -> None:
@@ -22,20 +57,59 @@ def load_solver(solver_dir: str, solver_name: str) -> None:
     if solver_name in modules:
         raise ValueError(f"Solver for {solver_name} already exists.")
 
-    module = __import__(f"{solver_dir}.{solver_name}")
-    module_attr = getattr(module, solver_name)
+    _import_solver(solver_dir, solver_name)
 
-    for attr_name in dir(module_attr):
-        attr = getattr(module_attr, attr_name)
 
-        if isinstance(attr, type) and issubclass(attr, Solver) and attr is not Solver:
-            puzzle_name = solver_name.lower()
-            modules[puzzle_name] = attr()
+def register_solver(solver_dir: str, solver_name: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+    """Register a solver without importing it, the solver module is imported by `get_solver` on first use.
+
+    * The metadata of the solver (e.g., from a prebuilt index) is listed by `list_solver_metadata` before the solver module is imported.
+
+    Args:
+        solver_dir: The directory where the solver is located.
+        solver_name: The name of the solver to register.
+        metadata: The metadata of the solver in the format of `list_solver_metadata`.
+
+    Raises:
+        ValueError: If the solver already exists.
+    """
+    puzzle_name = solver_name.lower()
+    if puzzle_name in modules or puzzle_name in lazy_modules:
+        raise ValueError(f"Solver for {solver_name} already exists.")
+
+    lazy_modules[puzzle_name] = (solver_dir, solver_name)
+    if metadata is not None:
+        _metadata_index[puzzle_name] = metadata
+
+
+def get_solver(puzzle_name: str) -> "Solver":
+    """Get the solver of a puzzle, and import the solver module if it is registered but not imported yet.
+
+    Args:
+        puzzle_name: The name of the puzzle.
+
+    Raises:
+        ValueError: If the solver does not exist.
+    """
+    solver = modules.get(puzzle_name)
+    if solver is None:
+        entry = lazy_modules.get(puzzle_name)
+        if entry is not None:
+            _import_solver(*entry)
+
+        solver = modules.get(puzzle_name)  # the solver might be imported by another thread
+        if solver is None:
+            raise ValueError(f"Solver for {puzzle_name} does not exist.")
+
+    return solver
 
 
 def list_solver_metadata() -> Dict[str, Any]:
-    """Generate A dictionary containing the attributes for each solver."""
-    metadata = {}
+    """Generate A dictionary containing the attributes for each solver.
+
+    * The registered solvers which are not imported yet are listed with the metadata from their registration.
+    """
+    metadata = dict(_metadata_index)
     for puzzle_name, module in modules.items():
         metadata[puzzle_name] = {
             "name": module.name,
@@ -43,6 +117,7 @@ def list_solver_metadata() -> Dict[str, Any]:
             "aliases": module.aliases,
             "examples": module.examples,
             "parameters": module.parameters,
+            "solver_config": module.solver_config,
         }
 
     return metadata
@@ -62,16 +137,176 @@ def prepare_puzzle(puzzle_name: str, puzzle_content: str, param: Dict[str, Any])
     return puzzle
 
 
+def problem_data(puzzle: Puzzle) -> Tuple[Tuple[str, Any], ...]:
+    """Get the problem data read by the solvers directly (see `PROBLEM_KEYS`), which is not decoded into the puzzle elements.
+
+    Args:
+        puzzle: A decoded `Puzzle` object.
+    """
+    problem = getattr(puzzle, "problem", {})
+    return tuple((key, problem.get(key)) for key in PROBLEM_KEYS if problem.get(key))
+
+
+def program_key(puzzle: Puzzle) -> str:
+    """Generate the key of the program cache from the decoded puzzle.
+
+    * The key contains the puzzle name, the size, the normalized puzzle elements, the problem data from `problem_data`, the sorted parameters and the encoding switch `noqx.rule.reachable.SHARED_REACHABILITY`, so different payloads of the same board share the same key.
+
+    Args:
+        puzzle: A decoded `Puzzle` object.
+    """
+    content = (
+        puzzle.puzzle_name,
+        puzzle.row,
+        puzzle.col,
+        tuple(puzzle.margin),
+        sorted(puzzle.surface.items()),
+        sorted(puzzle.text.items()),
+        sorted(puzzle.symbol.items()),
+        sorted(puzzle.edge.items()),
+        sorted(puzzle.line.items()),
+        problem_data(puzzle),
+        sorted((str(k), repr(v)) for k, v in puzzle.param.items()),
+        reachable.SHARED_REACHABILITY,
+    )
+    return repr(content)
+
+
+class ProgramCache:
+    """An LRU cache of the generated programs, so the identical boards skip the program generation.
+
+    * The programs are keyed by `program_key`, and the least recently used programs are dropped beyond `max_entries`.
+
+    * The cache lives in the current process only. The solvers are never modified in a running process, so the cached programs never go stale.
+
+    * The cache is guarded by a lock, since the programs may be generated by the threads of the server.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: The maximum number of programs kept in the cache, `0` disables the cache.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._programs: OrderedDict[str, str] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a program from the cache.
+
+        Args:
+            key: The cache key generated by `program_key`.
+        """
+        if self.max_entries <= 0:
+            return None
+
+        with self._lock:
+            program = self._programs.pop(key, None)
+            if program is None:
+                self.misses += 1
+                return None
+
+            self._programs[key] = program  # move to the most recently used end
+            self.hits += 1
+            return program
+
+    def put(self, key: str, program: str):
+        """Store a program into the cache and drop the least recently used programs.
+
+        Args:
+            key: The cache key generated by `program_key`.
+            program: The generated program.
+        """
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._programs.pop(key, None)
+            self._programs[key] = program
+            while len(self._programs) > self.max_entries:
+                self._programs.pop(next(iter(self._programs)), None)
+
+    def items(self) -> List[Tuple[str, str]]:
+        """Get the keys and the programs from the least to the most recently used, e.g., to warm the cache of another process."""
+        with self._lock:
+            return list(self._programs.items())
+
+    def clear(self):
+        """Remove all the programs and reset the counters."""
+        with self._lock:
+            self._programs.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get the statistics of the cache."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._programs)}
+
+
+program_cache = ProgramCache()
+
+
 def generate_program(puzzle: Puzzle) -> str:
     """Generate the solver program in the Answer Set Programming language.
 
     * The program generator is based on the puzzle name and the corresponding solver module.
 
+    * A fresh solver instance is created as the program builder for every invocation, so the registered solver modules are never mutated and the programs can be generated concurrently.
+
+    * The programs are stored in `program_cache`, so an identical board (see `program_key`) reuses the program without calling `Solver.solve`.
+
     Args:
         puzzle: A `Puzzle` object for the program.
     """
-    module = modules[puzzle.puzzle_name]
-    return module.solve(puzzle)
+    module = get_solver(puzzle.puzzle_name)
+    key = program_key(puzzle)
+    program = program_cache.get(key)
+    if program is None:
+        builder = module.__class__()
+        program = builder.solve(puzzle)
+        program_cache.put(key, program)
+
+    return program
+
+
+def warm_program_cache(puzzle_names: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+    """Generate the programs of the solver examples into `program_cache`.
+
+    * Only the examples drawn in noqx (with `data`) are used. The default parameters are overridden by the `config` of the example, and the digit parameters are converted to strings, which is the same as the web frontend.
+
+    * The solvers of the examples are imported, and the invalid examples are skipped.
+
+    Args:
+        puzzle_names: The puzzles to be warmed, all the puzzles are warmed if it is `None`.
+
+    Returns:
+        The puzzle names and the programs of the examples.
+    """
+    programs = []
+    for puzzle_name, puzzle_metadata in list_solver_metadata().items():
+        if puzzle_names is not None and puzzle_name not in puzzle_names:
+            continue
+
+        default_params = puzzle_metadata.get("parameters", {})
+        for puzzle_example in puzzle_metadata.get("examples", []):
+            if "data" not in puzzle_example:
+                continue
+
+            puzzle_config = puzzle_example.get("config", {})
+            params = {k: puzzle_config.get(k, v["default"]) for k, v in default_params.items()}
+            params = {k: str(v) if str(v).isdigit() else v for k, v in params.items()}
+            try:
+                program = generate_program(prepare_puzzle(puzzle_name, puzzle_example["data"], params))
+            except ValueError:
+                continue
+
+            programs.append((puzzle_name, program))
+
+    return programs
 
 
 def store_solution(puzzle: Puzzle, model_str: str) -> Puzzle:
@@ -81,16 +316,16 @@ def store_solution(puzzle: Puzzle, model_str: str) -> Puzzle:
 
     * Since the solution from [Clingo](https://potassco.org/clingo/) is in a raw string format, this function will parse the string and fill in the corresponding attributes of the `Puzzle` object. The parsing order will be: edges, lines, texts (numbers/contents), triangle symbols, colors, other symbols and debugging elements.
 
+    * The solution is an empty copy of the decoded `puzzle`, so the puzzle content is decoded only once for all the models.
+
     Args:
-        puzzle: A `Puzzle` object without stored solution.
+        puzzle: A decoded `Puzzle` object without stored solution.
         model_str: The raw solution string generated by the [Clingo](https://potassco.org/clingo/) solver.
     """
-    module = modules[puzzle.puzzle_name]
+    module = get_solver(puzzle.puzzle_name)
 
     solution_data = tuple(str(model_str).split())  # raw solution converted from clingo
-    solution = PenpaPuzzle(puzzle.puzzle_name, puzzle.content, puzzle.param)
-    solution.decode()
-    solution.clear()
+    solution = puzzle.empty_copy()
 
     for item in solution_data:
         _type, _data = item.replace("(", " ").replace(")", " ").split()
@@ -138,6 +373,45 @@ def store_solution(puzzle: Puzzle, model_str: str) -> Puzzle:
     return solution
 
 
+def guard_statement(statement: str, guard: str) -> str:
+    """Add a guard literal to the body of a single statement.
+
+    * The statement is scanned outside the string constants. It should be a fact, a rule or an integrity constraint with at most one `:-` and a single terminating period, and the guard is appended to its body. The rule heads with aggregates (e.g., `#count { ... } = N :- ...`) are allowed.
+
+    * The comments are kept as they are.
+
+    Args:
+        statement: A single statement in the Answer Set Programming language.
+        guard: The literal to be added to the body.
+
+    Raises:
+        ValueError: If the statement cannot be guarded, e.g., a directive, a weak constraint, a statement spanning several lines, or several statements on the same line.
+    """
+    if statement.startswith("%"):
+        return statement
+
+    fail_false(statement.endswith("."), f"Statement {statement} must end with a period.")
+    body = statement[:-1]
+    fail_false(not body.startswith("#") or body.startswith(GUARDABLE_AGGREGATES), f"Directive {statement} cannot be guarded.")
+
+    separators = 0
+    quoted = False
+    for i, char in enumerate(body):
+        if char == '"' and body[i - 1 : i] != "\\":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif body.startswith(":-", i):
+            separators += 1
+        elif body.startswith(":~", i) or char == "%":
+            fail_false(False, f"Statement {statement} cannot be guarded.")
+        elif char == "." and body[i - 1 : i] != "." and body[i + 1 : i + 2] != ".":
+            fail_false(False, f"Statement {statement} must be a single statement.")  # a lone period ends a statement
+
+    fail_false(not quoted and separators <= 1, f"Statement {statement} cannot be guarded.")
+    return f"{body}{', ' if separators else ' :- '}{guard}."
+
+
 class Solver:
     """Base class to create solvers.
 
@@ -166,13 +440,23 @@ class Solver:
             * `default`: The default value of the parameter, which will be used when the parameter is not provided in the example config.
             * `presets` (Optional): A list of shape presets for the parameter, which can be `tetro`, `double_tetro`, and `pento`. These presets are displayed in the UI as a dropdown menu. Only applicable when the type is set to `shapeset`.
 
+        solver_config: A dictionary of [Clingo](https://potassco.org/clingo/) options tuned for the solver, which overrides the default options `--trans-ext=dynamic --eq=1`. The options are passed to the solver on both the server and the static site:
+
+            * The keys are the long option names without the leading dashes, e.g., `{"configuration": "crafty", "eq": 3, "sat-prepro": 2}`.
+            * `domain` (Optional): the domain heuristic modifiers of the key predicates, e.g., `{"black/2": "false", "line_io/3": "level,2"}`. The modifier is one of `level`, `sign`, `factor`, `init`, `true` and `false`, followed by an optional bias. It enables `--heuristic=Domain` and is only applied on the server.
+            * The profiles can be tuned with `python -m benchmarks.tuning` over the examples of the solver.
+
     Warning:
         When you directly draw the board in noqx, make sure to set the puzzle type first. Currently, the puzzle type selection is **locked** if the user starts drawing the board.
     """
 
     def __init__(self):
-        """Initialize an internal program."""
+        """Initialize an internal program.
+
+        * The internal program belongs to a single invocation. The instances registered in `modules` only provide the metadata and the `refine` method, while `generate_program` creates a new instance for building every program.
+        """
         self._program: List[str] = []
+        self._params: Dict[str, bool] = {}
 
     def add_program_line(self, line: str):
         """Add a line to the internal program.
@@ -183,10 +467,39 @@ class Solver:
         if line != "":
             self._program.append(line.strip())
 
+    def add_param_line(self, line: str, param: str, value: bool, negate: bool = False):
+        """Add a line guarded by a checkbox parameter to the internal program.
+
+        * Every statement in the line only applies if the external atom `noqx_param(param)` is true (or false if `negate` is enabled). The external atom is declared with `value` as its default, so the program is solved as usual in one shot.
+
+        * The programs of the same board only differ in the defaults of the external atoms, so `noqx.clingo.ClingoSolver` grounds the program once and solves it again under the new parameters.
+
+        * Every line should hold exactly one rule, fact or integrity constraint, see `guard_statement` for the statements that can be guarded.
+
+        Args:
+            line: A line in the Answer Set Programming language, where every statement ends with a period at the end of a line.
+            param: The parameter ID.
+            value: The value of the parameter.
+            negate: Whether the line applies if the parameter is disabled.
+
+        Raises:
+            ValueError: If the parameter value conflicts with a previous line, or a statement cannot be guarded.
+        """
+        fail_false(self._params.get(param, value) == value, f"Conflicting values of parameter {param}.")
+        guard = f"{'not ' if negate else ''}noqx_param({param})"
+        statements = [guard_statement(statement.strip(), guard) for statement in line.strip().split("\n") if statement.strip()]
+        self._params[param] = bool(value)
+        for statement in statements:
+            self.add_program_line(statement)
+
     @property
     def program(self) -> str:
-        """Convert the internal program in the Answer Set Programming language."""
-        return "\n".join(self._program)
+        """Convert the internal program in the Answer Set Programming language.
+
+        * The external atoms of the guarded parameters are declared at the end of the program.
+        """
+        externals = [f"#external noqx_param({param}). [{str(value).lower()}]" for param, value in self._params.items()]
+        return "\n".join(self._program + externals)
 
     def reset(self):
         """Clear the internal program.
@@ -194,6 +507,7 @@ class Solver:
         * Make sure to reset the program before generating a new one.
         """
         self._program.clear()
+        self._params.clear()
 
     def solve(self, _: Puzzle) -> str:
         """Generate the solver program in the Answer Set Programming language.
@@ -223,3 +537,4 @@ class Solver:
     aliases: List[str] = []
     examples: List[Dict[str, Any]] = []
     parameters: Dict[str, Any] = {}
+    solver_config: Dict[str, Any] = {}
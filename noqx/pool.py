@@ -0,0 +1,380 @@
+"""A pool of pre-started worker processes that runs the solver outside the event loop."""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import pkgutil
+from collections import deque
+from multiprocessing.connection import Connection
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from noqx.clingo import Config, iter_solver, peak_memory, run_solver, set_ground_timeout_handler
+from noqx.manager import load_solver, modules, program_cache
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore  # not available on Windows
+
+# the workers are forked by a fork server (or spawned where it is not available), since the server process runs threads
+_context = multiprocessing.get_context("forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+
+def _limit_memory(limit: int):
+    """Limit the address space (in MiB) of the current process, so the grounder fails with a `MemoryError` beyond it."""
+    if resource is None or limit <= 0:  # pragma: no cover
+        return
+
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    soft = limit * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (soft if hard == resource.RLIM_INFINITY else min(soft, hard), hard))
+
+
+def _ground_timeout(conn: Connection):  # pragma: no cover
+    """Report the grounding timeout to the pool and exit the worker, since the grounder cannot be interrupted."""
+    message = f"Grounding time limit exceeded ({Config.ground_time_limit} seconds, {peak_memory()} MiB peak memory)."
+    conn.send(("fatal", TimeoutError(message)))
+    os._exit(1)
+
+
+def _worker_main(
+    conn: Connection, solver_dir: str, config: Dict[str, Any], programs: List[Tuple[str, str]]
+) -> None:  # pragma: no cover
+    """The main loop of a worker process.
+
+    * The worker loads all the solvers, which are already imported by the fork server (see `SolverPool.start`), then receives jobs in the format of (`function`, `args`, `stream`) from the pipe. For a streaming job, every item yielded by the function is sent back as an `item` message. The job ends with either a `done` message with the result or an `error` message with the exception.
+
+    * The programs warmed in the parent are copied into `noqx.manager.program_cache`, whose size is set by `Config.program_cache_size`.
+
+    * The address space of the worker is limited by `Config.memory_limit`. If the grounding exceeds `Config.ground_time_limit`, the worker sends a `fatal` message with the error and exits, since the grounder cannot be interrupted.
+
+    Args:
+        conn: The worker side of the pipe.
+        solver_dir: The directory where the solvers are located.
+        config: A snapshot of the `Config` attributes in the parent process.
+        programs: A snapshot of the program cache in the parent process, see `noqx.manager.ProgramCache.items`.
+    """
+    for key, value in config.items():
+        setattr(Config, key, value)
+
+    _limit_memory(Config.memory_limit)
+    program_cache.max_entries = Config.program_cache_size
+    for key, program in programs:
+        program_cache.put(key, program)
+
+    set_ground_timeout_handler(lambda: _ground_timeout(conn))
+    for module_info in pkgutil.iter_modules([solver_dir]):
+        if module_info.name.lower() not in modules:
+            load_solver(solver_dir, module_info.name)
+
+    while True:
+        try:
+            func, args, stream = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+
+        try:
+            if stream:
+                for item in func(*args):
+                    conn.send(("item", item))
+
+                conn.send(("done", None))
+            else:
+                conn.send(("done", func(*args)))
+        except Exception as err:
+            try:
+                conn.send(("error", err))
+            except Exception:  # the error itself is not picklable
+                conn.send(("error", RuntimeError(str(err))))
+
+
+class _Worker:
+    """A worker process with a duplex pipe to the pool."""
+
+    def __init__(self, solver_dir: str):
+        """Start a new worker process.
+
+        Args:
+            solver_dir: The directory where the solvers are located.
+        """
+        config = {key: getattr(Config, key) for key in vars(Config) if not key.startswith("_")}
+        self.conn, child_conn = _context.Pipe()
+        worker_args = (child_conn, solver_dir, config, program_cache.items())
+        self.process = _context.Process(target=_worker_main, args=worker_args, daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.poller: Optional[asyncio.Future] = None
+
+    async def readable(self, timeout: float) -> bool:
+        """Wait until a message of the worker is ready to be received, or the worker exits.
+
+        * The pipe is watched by the event loop, so no thread is blocked while the job is running. If the event loop cannot watch the pipe (e.g., the proactor event loop on Windows), the pipe is polled in a thread instead, see `kill`.
+
+        Args:
+            timeout: The maximum time (in seconds) to wait.
+
+        Returns:
+            Whether a message is ready before the timeout.
+        """
+        if self.conn.poll():
+            return True
+
+        loop = asyncio.get_event_loop()
+        ready = loop.create_future()
+        fd = self.conn.fileno()
+        try:
+            loop.add_reader(fd, lambda: ready.done() or ready.set_result(True))
+        except NotImplementedError:  # pragma: no cover
+            self.poller = loop.run_in_executor(None, self.conn.poll, timeout)
+            return await asyncio.shield(self.poller)  # the poll is kept running if the job is cancelled
+
+        try:
+            await asyncio.wait_for(ready, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            loop.remove_reader(fd)
+
+    async def kill(self):
+        """Kill the worker process immediately and release the pipe.
+
+        * The pipe is closed after the pending poll in a thread returns, which happens once the worker process is killed.
+        """
+        self.process.kill()
+        if self.poller is not None:  # pragma: no cover
+            await asyncio.wait([self.poller])
+
+        self.process.join()
+        self.conn.close()
+
+
+class SolverPool:
+    """A bounded pool of worker processes for running the solver concurrently.
+
+    * Each worker process starts with all the solvers imported, so a job only costs the solving time. The jobs are sent to the idle workers in a first-come-first-served order.
+
+    * The workers are started by a fork server where it is available, or spawned otherwise, so they never inherit the threads of the server process. The fork server imports all the solvers before forking the workers, so a new worker (e.g., a replacement of a killed one) does not import them again. The program cache of the server process is copied to every new worker.
+
+    * The number of jobs waiting for an idle worker is bounded by `queue_size`. If the queue is full, new jobs are rejected immediately with `asyncio.QueueFull`, or they wait for a free slot if `wait` is set.
+
+    * Every job has a deadline counted from its submission. If the deadline is exceeded, or the awaiting task is cancelled, the worker running the job is killed and replaced by a fresh one.
+    """
+
+    def __init__(self, workers: int = 1, queue_size: int = 16, solver_dir: str = "solver"):
+        """Initialize the pool without starting any worker processes.
+
+        Args:
+            workers: The number of worker processes.
+            queue_size: The maximum number of jobs waiting for an idle worker.
+            solver_dir: The directory where the solvers are located.
+        """
+        if workers < 1:
+            raise ValueError("The pool needs at least one worker.")
+
+        self.workers = workers
+        self.queue_size = queue_size
+        self.solver_dir = solver_dir
+
+        self._pending = 0
+        self._slot_waiters: Deque[asyncio.Future] = deque()
+        self._all_workers: List[_Worker] = []
+        self._idle: Optional[asyncio.Queue] = None
+
+    @property
+    def pending(self) -> int:
+        """The number of jobs that are either running or waiting in the queue."""
+        return self._pending
+
+    async def start(self):
+        """Start the worker processes.
+
+        * The solvers are only preloaded if the fork server is not running yet, otherwise every worker imports them at its start.
+        """
+        if _context.get_start_method() == "forkserver":
+            solvers = [f"{self.solver_dir}.{module_info.name}" for module_info in pkgutil.iter_modules([self.solver_dir])]
+            _context.set_forkserver_preload(["__main__", *solvers])  # `__main__` is the default preload
+
+        self._idle = asyncio.Queue()
+        for _ in range(self.workers):
+            worker = _Worker(self.solver_dir)
+            self._all_workers.append(worker)
+            self._idle.put_nowait(worker)
+
+        logging.info(f"[Pool] {self.workers} solver worker(s) started.")
+
+    async def close(self):
+        """Kill all the worker processes."""
+        for worker in self._all_workers:
+            await worker.kill()
+
+        self._all_workers.clear()
+        self._idle = None
+        logging.info("[Pool] Solver workers stopped.")
+
+    async def _acquire_slot(self, wait: bool):
+        """Take a slot of the running or queued jobs, or wait for a slot released by another job in the first-come-first-served order."""
+        if self._pending < self.workers + self.queue_size:
+            self._pending += 1
+            return
+
+        if not wait:
+            raise asyncio.QueueFull("Too many puzzles are being solved. Please try again later.")
+
+        waiter = asyncio.get_event_loop().create_future()
+        self._slot_waiters.append(waiter)
+        try:
+            await waiter  # the slot is handed over by `_release_slot`
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release_slot()  # the slot is handed over just before the cancellation
+
+            raise
+        finally:
+            if waiter in self._slot_waiters:
+                self._slot_waiters.remove(waiter)
+
+    def _release_slot(self):
+        """Release a slot taken by `_acquire_slot`, or hand it over to the first waiting job."""
+        while self._slot_waiters:
+            waiter = self._slot_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+        self._pending -= 1
+
+    async def _respawn(self, worker: _Worker) -> _Worker:
+        """Replace a busy or broken worker with a fresh one."""
+        await worker.kill()
+        self._all_workers.remove(worker)
+        new_worker = _Worker(self.solver_dir)
+        self._all_workers.append(new_worker)
+        return new_worker
+
+    async def _execute(
+        self, func: Callable[..., Any], args: Tuple[Any, ...], stream: bool, timeout: Optional[float], wait: bool = False
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Send a job to an idle worker and yield the messages from the worker until the job ends."""
+        if self._idle is None:
+            raise RuntimeError("The solver pool is not started.")
+
+        await self._acquire_slot(wait)
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + (timeout if timeout is not None else 2 * Config.time_limit)
+        try:
+            try:
+                worker = await asyncio.wait_for(self._idle.get(), max(0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                raise TimeoutError("Time limit exceeded.") from None
+
+            finished = False
+            try:
+                worker.conn.send((func, args, stream))
+                while not finished:
+                    if not await worker.readable(max(0, deadline - loop.time())):
+                        raise TimeoutError("Time limit exceeded.")
+
+                    status, payload = worker.conn.recv()
+                    finished = status not in ("item", "fatal")  # the worker exits after a fatal error
+                    if status in ("error", "fatal"):
+                        raise payload
+
+                    yield status, payload
+            except EOFError:
+                raise RuntimeError("Solver worker exited unexpectedly.") from None
+            finally:
+                if not finished:  # deadline exceeded, the job is cancelled, or the stream is closed early
+                    worker = await self._respawn(worker)
+
+                self._idle.put_nowait(worker)
+        finally:
+            self._release_slot()
+
+    async def run(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None, wait: bool = False) -> Any:
+        """Run a picklable function with its arguments in a worker process.
+
+        Args:
+            func: A module-level function to be called in the worker process.
+            *args: The arguments passed to the function.
+            timeout: The deadline (in seconds) of the job, including the time waiting in the queue. The default deadline is twice the `Config.time_limit`.
+            wait: Whether to wait for a free slot if the queue is full. The deadline is counted once the job takes a slot.
+
+        Raises:
+            RuntimeError: If the pool is not started, or the worker process exits unexpectedly.
+            asyncio.QueueFull: If too many jobs are waiting for an idle worker, and `wait` is not set.
+            TimeoutError: If the job exceeds its deadline.
+        """
+        result = None
+        async for _, payload in self._execute(func, args, False, timeout, wait):
+            result = payload
+
+        return result
+
+    async def stream(
+        self, func: Callable[..., Iterator[Any]], *args: Any, timeout: Optional[float] = None
+    ) -> AsyncIterator[Any]:
+        """Run a picklable generator function with its arguments in a worker process, and yield the items as soon as they are generated.
+
+        * If the iteration is closed early, the worker running the job is replaced by a fresh one.
+
+        Args:
+            func: A module-level generator function to be called in the worker process.
+            *args: The arguments passed to the function.
+            timeout: The deadline (in seconds) of the job, including the time waiting in the queue. The default deadline is twice the `Config.time_limit`.
+
+        Raises:
+            RuntimeError: If the pool is not started, or the worker process exits unexpectedly.
+            asyncio.QueueFull: If too many jobs are waiting for an idle worker.
+            TimeoutError: If the job exceeds its deadline.
+        """
+        execution = self._execute(func, args, True, timeout)
+        try:
+            async for status, payload in execution:
+                if status == "item":
+                    yield payload
+        finally:
+            await execution.aclose()  # the worker is replaced once the stream is closed, instead of being garbage collected
+
+    async def solve(
+        self,
+        puzzle_name: str,
+        puzzle_content: str,
+        param: Dict[str, Any],
+        mode: str = "enumerate",
+        stats: bool = False,
+        timeout: Optional[float] = None,
+        wait: bool = False,
+    ) -> Dict[str, Any]:
+        """Run `noqx.clingo.run_solver` in a worker process.
+
+        Args:
+            puzzle_name: The name of the puzzle.
+            puzzle_content: The puzzle content exported in [Penpa+](https://swaroopg92.github.io/penpa-edit/) format.
+            param: Additional parameters for the puzzle.
+            mode: The solve mode, see `noqx.clingo.parse_mode` for details.
+            stats: Whether to include the statistics of the solving process.
+            timeout: The deadline (in seconds) of the job, including the time waiting in the queue.
+            wait: Whether to wait for a free slot if the queue is full.
+        """
+        return await self.run(run_solver, puzzle_name, puzzle_content, param, mode, stats, timeout=timeout, wait=wait)
+
+    def solve_stream(
+        self,
+        puzzle_name: str,
+        puzzle_content: str,
+        param: Dict[str, Any],
+        mode: str = "enumerate",
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """Run `noqx.clingo.iter_solver` in a worker process and yield the solution URLs as soon as they are found.
+
+        Args:
+            puzzle_name: The name of the puzzle.
+            puzzle_content: The puzzle content exported in [Penpa+](https://swaroopg92.github.io/penpa-edit/) format.
+            param: Additional parameters for the puzzle.
+            mode: The solve mode, see `noqx.clingo.parse_mode` for details.
+            timeout: The deadline (in seconds) of the job, including the time waiting in the queue.
+        """
+        return self.stream(iter_solver, puzzle_name, puzzle_content, param, mode, timeout=timeout)
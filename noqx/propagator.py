@@ -0,0 +1,121 @@
+"""Custom propagators for [Clingo](https://potassco.org/clingo/) to replace the expensive encodings."""
+
+from typing import Dict, List, Tuple
+
+from clingo.propagator import Assignment, PropagateControl, PropagateInit
+
+ADJACENCY_OFFSETS: Dict[str, Tuple[Tuple[int, int], ...]] = {
+    "4": ((-1, 0), (0, -1), (0, 1), (1, 0)),
+    "x": ((-1, -1), (-1, 1), (1, -1), (1, 1)),
+    "8": ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)),
+}
+
+
+class _ConnectedGroup:
+    """A group of cells that should be connected with each other if they are selected."""
+
+    def __init__(self, cells: Dict[Tuple[int, int], int], adj_type: str):
+        """Initialize the group with the cells and their solver literals.
+
+        Args:
+            cells: The cells mapped to their solver literals.
+            adj_type: The type of adjacency (accepted types: `4`, `8`, `x`).
+        """
+        coords = sorted(cells)
+        index = {coord: i for i, coord in enumerate(coords)}
+
+        self.literals: List[int] = [cells[coord] for coord in coords]
+        self.neighbors: List[List[int]] = []
+        for r, c in coords:
+            adjacent = (index.get((r + dr, c + dc)) for dr, dc in ADJACENCY_OFFSETS[adj_type])
+            self.neighbors.append([i for i in adjacent if i is not None])
+
+    def nogoods(self, assignment: Assignment) -> List[List[int]]:
+        """Find the nogoods to keep the selected cells connected under the current assignment.
+
+        * The cells which are not false are merged with union-find. The component of the first true cell is surrounded by false cells, so any other cell outside of the component cannot be true together with the first true cell. The nogood consists of both cells and the false cells around the component, since any of these false cells is a possible bridge.
+
+        * If the other cell is true, the nogood is a conflict. Otherwise, the other cell is propagated to be false.
+
+        Returns:
+            The nogoods in solver literals, or an empty list if all the cells outside of the component are already false.
+        """
+        values = [assignment.value(lit) for lit in self.literals]
+        first = next((i for i, value in enumerate(values) if value is True), None)
+        if first is None:
+            return []
+
+        parent = list(range(len(values)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, value in enumerate(values):
+            if value is not False:
+                for j in self.neighbors[i]:
+                    if j < i and values[j] is not False:
+                        parent[find(i)] = find(j)
+
+        root = find(first)
+        outside = [i for i, value in enumerate(values) if value is not False and find(i) != root]
+        if not outside:
+            return []
+
+        component = (i for i, value in enumerate(values) if value is not False and find(i) == root)
+        boundary = {j for i in component for j in self.neighbors[i] if values[j] is False}
+        reason = [self.literals[first]] + [-self.literals[j] for j in boundary]
+        outside.sort(key=lambda i: values[i] is not True)  # the conflicts come first
+        return [reason + [self.literals[i]] for i in outside]
+
+
+class ConnectivityPropagator:
+    """A propagator to ensure the cells with the same tag are connected, which replaces the flood-fill encoding of `noqx.rule.reachable.grid_color_connected`.
+
+    * The cells are collected from the `propagate_connected(Tag, Adj, R, C)` atoms. Every time a watched cell is assigned, the groups containing the cell are checked with union-find, and the cells separated from a true cell by the false cells are propagated to be false.
+
+    * The propagator is stateless between the calls, so it can be shared by all the solver threads.
+    """
+
+    def __init__(self):
+        """Initialize the propagator without any groups."""
+        self.groups: List[_ConnectedGroup] = []
+        self.watches: Dict[int, List[int]] = {}
+
+    def init(self, init: PropagateInit):
+        """Collect the groups of cells and watch their literals."""
+        cells: Dict[Tuple[str, str], Dict[Tuple[int, int], int]] = {}
+        for atom in init.symbolic_atoms.by_signature("propagate_connected", 4):
+            tag, adj, r, c = atom.symbol.arguments
+            key = (str(tag), str(adj).strip('"'))
+            cells.setdefault(key, {})[(r.number, c.number)] = init.solver_literal(atom.literal)
+
+        for (_, adj_type), group_cells in sorted(cells.items()):
+            group_id = len(self.groups)
+            self.groups.append(_ConnectedGroup(group_cells, adj_type))
+            for lit in set(group_cells.values()):
+                if not init.assignment.is_fixed(lit):
+                    for watch in (lit, -lit):
+                        init.add_watch(watch)
+                        self.watches.setdefault(watch, []).append(group_id)
+
+    def _check_groups(self, control: PropagateControl, group_ids: List[int]):
+        """Check the groups and add the nogoods found."""
+        for group_id in group_ids:
+            for nogood in self.groups[group_id].nogoods(control.assignment):
+                if not control.add_nogood(nogood):
+                    return
+
+            if not control.propagate():
+                return
+
+    def propagate(self, control: PropagateControl, changes: List[int]):
+        """Check the groups containing the changed literals."""
+        group_ids = sorted({group_id for lit in changes for group_id in self.watches.get(lit, ())})
+        self._check_groups(control, group_ids)
+
+    def check(self, control: PropagateControl):
+        """Check all the groups on total assignments, including the groups without any watched literals."""
+        self._check_groups(control, list(range(len(self.groups))))
@@ -1,6 +1,7 @@
 """Definitions of the base encodings."""
 
-from typing import Any, Dict, Optional, Tuple, Union
+from array import array
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 
 class Color:
@@ -86,6 +87,109 @@ def Point(r: int, c: int, d: str = Direction.CENTER, label: str = "normal") -> T
     return (r, c, d, label)
 
 
+# the bits of the line directions in a cell of `PuzzleView.line`
+LINE_BITS: Dict[str, int] = {Direction.TOP: 1, Direction.LEFT: 2, Direction.BOTTOM: 4, Direction.RIGHT: 8}
+
+
+class PuzzleView:
+    """A compact view of the puzzle elements inside the grid, which is backed by flat arrays in row-major order.
+
+    * The view is built once from the dictionaries of a `Puzzle` (see `Puzzle.view`), so the rule helpers look up a cell by an index instead of hashing a `Point` tuple. The dictionaries are still the source of truth, and the elements outside the grid or with other labels are only kept in the dictionaries.
+
+    * The view contains the following elements:
+
+        * `surface`: the color of every cell, or `-1` if the cell is not shaded.
+        * `text`: the text clue with the `normal` label in the center of every cell, or `None` if there is no clue.
+        * `edge_top`: the `normal` edges on the top of the cells, where the index of `Point(r, c, Direction.TOP)` is `r * col + c` (`0 <= r <= row`).
+        * `edge_left`: the `normal` edges on the left of the cells, where the index of `Point(r, c, Direction.LEFT)` is `r * (col + 1) + c` (`0 <= c <= col`).
+        * `line`: the `normal` lines of every cell as a bitmask of `LINE_BITS`.
+    """
+
+    def __init__(self, puzzle: "Puzzle"):
+        """Build the view from the dictionaries of the puzzle.
+
+        Args:
+            puzzle: A decoded `Puzzle` object.
+        """
+        rows, cols = puzzle.row, puzzle.col
+        self.row = rows
+        self.col = cols
+
+        self.surface = array("b", [-1] * (rows * cols))
+        self.text: List[Optional[Union[int, str]]] = [None] * (rows * cols)
+        self.edge_top = bytearray((rows + 1) * cols)
+        self.edge_left = bytearray(rows * (cols + 1))
+        self.line = bytearray(rows * cols)
+
+        for (r, c, _, _), color in puzzle.surface.items():
+            if 0 <= r < rows and 0 <= c < cols:
+                self.surface[r * cols + c] = color
+
+        for (r, c, d, label), clue in puzzle.text.items():
+            if d == Direction.CENTER and label == "normal" and 0 <= r < rows and 0 <= c < cols:
+                self.text[r * cols + c] = clue
+
+        for (r, c, d, label), value in puzzle.edge.items():
+            if value is not True or label != "normal":
+                continue
+
+            if d == Direction.TOP and 0 <= r <= rows and 0 <= c < cols:
+                self.edge_top[r * cols + c] = 1
+            elif d == Direction.LEFT and 0 <= r < rows and 0 <= c <= cols:
+                self.edge_left[r * (cols + 1) + c] = 1
+
+        for (r, c, d, label), value in puzzle.line.items():
+            if value is True and label == "normal" and d in LINE_BITS and 0 <= r < rows and 0 <= c < cols:
+                self.line[r * cols + c] |= LINE_BITS[d]
+
+    def has_edge(self, r: int, c: int, d: str) -> bool:
+        """Check whether there is a `normal` edge on the given side of a cell.
+
+        Args:
+            r: The row index of the cell.
+            c: The column index of the cell.
+            d: The side of the cell, should be `top`, `left`, `bottom` or `right`.
+        """
+        if d == Direction.BOTTOM:
+            r, d = r + 1, Direction.TOP
+        elif d == Direction.RIGHT:
+            c, d = c + 1, Direction.LEFT
+
+        if d == Direction.TOP:
+            return 0 <= r <= self.row and 0 <= c < self.col and self.edge_top[r * self.col + c] == 1
+
+        if d == Direction.LEFT:
+            return 0 <= r < self.row and 0 <= c <= self.col and self.edge_left[r * (self.col + 1) + c] == 1
+
+        return False
+
+    def has_line(self, r: int, c: int, d: str) -> bool:
+        """Check whether there is a `normal` line from a cell in the given direction.
+
+        Args:
+            r: The row index of the cell.
+            c: The column index of the cell.
+            d: The direction of the line, should be `top`, `left`, `bottom` or `right`.
+        """
+        if not (0 <= r < self.row and 0 <= c < self.col and d in LINE_BITS):
+            return False
+
+        return self.line[r * self.col + c] & LINE_BITS[d] != 0
+
+    def walls(self) -> Tuple[bytearray, bytearray]:
+        """Get the walls between the cells as two flat bitmaps in row-major order.
+
+        * The first bitmap marks the walls between every cell and its right neighbor, and the second one marks the walls between every cell and its lower neighbor.
+        """
+        rows, cols = self.row, self.col
+        wall_right = bytearray()
+        for r in range(rows):
+            start = r * (cols + 1) + 1
+            wall_right.extend(self.edge_left[start : start + cols])
+
+        return wall_right, self.edge_top[cols:]
+
+
 class Puzzle:
     """Base class for puzzle encodings.
 
@@ -127,6 +231,23 @@ class Puzzle:
         self.edge: Dict[Tuple[int, int, str, str], bool] = {}
         self.line: Dict[Tuple[int, int, str, str], bool] = {}
 
+        self._view: Optional[PuzzleView] = None
+
+    @property
+    def view(self) -> PuzzleView:
+        """Get the compact view of the puzzle elements, which is built on first use.
+
+        * The view is a snapshot of the dictionaries. If the dictionaries are modified after the view is built, call `clear_view` to rebuild it on the next use.
+        """
+        if self._view is None:
+            self._view = PuzzleView(self)
+
+        return self._view
+
+    def clear_view(self):
+        """Drop the compact view, so it is rebuilt from the dictionaries on the next use."""
+        self._view = None
+
     def clear(self):
         """Clear the puzzle structure.
 
@@ -137,6 +258,15 @@ class Puzzle:
         self.symbol.clear()
         self.edge.clear()
         self.line.clear()
+        self._view = None
+
+    def empty_copy(self) -> "Puzzle":  # pragma: no cover
+        """Create a puzzle object of the same board without any elements.
+
+        Raises:
+            NotImplementedError: If this method is not implemented.
+        """
+        raise NotImplementedError
 
     def decode(self):  # pragma: no cover
         """Decode the source content to a puzzle object.
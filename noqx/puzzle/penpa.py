@@ -2,7 +2,6 @@
 
 import json
 from base64 import b64decode, b64encode
-from functools import reduce
 from typing import Any, Dict, List, Optional, Tuple, Union
 from zlib import compress, decompress
 
@@ -41,6 +40,53 @@ PENPA_ABBREVIATIONS = [
     ('"__a"', "z_"),
     ("null", "zO"),
 ]
+_PENPA_EXPANSIONS = {abbr: word for word, abbr in PENPA_ABBREVIATIONS}
+_PENPA_COMPRESSIONS = {word[1:-1]: f"\x00{abbr}\x01" for word, abbr in PENPA_ABBREVIATIONS if word != "null"}
+
+
+def expand_abbreviations(data: str) -> str:
+    """Expand the abbreviations in the [Penpa+](https://swaroopg92.github.io/penpa-edit/) content in a single pass.
+
+    * Every abbreviation is a `z` followed by a character, and none of the expanded words contains `z`, so scanning for `z` from left to right gives the same result as replacing the abbreviations one by one.
+
+    Args:
+        data: The content with abbreviations.
+    """
+    chunks: List[str] = []
+    start = 0
+    index = data.find("z")
+    while index != -1:
+        word = _PENPA_EXPANSIONS.get(data[index : index + 2])
+        if word is None:
+            index = data.find("z", index + 1)
+            continue
+
+        chunks.append(data[start:index])
+        chunks.append(word)
+        start = index + 2
+        index = data.find("z", start)
+
+    chunks.append(data[start:])
+    return "".join(chunks)
+
+
+def compress_abbreviations(data: str) -> str:
+    """Compress the JSON content into the [Penpa+](https://swaroopg92.github.io/penpa-edit/) abbreviations in a single pass.
+
+    * Except for `null`, every abbreviated word is a quoted string. The content is split by the quotes, and every token between two quotes is looked up at once. The matched tokens are wrapped by control characters, which never appear in a valid JSON content, so the quotes around them can be removed afterwards.
+
+    * The `null` literals are replaced at last, which gives the same result as replacing the words one by one for a valid JSON content.
+
+    Args:
+        data: The JSON content to be compressed.
+    """
+    tokens = data.split('"')
+    if len(tokens) > 2:
+        inner = tokens[1:-1]
+        tokens[1:-1] = list(map(_PENPA_COMPRESSIONS.get, inner, inner))
+        data = '"'.join(tokens).replace('"\x00', "").replace('\x01"', "")
+
+    return data.replace("null", "zO")
 
 
 def _int_or_str(data: Union[int, str]) -> Union[int, str]:
@@ -108,12 +154,13 @@ class PenpaPuzzle(Puzzle):
     def __init__(self, name: str, content: str, param: Optional[Dict[str, Any]] = None):
         """Initialize the [Penpa+](https://swaroopg92.github.io/penpa-edit/) puzzle.
 
-        * To facilitate the interoperability with [Penpa+](https://swaroopg92.github.io/penpa-edit/), four extra variables are included in this class:
+        * To facilitate the interoperability with [Penpa+](https://swaroopg92.github.io/penpa-edit/), five extra variables are included in this class:
 
             * `cell_shape`: The shape of the cell, currently only `square` shape is supported.
             * `parts`: The decompressed parts of the [Penpa+](https://swaroopg92.github.io/penpa-edit/) content with a more readable format.
             * `problem`: The problem board extracted from `parts`.
             * `solution`: The solution board to be written into `parts`.
+            * `template`: The original solution board parsed from `parts`, which is shared by the copies of the puzzle.
 
         Args:
             name: The name of the puzzle.
@@ -126,6 +173,20 @@ class PenpaPuzzle(Puzzle):
         self.parts: List[str] = []
         self.problem: Dict[str, Any] = {}
         self.solution: Dict[str, Any] = {}
+        self.template: Dict[str, Any] = {}
+
+    def empty_copy(self) -> "PenpaPuzzle":
+        """Create a puzzle object of the same board without any elements.
+
+        * The decoded content (`parts`, `problem` and `template`) is shared with the copy instead of being decoded again, so a solution can be packed without the decompression and the JSON parsing.
+        """
+        puzzle = PenpaPuzzle(self.puzzle_name, self.content, self.param)
+        puzzle.row, puzzle.col, puzzle.margin = self.row, self.col, self.margin
+        puzzle.cell_shape = self.cell_shape
+        puzzle.parts = list(self.parts)  # `encode` replaces the solution part
+        puzzle.problem = self.problem
+        puzzle.template = self.template
+        return puzzle
 
     def decode(self):
         """Decode the [Penpa+](https://swaroopg92.github.io/penpa-edit/) content into the puzzle elements.
@@ -393,7 +454,10 @@ class PenpaPuzzle(Puzzle):
         * The unpacking order is `surface`, `text`, `sudoku`, `symbol`, `edge`, and `line`.
         """
         for p in (4, 3):  # must unpack solution board first, then edit board to keep consistency
-            self.problem = json.loads(reduce(lambda s, abbr: s.replace(abbr[1], abbr[0]), PENPA_ABBREVIATIONS, self.parts[p]))
+            self.problem = json.loads(expand_abbreviations(self.parts[p]))
+            if p == 4:
+                self.template = self.problem
+
             self._unpack_surface()
             self._unpack_text()
             self._unpack_sudoku()
@@ -419,10 +483,15 @@ class PenpaPuzzle(Puzzle):
         """Encode the puzzle into [Penpa+](https://swaroopg92.github.io/penpa-edit/) format.
 
         * The process involves packing the puzzle elements into the solution dictionary, updating the relevant part of the [Penpa+](https://swaroopg92.github.io/penpa-edit/) content, and compressing it into a base64-encoded string.
+
+        * The solution dictionary is cloned from the parsed `template`. Only the packed modes are copied, and the other modes are shared with the template since they are never modified.
         """
-        self.solution = json.loads(reduce(lambda s, abbr: s.replace(abbr[1], abbr[0]), PENPA_ABBREVIATIONS, self.parts[4]))
+        self.solution = dict(self.template)
+        for mode in ("surface", "number", "symbol", "edge", "line"):
+            self.solution[mode] = dict(self.template[mode])
+
         self._pack_board()
-        self.parts[4] = reduce(lambda s, abbr: s.replace(abbr[0], abbr[1]), PENPA_ABBREVIATIONS, json.dumps(self.solution))
+        self.parts[4] = compress_abbreviations(json.dumps(self.solution))
         return PENPA_PREFIX + b64encode(compress("\n".join(self.parts).encode())[2:-4]).decode()
 
     def _pack_surface(self):
@@ -0,0 +1,96 @@
+"""A prebuilt metadata index of the solvers, so the solver modules are only imported on first use."""
+
+import json
+import os
+import pkgutil
+from typing import Any, Dict, List
+
+from noqx.manager import lazy_modules, list_solver_metadata, load_solver, modules, register_solver
+
+# bump the version if the format of the index changes
+INDEX_VERSION = 1
+
+
+def source_stamps(solver_dir: str) -> Dict[str, List[int]]:
+    """Get the stamps of the solver source files in the format of {`solver_name`: [`mtime_ns`, `size`]}.
+
+    Args:
+        solver_dir: The directory where the solvers are located.
+    """
+    stamps = {}
+    for module_info in pkgutil.iter_modules([solver_dir]):
+        stat = os.stat(os.path.join(solver_dir, f"{module_info.name}.py"))
+        stamps[module_info.name] = [stat.st_mtime_ns, stat.st_size]
+
+    return stamps
+
+
+def build_index(solver_dir: str) -> Dict[str, Any]:
+    """Import all the solvers in the directory and build the metadata index.
+
+    * The index contains the metadata of every solver (see `noqx.manager.list_solver_metadata`), the module name of the solver, and the stamps of the source files to detect a stale index.
+
+    Args:
+        solver_dir: The directory where the solvers are located.
+    """
+    stamps = source_stamps(solver_dir)
+    for solver_name in stamps:
+        if solver_name.lower() not in modules:
+            load_solver(solver_dir, solver_name)
+
+    solvers = {}
+    for puzzle_name, metadata in list_solver_metadata().items():
+        solver_name = modules[puzzle_name].__class__.__module__.split(".")[-1]
+        if solver_name in stamps:
+            solvers[puzzle_name] = {"module": solver_name, "metadata": metadata}
+
+    return {"version": INDEX_VERSION, "sources": stamps, "solvers": solvers}
+
+
+def load_index(solver_dir: str, index_path: str) -> bool:
+    """Register the solvers from the metadata index without importing them.
+
+    * The index is ignored if it is missing, broken, or stale (i.e., any solver source file is added, removed or modified after the index is built).
+
+    Args:
+        solver_dir: The directory where the solvers are located.
+        index_path: The path of the index file.
+
+    Returns:
+        Whether the solvers are registered from the index.
+    """
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    if index.get("version") != INDEX_VERSION or index.get("sources") != source_stamps(solver_dir):
+        return False
+
+    for puzzle_name, entry in index["solvers"].items():
+        if puzzle_name not in modules and puzzle_name not in lazy_modules:
+            register_solver(solver_dir, entry["module"], entry["metadata"])
+
+    return True
+
+
+def load_solvers(solver_dir: str, index_path: str) -> bool:
+    """Register the solvers from the metadata index, or rebuild the index if it cannot be used.
+
+    Args:
+        solver_dir: The directory where the solvers are located.
+        index_path: The path of the index file.
+
+    Returns:
+        Whether the solvers are registered from the existing index.
+    """
+    if load_index(solver_dir, index_path):
+        return True
+
+    index = build_index(solver_dir)
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    with open(index_path, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(index, f)
+
+    return False
@@ -1,10 +1,9 @@
 """Helper functions for generating rules and validating data."""
 
-import random
 from collections import deque
-from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-from noqx.puzzle import Direction, Point
+from noqx.puzzle import Direction, PuzzleView
 
 
 def tag_encode(name: str, *data: Union[str, int, None]) -> str:
@@ -127,10 +126,82 @@ def fail_false(expr: bool, msg: str):
         raise ValueError(msg)
 
 
+def room_labels(
+    rows: int,
+    cols: int,
+    edges: Union[Dict[Tuple[int, int, str, str], bool], PuzzleView],
+    exclude: Optional[Iterable[Tuple[int, int]]] = None,
+) -> List[int]:
+    """Label the connected components (rooms) separated by the edges in the grid.
+
+    * The result is a flat list in row-major order, where `labels[r * cols + c]` is the index of the room containing the cell `(r, c)`, or `-1` if the cell is excluded. The rooms are numbered by their first cells in row-major order, so the labels are deterministic.
+
+    * The edges are converted to two flat bitmaps of the walls once, then every cell is visited once by BFS, so the labelling takes linear time. If the edges are given by the compact view of the puzzle (see `noqx.puzzle.Puzzle.view`), the bitmaps are sliced from the view directly.
+
+    Args:
+        rows: The number of rows in the grid.
+        cols: The number of columns in the grid.
+        edges: The edges of the grid stored in a dictionary, the format is the same to the `edge` attribute in the `Puzzle` class, or the compact view of a puzzle with the same size.
+        exclude: The cells to be excluded from the rooms.
+    """
+    size = rows * cols
+    if isinstance(edges, PuzzleView):
+        fail_false((edges.row, edges.col) == (rows, cols), "The size of the puzzle view does not match the grid.")
+        wall_right, wall_down = edges.walls()
+    else:
+        wall_right = bytearray(size)  # the wall between the cell and its right neighbor
+        wall_down = bytearray(size)  # the wall between the cell and its lower neighbor
+        for (r, c, d, label), value in edges.items():
+            if value is not True or label != "normal":
+                continue
+
+            if d == Direction.LEFT and 0 <= r < rows and 0 < c <= cols:
+                wall_right[r * cols + c - 1] = 1
+            elif d == Direction.TOP and 0 < r <= rows and 0 <= c < cols:
+                wall_down[(r - 1) * cols + c] = 1
+
+    labels = [-1] * size
+    explored = bytearray(size)
+    for r, c in exclude or ():
+        if 0 <= r < rows and 0 <= c < cols:
+            explored[r * cols + c] = 1
+
+    room = 0
+    for start in range(size):
+        if explored[start]:
+            continue
+
+        explored[start] = 1
+        queue = deque([start], size)  # the maximum length is required in MicroPython
+        while queue:
+            index = queue.popleft()
+            labels[index] = room
+            c = index % cols
+            if c > 0 and not explored[index - 1] and not wall_right[index - 1]:
+                explored[index - 1] = 1
+                queue.append(index - 1)
+
+            if c < cols - 1 and not explored[index + 1] and not wall_right[index]:
+                explored[index + 1] = 1
+                queue.append(index + 1)
+
+            if index >= cols and not explored[index - cols] and not wall_down[index - cols]:
+                explored[index - cols] = 1
+                queue.append(index - cols)
+
+            if index + cols < size and not explored[index + cols] and not wall_down[index]:
+                explored[index + cols] = 1
+                queue.append(index + cols)
+
+        room += 1
+
+    return labels
+
+
 def full_bfs(
     rows: int,
     cols: int,
-    edges: Dict[Tuple[int, int, str, str], bool],
+    edges: Union[Dict[Tuple[int, int, str, str], bool], PuzzleView],
     clues: Optional[Dict[Tuple[int, int, str, str], Union[int, str]]] = None,
     exclude: Optional[Iterable[Tuple[int, int]]] = None,
 ) -> Dict[Tuple[Tuple[int, int], ...], Optional[Tuple[int, int]]]:
@@ -138,54 +209,31 @@ def full_bfs(
 
     * The rooms will be converted to a tuple and become the key of the result dictionary. This ensures the consistency of the data structure.
 
+    * The rooms are ordered by their first cells in row-major order, and the cells in a room are in row-major order as well (see `room_labels`), so the same board always generates the same program. If a room contains multiple clues, the first clue in row-major order is used.
+
     Args:
         rows: The number of rows in the grid.
         cols: The number of columns in the grid.
-        edges: The edges of the grid stored in a dictionary, the format is the same to the `edge` attribute in the `Puzzle` class.
+        edges: The edges of the grid stored in a dictionary, the format is the same to the `edge` attribute in the `Puzzle` class, or the compact view of a puzzle with the same size (see `room_labels`).
         clues: The clues in the grid stored in a dictionary, the format is the same to the `text` attribute in the `Puzzle` class.
         exclude: The cells to be excluded from the BFS.
     """
-    excluded_cells = set() if exclude is None else set(exclude)
-    unexplored_cells = {(r, c) for c in range(cols) for r in range(rows) if (r, c) not in excluded_cells}
-    clue_to_room: Dict[Tuple[Tuple[int, int], ...], Optional[Tuple[int, int]]] = {}
+    labels = room_labels(rows, cols, edges, exclude)
     rc_set = {(r, c) for (r, c, _, _) in clues} if clues else set()
 
-    def get_neighbors(r: int, c: int) -> Iterator[Tuple[int, int]]:
-        """Get the neighbors of a cell."""
-        if edges.get(Point(r, c, Direction.LEFT)) is not True:
-            yield (r, c - 1)
-
-        if edges.get(Point(r, c + 1, Direction.LEFT)) is not True:
-            yield (r, c + 1)
-
-        if edges.get(Point(r, c, Direction.TOP)) is not True:
-            yield (r - 1, c)
-
-        if edges.get(Point(r + 1, c, Direction.TOP)) is not True:
-            yield (r + 1, c)
-
-    def single_bfs(start_cell: Tuple[int, int]) -> Tuple[Union[Tuple[int, int], None], Tuple[Tuple[int, int], ...]]:
-        clue_cell = None
-        connected_component = {start_cell}
-        unexplored_cells.remove(start_cell)
-
-        queue = deque([start_cell], rows * cols)  # make a deque for BFS
-        while queue:
-            r, c = queue.popleft()
-            for neighbor in get_neighbors(r, c):
-                if neighbor in unexplored_cells:
-                    connected_component.add(neighbor)
-                    unexplored_cells.remove(neighbor)
-                    queue.append(neighbor)
-
-            if clues and (r, c) in rc_set:
-                clue_cell = (r, c)
+    rooms: List[List[Tuple[int, int]]] = []
+    room_clues: List[Optional[Tuple[int, int]]] = []
+    for index, room in enumerate(labels):
+        if room == -1:
+            continue
 
-        return clue_cell, tuple(connected_component)
+        if room == len(rooms):
+            rooms.append([])
+            room_clues.append(None)
 
-    while len(unexplored_cells) != 0:
-        start_cell = random.choice(tuple(unexplored_cells))  # get a random start cell
-        clue, room = single_bfs(start_cell)
-        clue_to_room[room] = clue
+        cell = divmod(index, cols)
+        rooms[room].append(cell)
+        if room_clues[room] is None and cell in rc_set:
+            room_clues[room] = cell
 
-    return clue_to_room
+    return {tuple(room): clue for room, clue in zip(rooms, room_clues)}
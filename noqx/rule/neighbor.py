@@ -2,19 +2,44 @@
 
 from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-from noqx.puzzle import Direction, Point
+from noqx.puzzle import Direction, Point, PuzzleView
 from noqx.rule.helper import tag_encode, target_encode
 
+ORTHOGONAL_OFFSETS = ((-1, 0), (0, -1), (0, 1), (1, 0))
+DIAGONAL_OFFSETS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+KNIGHT_OFFSETS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+
+
+def _offset_adjacent(name: str, offsets: Iterable[Tuple[int, int]]) -> str:
+    """Generate the adjacency rules with bounded offsets.
+
+    * Every rule joins a cell with the cell at a fixed offset, so the grounding is linear in the number of cells, instead of considering all the pairs of cells.
+
+    Args:
+        name: The name of the adjacency predicate.
+        offsets: The offsets of the adjacent cells in the format of (`dr`, `dc`).
+    """
+    rules = []
+    for dr, dc in offsets:
+        r1 = "R" if dr == 0 else f"R {'+' if dr > 0 else '-'} {abs(dr)}"
+        c1 = "C" if dc == 0 else f"C {'+' if dc > 0 else '-'} {abs(dc)}"
+        rules.append(f"{name}(R, C, {r1}, {c1}) :- grid_all(R, C), grid_all({r1}, {c1}).")
+
+    return "\n".join(rules)
+
 
 def adjacent(_type: Union[int, str] = 4) -> str:
     """A rule to define the adjacent neighbors in a grid.
 
     * The adjacency is based on a "wider" grid with all holes, and both points should be located on the "wider" grid, named by the predicate `grid_all(R, C)`.
 
+    * The `4`, `x`, `8` and `knight` adjacencies are defined with bounded offsets rather than the distance between any two cells, so the grounding cost is linear in the size of the grid.
+
     * The following adjacency types are allowed:
         * If _type = `4`, then only orthogonal neighbors are considered.
         * If _type = `x`, then only diagonal neighbors are considered.
         * If _type = `8`, then both orthogonal and diagonal neighbors are considered.
+        * If _type = `knight`, then the neighbors a chess knight's move away are considered.
         * If _type = `edge`, then only the neighbors on unblocked edges are considered.
         * If _type = `line`, then only the neighbors on the line are considered.
         * If _type = `line_directed`, then only the neighbors on the directed line are considered.
@@ -34,16 +59,19 @@ def adjacent(_type: Union[int, str] = 4) -> str:
     rule = ""
 
     if _type == 4:
-        rule += "adj_4(R, C, R1, C1) :- grid_all(R, C), grid_all(R1, C1), |R - R1| + |C - C1| == 1."
+        rule += _offset_adjacent("adj_4", ORTHOGONAL_OFFSETS)
         return rule
 
     if _type == "x":
-        rule += "adj_x(R, C, R1, C1) :- grid_all(R, C), grid_all(R1, C1), |R - R1| == 1, |C - C1| == 1."
+        rule += _offset_adjacent("adj_x", DIAGONAL_OFFSETS)
         return rule
 
     if _type == 8:
-        rule += "adj_8(R, C, R1, C1) :- grid_all(R, C), grid_all(R1, C1), |R - R1| + |C - C1| == 1.\n"
-        rule += "adj_8(R, C, R1, C1) :- grid_all(R, C), grid_all(R1, C1), |R - R1| == 1, |C - C1| == 1."
+        rule += _offset_adjacent("adj_8", ORTHOGONAL_OFFSETS + DIAGONAL_OFFSETS)
+        return rule
+
+    if _type == "knight":
+        rule += _offset_adjacent("adj_knight", KNIGHT_OFFSETS)
         return rule
 
     if _type == "edge":
@@ -170,7 +198,9 @@ def count_covering(
     return f":- {{ {final} }} {rop} {num}."
 
 
-def area_border(_id: int, src_cells: Iterable[Tuple[int, int]], edge: Dict[Tuple[int, int, str, str], bool]) -> str:
+def area_border(
+    _id: int, src_cells: Iterable[Tuple[int, int]], edge: Union[Dict[Tuple[int, int, str, str], bool], PuzzleView]
+) -> str:
     """A rule to define the border of an area.
 
     * This border rule is useful on the rules that limit the crossing time of a line/path in the area. Although it is possible to represent the borders with ASP logic, it is better to calculate the borders with Python for performance consideration.
@@ -179,7 +209,7 @@ def area_border(_id: int, src_cells: Iterable[Tuple[int, int]], edge: Dict[Tuple
         _id: The ID of the area.
         src_cells: The cells in the area as a list of tuples of (`row`, `col`).
         edge: The edges of the grid stored in a dictionary, the format is the same to the `edge` attribute
-              in the `Puzzle` class.
+              in the `Puzzle` class, or the compact view of the puzzle (see `noqx.puzzle.Puzzle.view`).
 
     Success:
         This rule will generate a predicate named `area_border(A, R, C, D)`.
@@ -189,33 +219,45 @@ def area_border(_id: int, src_cells: Iterable[Tuple[int, int]], edge: Dict[Tuple
         ```python
             from noqx.rule.neighbor import area_border
             from noqx.rule.helper import full_bfs
-            rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge, puzzle.text)
+            rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view, puzzle.text)
             for i, (ar, rc) in enumerate(rooms.items()):
-                self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.edge))
+                self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.view))
         ```
     """
-    edges = set()
+    edges: Dict[str, None] = {}  # an ordered set, so the same area generates the same rule
     src_cells = set(src_cells)
+    view = edge if isinstance(edge, PuzzleView) else None
     for r, c in src_cells:
-        if edge.get(Point(r, c, Direction.TOP)) is True:
-            edges.add(f'area_border({_id}, {r}, {c}, "{Direction.TOP}").')
+        if view is not None and 0 <= r < view.row and 0 <= c < view.col:
+            top_index, left_index = r * view.col + c, r * (view.col + 1) + c
+            top, bottom = view.edge_top[top_index] == 1, view.edge_top[top_index + view.col] == 1
+            left, right = view.edge_left[left_index] == 1, view.edge_left[left_index + 1] == 1
+        elif view is not None:
+            top, bottom = view.has_edge(r, c, Direction.TOP), view.has_edge(r, c, Direction.BOTTOM)
+            left, right = view.has_edge(r, c, Direction.LEFT), view.has_edge(r, c, Direction.RIGHT)
+        else:
+            top, bottom = edge.get(Point(r, c, Direction.TOP)) is True, edge.get(Point(r + 1, c, Direction.TOP)) is True
+            left, right = edge.get(Point(r, c, Direction.LEFT)) is True, edge.get(Point(r, c + 1, Direction.LEFT)) is True
+
+        if top:
+            edges[f'area_border({_id}, {r}, {c}, "{Direction.TOP}").'] = None
             if (r - 1, c) in src_cells:
-                edges.add(f'area_border({_id}, {r - 1}, {c}, "{Direction.BOTTOM}").')
+                edges[f'area_border({_id}, {r - 1}, {c}, "{Direction.BOTTOM}").'] = None
 
-        if edge.get(Point(r + 1, c, Direction.TOP)) is True:
-            edges.add(f'area_border({_id}, {r}, {c}, "{Direction.BOTTOM}").')
+        if bottom:
+            edges[f'area_border({_id}, {r}, {c}, "{Direction.BOTTOM}").'] = None
             if (r + 1, c) in src_cells:
-                edges.add(f'area_border({_id}, {r + 1}, {c}, "{Direction.TOP}").')
+                edges[f'area_border({_id}, {r + 1}, {c}, "{Direction.TOP}").'] = None
 
-        if edge.get(Point(r, c, Direction.LEFT)) is True:
-            edges.add(f'area_border({_id}, {r}, {c}, "{Direction.LEFT}").')
+        if left:
+            edges[f'area_border({_id}, {r}, {c}, "{Direction.LEFT}").'] = None
             if (r, c - 1) in src_cells:
-                edges.add(f'area_border({_id}, {r}, {c - 1}, "{Direction.RIGHT}").')
+                edges[f'area_border({_id}, {r}, {c - 1}, "{Direction.RIGHT}").'] = None
 
-        if edge.get(Point(r, c + 1, Direction.LEFT)) is True:
-            edges.add(f'area_border({_id}, {r}, {c}, "{Direction.RIGHT}").')
+        if right:
+            edges[f'area_border({_id}, {r}, {c}, "{Direction.RIGHT}").'] = None
             if (r, c + 1) in src_cells:
-                edges.add(f'area_border({_id}, {r}, {c + 1}, "{Direction.LEFT}").')
+                edges[f'area_border({_id}, {r}, {c + 1}, "{Direction.LEFT}").'] = None
 
     rule = "\n".join(edges)
     return rule
@@ -4,32 +4,50 @@ Note:
     Every connectivity rule consists of three parts: **initialization**, **propagation** and **constraint** (optional). This structure is similar to the flood-fill algorithm, and it is recommended by the [Clingo](https://potassco.org/clingo/) documentation.
 """
 
-from typing import List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from noqx.puzzle import Direction
 from noqx.rule.helper import tag_encode, target_encode, validate_type
 
+# whether the solvers use `grid_multi_src_color_connected` rather than a `grid_src_color_connected` rule per source cell,
+# which is an encoding switch for the benchmarks and the tests (it is a part of `noqx.manager.program_key`)
+SHARED_REACHABILITY = True
+
 
 def grid_color_connected(
     color: str = "black",
     adj_type: Union[int, str] = 4,
     grid_size: Optional[Tuple[int, int]] = None,
+    backend: str = "asp",
 ) -> str:
     """A rule to ensure all the color cells are connected in the grid.
 
     * This is the most efficient connectivity checker in this module, since it only considers a global constraint. If the problem can be modelled to use this rule, don't hesitate to use it.
 
+    * The following backends are allowed:
+        * If backend = `asp`, the connectivity is encoded as a flood fill in the program.
+        * If backend = `propagator`, the color cells are also exposed as `propagate_connected(Tag, Adj, R, C)` atoms, which are checked by the `noqx.propagator.ConnectivityPropagator` registered by the solver backend. The flood fill is kept as a fallback and only grounded if the `connectivity_propagator` constant is not set to `1`, so the program stays valid for the backends without the propagator (e.g., the web version).
+
     Args:
         color: The color to be checked.
         adj_type: The type of adjacency (accepted types: `4`, `8`, `x`, `line`, `line_directed`).
         grid_size: The size of the grid in (`rows`, `columns`). If provided, the propagation starts from the middle of the grid to increase the speed potentially.
+        backend: The backend of the connectivity checker (accepted types: `asp`, `propagator`). The `propagator` backend only accepts the `4`, `8` and `x` adjacency types.
 
     Success:
         This rule will generate a predicate named `reachable_grid_adj_{adj_type}_{color}(R, C)`.
     """
     validate_type(adj_type, (4, 8, "x", "line", "line_directed"))
+    validate_type(backend, ("asp", "propagator"))
     tag = tag_encode("reachable", "grid", "adj", adj_type, color)
 
+    if backend == "propagator":
+        validate_type(adj_type, (4, 8, "x"))
+        adj = f'"{adj_type}"' if adj_type == "x" else adj_type
+        rule = f'propagate_connected("{tag}", {adj}, R, C) :- grid(R, C), {color}(R, C).\n'
+        fallback = grid_color_connected(color, adj_type, grid_size)
+        return rule + "\n".join(f"{line[:-1]}, connectivity_propagator != 1." for line in fallback.split("\n"))
+
     if grid_size is None:
         initial = f"{tag}(R, C) :- (R, C) = #min {{ (R1, C1): grid(R1, C1), {color}(R1, C1) }}."
     else:
@@ -141,6 +159,57 @@ def grid_src_color_connected(
     return initial + "\n" + propagation
 
 
+def grid_multi_src_color_connected(
+    src_cells: Dict[Tuple[int, int], Optional[int]],
+    color: Optional[str] = "black",
+    adj_type: Union[int, str] = 4,
+    exclusive: bool = True,
+) -> str:
+    """A rule to collect all the color cells that are reachable to several source cells in a grid with shared rules.
+
+    * This rule replaces calling `grid_src_color_connected` for every source cell. Every source cell is given an upper bound on the size of its region, and a cell can only be reached if its Manhattan distance to the source cell is less than the bound. Hence, the ground program only grows with the cells around the source cells instead of the whole grid. The color cells next to a region but out of the bound are forbidden.
+
+    * If `exclusive` is `True`, every cell is reachable to at most one source cell, which becomes the only owner of the cell. The other source cells do not need to be excluded, and two regions cannot touch each other.
+
+    * Similar to `grid_src_color_connected`, a `count_reachable_src` rule or an `avoid_unknown_src` rule may be applied to the generated predicate.
+
+    Args:
+        src_cells: The source cells in (`row`, `col`) mapped to the upper bounds on the size of their regions. If the bound is `None`, the region is unbounded, which grounds the rules over the whole grid as `grid_src_color_connected` does.
+        color: The color to be checked. If it is `None`, only the `edge` adjacency is accepted.
+        adj_type: The type of adjacency (accepted types: `4`, `edge`).
+        exclusive: Whether every cell is reachable to at most one source cell.
+
+    Success:
+        This rule will generate a predicate named `reachable_grid_src_adj_{adj_type}_{color}(R0, C0, R, C)`.
+    """
+    if color is None:
+        validate_type(adj_type, ("edge",))
+    else:
+        validate_type(adj_type, (4, "edge"))
+
+    tag = tag_encode("reachable", "grid", "src", "adj", adj_type, color)
+    bound = tag_encode("reachable", "grid", "src", "bound", "adj", adj_type, color)
+
+    rule = "\n".join(f"{bound}({r}, {c}, {'#sup' if size is None else size - 1})." for (r, c), size in src_cells.items())
+    rule += "\n" + f"{tag}(R0, C0, R0, C0) :- {bound}(R0, C0, _)."
+
+    neighbor = f"{tag}(R0, C0, R1, C1), {bound}(R0, C0, D), grid(R, C), adj_{adj_type}(R, C, R1, C1)"
+    if adj_type != "edge":
+        neighbor += f", {color}(R, C)"
+
+    rule += "\n" + f"{tag}(R0, C0, R, C) :- {neighbor}, |R - R0| + |C - C0| <= D."
+    rule += "\n" + f":- {neighbor}, |R - R0| + |C - C0| > D."
+
+    if adj_type == "edge":  # edge between two reachable grids is forbidden.
+        rule += "\n" + f':- {tag}(R0, C0, R, C), {tag}(R0, C0, R, C + 1), edge(R, C + 1, "{Direction.LEFT}").'
+        rule += "\n" + f':- {tag}(R0, C0, R, C), {tag}(R0, C0, R + 1, C), edge(R + 1, C, "{Direction.TOP}").'
+
+    if exclusive:
+        rule += "\n" + f":- grid(R, C), #count {{ R0, C0: {tag}(R0, C0, R, C) }} > 1."
+
+    return rule
+
+
 def bulb_src_color_connected(src_cell: Tuple[int, int], color: Optional[str] = "black", adj_type: Union[int, str] = 4) -> str:
     """A rule to collect all the color cells that are orthogonally connected to a source cell in a grid.
 
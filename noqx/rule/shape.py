@@ -1,7 +1,7 @@
 """Rules and constraints to detect certain shapes."""
 
-from collections import deque
-from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from collections import OrderedDict, deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
 
 from noqx.puzzle import Direction
 from noqx.rule.helper import fail_false, tag_encode, target_encode, validate_type
@@ -55,17 +55,32 @@ def normalize_shape(shape: Iterable[Tuple[int, int]]) -> Tuple[Tuple[int, int],
     return tuple((r - min_r, c - min_c) for r, c in shape)
 
 
+# the maximum number of shapes whose variants are kept in memory, since the shapes may come from the puzzles
+VARIANT_CACHE_SIZE = 256
+_variant_cache: "OrderedDict[Tuple[Tuple[Tuple[int, int], ...], bool, bool], FrozenSet[Tuple[Tuple[int, int], ...]]]" = (
+    OrderedDict()
+)
+
+
 def get_variant_shape(
     shape: Iterable[Tuple[int, int]], allow_rotations: bool, allow_reflections: bool
-) -> Set[Tuple[Tuple[int, int], ...]]:
+) -> FrozenSet[Tuple[Tuple[int, int], ...]]:
     """Generate the equivalent variants for a shape.
 
+    * The variants of the recently used shapes are cached by the normalized shape, at most `VARIANT_CACHE_SIZE` shapes are kept.
+
     Args:
         shape: the representation of a shape.
         allow_rotations: Whether the shapes can be rotated to build the variants.
         allow_reflections: Whether the shapes can be reflected to build the variants.
     """
     shape = normalize_shape(shape)
+    key = (shape, allow_rotations, allow_reflections)
+    cached = _variant_cache.pop(key, None)
+    if cached is not None:
+        _variant_cache[key] = cached  # move to the most recently used end
+        return cached
+
     result: Set[Tuple[Tuple[int, int], ...]] = {shape}
     queue = deque([shape], 8)
     while queue:
@@ -83,7 +98,27 @@ def get_variant_shape(
                 result.add(new_shape)
                 queue.append(new_shape)
 
-    return result
+    variants = frozenset(result)
+    _variant_cache[key] = variants
+    while len(_variant_cache) > VARIANT_CACHE_SIZE:
+        _variant_cache.pop(next(iter(_variant_cache)), None)
+
+    return variants
+
+
+def shape_placements(variant: Tuple[Tuple[int, int], ...], cells: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Enumerate the placements of a shape variant that are fully covered by the given cells.
+
+    * A placement is the offset (`row`, `col`) added to every cell of the variant, which is the same as the `R` and `C` in the shape predicates.
+
+    Args:
+        variant: The normalized shape variant.
+        cells: The cells where the shape can be placed.
+    """
+    cell_set = set(cells)
+    first_r, first_c = variant[0]
+    anchors = sorted((r - first_r, c - first_c) for r, c in cell_set)
+    return [(r, c) for r, c in anchors if all((r + dr, c + dc) in cell_set for dr, dc in variant)]
 
 
 def parse_shape(shape_str: str) -> Tuple[Tuple[int, int], ...]:
@@ -134,7 +169,7 @@ def parse_shapeset(shapeset: Union[str, List[Dict[str, Union[int, str]]]]) -> Di
         return result_data[shapeset]
     else:
         result: Dict[Tuple[Tuple[int, int], ...], int] = {}
-        result_equivalent: Dict[Tuple[Tuple[int, int], ...], Set[Tuple[Tuple[int, int], ...]]] = {}
+        result_equivalent: Dict[Tuple[Tuple[int, int], ...], FrozenSet[Tuple[Tuple[int, int], ...]]] = {}
         for shape_dict in shapeset:
             shape = parse_shape(str(shape_dict["shape"]))
             count = int(shape_dict["count"])
@@ -161,6 +196,7 @@ def general_shape(
     _type: str = "grid",
     adj_type: Union[int, str] = 4,
     simple: bool = False,
+    cells: Optional[Union[Iterable[Tuple[int, int]], Dict[int, Iterable[Tuple[int, int]]]]] = None,
 ) -> str:
     """A rule to define general shapes in a grid or an area.
 
@@ -168,6 +204,8 @@ def general_shape(
 
     * The rotations and reflections of the shape are **automatically** considered as the same.
 
+    * If the `cells` are provided, the legal placements of every variant are enumerated in advance and given as `placement` facts, so the grounder does not need to try every cell as an anchor. The cells that can never be colored (e.g., fixed by the clues) should be left out to prune the placements.
+
     Args:
         name: The name of the shape.
         _id: The ID of the shape, needs to be unique.
@@ -176,6 +214,7 @@ def general_shape(
         _type: The type of the shape rule (accepted types: "grid" or "area").
         adj_type: The type of adjacency (accepted types: `4`, `8`, `x`, `line`, `line_directed`).
         simple: Whether to skip the adjacency re-checking.
+        cells: The cells where the shape can be placed. If `_type` is set to "grid", it is a list of cells. If `_type` is set to "area", it is a dictionary of area IDs to their cells.
 
     Success:
         * If `_type` is set to "grid", this rule will generate two predicates named `shape_{name}_{color}(R, C)` and `belong_to_shape_{name}_{color}(R, C, I, V)`.
@@ -200,20 +239,38 @@ def general_shape(
 
     tag = tag_encode("shape", name, color)
     tag_be = tag_encode("belong_to_shape", name, color)
+    tag_pl = tag_encode("placement", name, color)
     data = ""
 
     variants = get_variant_shape(deltas, allow_rotations=True, allow_reflections=True)
     for i, variant in enumerate(variants):
         valid, belongs_to = set(), set()
+        if cells is not None and _type == "grid":
+            data += "".join(f"{tag_pl}({r}, {c}, {_id}, {i}).\n" for r, c in shape_placements(variant, cells))  # type: ignore
+            valid.add(f"{tag_pl}(R, C, {_id}, {i})")
+
+        if cells is not None and _type == "area":
+            for a, area_cells in cells.items():  # type: ignore
+                data += "".join(f"{tag_pl}({a}, {r}, {c}, {_id}, {i}).\n" for r, c in shape_placements(variant, area_cells))
+            valid.add(f"{tag_pl}(A, R, C, {_id}, {i})")
+
         for dr, dc in variant:
-            if _type == "grid":
+            if _type == "grid" and cells is not None:
+                valid.add(f"{color}(R + {dr}, C + {dc})")
+                belongs_to.add(f"{tag_be}(R + {dr}, C + {dc}, {_id}, {i}) :- {tag}(R, C, {_id}, {i}).")
+
+            if _type == "grid" and cells is None:
                 valid.add(f"grid(R + {dr}, C + {dc})")
                 valid.add(f"{color}(R + {dr}, C + {dc})")
                 belongs_to.add(
                     f"{tag_be}(R + {dr}, C + {dc}, {_id}, {i}) :- grid(R + {dr}, C + {dc}), {tag}(R, C, {_id}, {i})."
                 )
 
-            if _type == "area":
+            if _type == "area" and cells is not None:
+                valid.add(f"{color}(R + {dr}, C + {dc})")
+                belongs_to.add(f"{tag_be}(A, R + {dr}, C + {dc}, {_id}, {i}) :- {tag}(A, R, C, {_id}, {i}).")
+
+            if _type == "area" and cells is None:
                 valid.add(f"area(A, R + {dr}, C + {dc})")
                 valid.add(f"{color}(R + {dr}, C + {dc})")
                 belongs_to.add(
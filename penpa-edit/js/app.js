@@ -25,6 +25,20 @@ function exp(saveUndo = false) {
   return result;
 }
 
+const installedSolvers = new Set(); // the solver modules are fetched on first use in deployment mode
+
+async function installSolver(puzzleType) {
+  if (installedSolvers.has(puzzleType)) return;
+
+  const response = await fetch(`./py/solver/${puzzleType}.py`);
+  if (!response.ok) throw new Error(`Failed to fetch the ${solver_metadata[puzzleType].name} solver.`);
+
+  const installed = install_solver(puzzleType, await response.text());
+  if (!installed["success"]) throw new Error(installed["result"]);
+
+  installedSolvers.add(puzzleType);
+}
+
 function hookExp() {
   const baseUrl = pu.maketext_baseurl();
   let result = exp(document.getElementById("save_undo").checked);
@@ -808,6 +822,7 @@ $(window).on("load", function () {
 
       if (DEPLOYMENT_MODE) {
         try {
+          await installSolver(puzzleType);
           const puzzle = prepare_puzzle(puzzleType, puzzleContent, puzzleParameters);
           if (!puzzle["success"]) {
             throw new Error(puzzle["result"]);
@@ -818,7 +833,12 @@ $(window).on("load", function () {
             throw new Error(program["result"]);
           }
 
-          const options = "--trans-ext=dynamic --eq=1 --models=10";
+          const solverConfig = { "trans-ext": "dynamic", eq: 1, ...solver_metadata[puzzleType].solver_config };
+          delete solverConfig.domain; // the domain heuristics are only applied on the server
+          const options = Object.entries(solverConfig)
+            .map(([k, v]) => `--${k}=${v}`)
+            .concat(["--models=10"])
+            .join(" ");
           const result = await clingo.run(program["result"], options);
 
           if (result.Result === "ERROR") {
@@ -864,7 +884,7 @@ $(window).on("load", function () {
           }
         }
       } else {
-        fetch("/api/solve/", {
+        fetch("/api/solve/stream/", {
           method: "POST",
           body: JSON.stringify({
             puzzle_name: puzzleType,
@@ -874,8 +894,8 @@ $(window).on("load", function () {
           headers: { "Content-type": "application/json" },
         })
           .then(async (response) => {
-            let body = await response.json();
-            if (response.status === 400 || response.status === 500) {
+            if ([400, 413, 500, 503].includes(response.status)) {
+              let body = await response.json();
               Swal.fire({
                 icon: "error",
                 title: "Oops...",
@@ -885,16 +905,46 @@ $(window).on("load", function () {
               solveButton.textContent = "Solve";
               return;
             } else if (response.status === 504) {
+              let body = await response.json();
               Swal.fire({
                 icon: "error",
                 title: "Oops...",
-                text: "Time limit exceeded.",
+                text: body.detail || "Time limit exceeded.",
                 footer: issueMessage,
               });
               solveButton.textContent = "Solve";
               return;
             } else {
-              solutionList = body.url;
+              // every line of the response is a JSON object, load the first solution as soon as it arrives
+              solutionList = [];
+              const reader = response.body.getReader();
+              const decoder = new TextDecoder();
+              let buffer = "";
+              while (true) {
+                const { done, value } = await reader.read();
+                if (value) buffer += decoder.decode(value, { stream: true });
+
+                let lineEnd = buffer.indexOf("\n");
+                while (lineEnd !== -1) {
+                  const body = JSON.parse(buffer.slice(0, lineEnd));
+                  buffer = buffer.slice(lineEnd + 1);
+                  lineEnd = buffer.indexOf("\n");
+
+                  if (body.url) {
+                    solutionList.push(body.url);
+                    if (solutionList.length === 1) {
+                      solutionPointer = 0;
+                      hookLoad(solutionList[solutionPointer]);
+                    }
+                    solveButton.textContent = `Solution (${solutionPointer + 1}/${solutionList.length}...)`;
+                  } else if (body.detail) {
+                    console.warn(`[Solver] ${body.detail}`);
+                  }
+                }
+
+                if (done) break;
+              }
+
               if (solutionList.length === 0) {
                 Swal.fire({
                   icon: "error",
@@ -904,8 +954,6 @@ $(window).on("load", function () {
                 });
                 return;
               }
-              solutionPointer = 0;
-              hookLoad(solutionList[solutionPointer]);
             }
           })
           .catch((e) => {
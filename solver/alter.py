@@ -52,7 +52,7 @@ class AlterSolver(Solver):
         self.add_program_line(adjacent(_type=4))
         self.add_program_line(alternation_constraint())
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
             self.add_program_line(count(1, color="ox_E__1", _type="area", _id=i))
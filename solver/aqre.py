@@ -43,7 +43,7 @@ class AqreSolver(Solver):
         self.add_program_line(avoid_rect(4, 1, color="not gray"))
         self.add_program_line(avoid_rect(1, 4, color="not gray"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge, puzzle.text)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view, puzzle.text)
         for i, (ar, rc) in enumerate(rooms.items()):
             self.add_program_line(area(_id=i, src_cells=ar))
             if rc:
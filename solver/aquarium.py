@@ -35,7 +35,7 @@ class AquariumSolver(Solver):
         self.add_program_line(shade_c(color="blue"))
         self.add_program_line(water_physics(color="blue"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
 
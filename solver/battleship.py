@@ -81,9 +81,20 @@ class BattleshipSolver(Solver):
         self.add_program_line(avoid_same_color_adjacent(color=fleet_name, adj_type="x"))
         self.add_program_line(all_shapes("battleship", color=fleet_name))
 
+        # the water cells and the rows/columns without ships cannot be covered by a ship
+        excluded_rows = {r for (r, c, _, _), num in puzzle.text.items() if c == -1 and num == 0}
+        excluded_cols = {c for (r, c, _, _), num in puzzle.text.items() if r == -1 and num == 0}
+        excluded = {(r, c) for (r, c, _, _), symbol_name in puzzle.symbol.items() if symbol_name.split("__")[1] in ("7", "8")}
+        cells = [
+            (r, c)
+            for r in range(puzzle.row)
+            for c in range(puzzle.col)
+            if r not in excluded_rows and c not in excluded_cols and (r, c) not in excluded
+        ]
+
         shapeset = parse_shapeset(puzzle.param["shapeset"])
         for i, (o_shape, o_count) in enumerate(shapeset.items()):
-            self.add_program_line(general_shape("battleship", i, o_shape, color=fleet_name, adj_type=4))
+            self.add_program_line(general_shape("battleship", i, o_shape, color=fleet_name, adj_type=4, cells=cells))
             self.add_program_line(count_shape(o_count, name="battleship", _id=i, color=fleet_name))
 
         for (r, c, d, label), num in puzzle.text.items():
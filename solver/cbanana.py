@@ -70,6 +70,7 @@ class CBananaSolver(Solver):
             "test": False,
         },
     ]
+    solver_config = {"configuration": "jumpy"}
 
     def solve(self, puzzle: Puzzle) -> str:
         self.reset()
@@ -29,7 +29,7 @@ class ChoconaSolver(Solver):
         self.add_program_line(shade_c("gray"))
         self.add_program_line(adjacent())
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge, puzzle.text)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view, puzzle.text)
         for i, (ar, rc) in enumerate(rooms.items()):
             self.add_program_line(area(_id=i, src_cells=ar))
             if rc:
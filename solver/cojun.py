@@ -29,7 +29,7 @@ class CojunSolver(Solver):
         self.add_program_line(avoid_same_number_adjacent(adj_type=4))
         self.add_program_line(":- area(A, R, C), area(A, R + 1, C), number(R, C, N1), number(R + 1, C, N2), N1 < N2.")
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
             self.add_program_line(fill_num(_range=range(1, len(ar) + 1), _type="area", _id=i))
@@ -36,10 +36,10 @@ class CountrySolver(Solver):
         self.add_program_line(grid_color_connected(color="white", adj_type="line"))
         self.add_program_line(single_route(color="white"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge, puzzle.text)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view, puzzle.text)
         for i, (ar, rc) in enumerate(rooms.items()):
             self.add_program_line(area(_id=i, src_cells=ar))
-            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.edge))
+            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.view))
             self.add_program_line(count_area_pass(1, _id=i))
             if rc:
                 num = puzzle.text[Point(*rc, Direction.CENTER, "normal")]
@@ -33,7 +33,7 @@ class DetourSolver(Solver):
         self.add_program_line(single_route(color="grid"))
         self.add_program_line(route_turning(color="grid"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge, puzzle.text)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view, puzzle.text)
         for i, (ar, rc) in enumerate(rooms.items()):
             self.add_program_line(area(_id=i, src_cells=ar))
 
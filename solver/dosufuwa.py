@@ -43,7 +43,7 @@ class DosuFuwaSolver(Solver):
             self.add_program_line(f"hole({r}, {c}).")
             exclude.add((r, c))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge, exclude=exclude)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view, exclude=exclude)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
             self.add_program_line(count(1, color="circle_M__1", _type="area", _id=i))
@@ -45,7 +45,7 @@ class DotchiSolver(Solver):
         self.add_program_line(route_turning(color="white"))
         self.add_program_line(dotchi_constraint())
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
 
@@ -45,7 +45,7 @@ class DotchiDotchiLoopSolver(Solver):
         self.add_program_line(classify_area([("black_clue", "white"), ("white_clue", "white")]))
         self.add_program_line(dotchi2_constraint())
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
 
@@ -46,7 +46,8 @@ class DoubleBackSolver(Solver):
             puzzle.edge[Point(r + 1, c, Direction.TOP)] = True
             puzzle.edge[Point(r, c + 1, Direction.LEFT)] = True
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        puzzle.clear_view()  # the edges of the holes are added
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             arb = tuple(
                 filter(lambda x: puzzle.surface.get(Point(*x)) is None or puzzle.surface[Point(*x)] not in Color.DARK, ar)
@@ -54,7 +55,7 @@ class DoubleBackSolver(Solver):
             if len(arb) == 0:
                 continue  # drop holes
 
-            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.edge))
+            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.view))
             self.add_program_line(count_area_pass(2, _id=i))
 
         for (r, c, d, label), draw in puzzle.line.items():
@@ -2,10 +2,11 @@
 
 from noqx.manager import Solver
 from noqx.puzzle import Direction, Puzzle
+from noqx.rule import reachable
 from noqx.rule.common import display, edge, grid
 from noqx.rule.helper import fail_false, tag_encode, validate_direction, validate_type
 from noqx.rule.neighbor import adjacent
-from noqx.rule.reachable import count_reachable_src, grid_src_color_connected
+from noqx.rule.reachable import count_reachable_src, grid_multi_src_color_connected, grid_src_color_connected
 
 
 def fillomino_constraint() -> str:
@@ -100,12 +101,17 @@ class FillominoSolver(Solver):
         numberx_ub = puzzle.row * puzzle.col - sum({num for _, num in puzzle.text.items() if isinstance(num, int)})
         self.add_program_line(f":- #count{{ R, C: grid(R, C), have_numberx(R, C) }} > {numberx_ub}.")
 
+        if reachable.SHARED_REACHABILITY:  # regions with the same number can be merged
+            src_cells = {(r, c): num for (r, c, _, _), num in puzzle.text.items() if isinstance(num, int)}
+            self.add_program_line(grid_multi_src_color_connected(src_cells, color=None, adj_type="edge", exclusive=False))
+
         for (r, c, d, label), num in puzzle.text.items():
             validate_direction(r, c, d)
             validate_type(label, "normal")
             fail_false(isinstance(num, int), f"Clue at ({r}, {c}) should be an integer.")
             self.add_program_line(f"number({r}, {c}, {num}).")
-            self.add_program_line(grid_src_color_connected(src_cell=(r, c), color=None, adj_type="edge"))
+            if not reachable.SHARED_REACHABILITY:
+                self.add_program_line(grid_src_color_connected(src_cell=(r, c), color=None, adj_type="edge"))
             self.add_program_line(count_reachable_src(target=int(num), src_cell=(r, c), color=None, adj_type="edge"))
 
             if num == 1:
@@ -61,10 +61,10 @@ class HaisuSolver(Solver):
         self.add_program_line(haisu_count())
 
         s_index = []
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
-            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.edge))
+            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.view))
 
             for r, c in ar:
                 if puzzle.text.get(Point(r, c, Direction.CENTER, "normal")) == "S":
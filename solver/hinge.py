@@ -79,10 +79,10 @@ class HingeSolver(Solver):
                         r += 1
                 r += 1
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge, puzzle.text)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view, puzzle.text)
         for i, (ar, rc) in enumerate(rooms.items()):
             self.add_program_line(area(_id=i, src_cells=ar))
-            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.edge))
+            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.view))
             if rc:
                 num = puzzle.text.get(Point(*rc, Direction.CENTER, "normal"))
                 if isinstance(num, int):
@@ -49,13 +49,13 @@ class IcebarnSolver(Solver):
         self.add_program_line(shade_c(color="crossing", _from="ice"))
         self.add_program_line(straight_at_ice(color="white", directed=True))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             if len(tuple((r, c) for r, c in ar if puzzle.surface.get(Point(r, c)) == Color.BLUE)) != len(ar):
                 continue  # filter ice rooms
 
             self.add_program_line(area(_id=i, src_cells=ar))
-            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.edge))
+            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.view))
             self.add_program_line(count_area_pass(("gt", 0), _id=i, directed=True))
 
         start_point: List[Tuple[int, int]] = []
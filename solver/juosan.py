@@ -45,7 +45,7 @@ class JuosanSolver(Solver):
         self.add_program_line(shade_c())
         self.add_program_line(jousan_constraint())
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge, puzzle.text)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view, puzzle.text)
         for i, (ar, rc) in enumerate(rooms.items()):
             self.add_program_line(area(_id=i, src_cells=ar))
             if rc:
@@ -22,6 +22,7 @@ class KakuroSolver(Solver):
             "test": False,
         },
     ]
+    solver_config = {"sat-prepro": 2}
 
     def solve(self, puzzle: Puzzle) -> str:
         self.reset()
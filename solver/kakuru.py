@@ -34,6 +34,7 @@ class KakuruSolver(Solver):
             "data": "m=edit&p=7VRNj9MwEL3nV6x89iH+iltfUHfZcinlo0UrZEWrtGS1Fa0CaYOQq/x3xjPRunQ5rJCAPSDLz69vxvWzx/H+a1e1NS+gqRHPuYAmiwK70Bp7PrTl5rCt3QWfdIf7pgXC+ZvplN9V232d+SGrzI5h7MKEh1fOM8E4k9AFK3l4547htQtzHhYQYlyDNqMkCfQ60RuMR3ZFosiBz4kXQD8CXW/a9ba+nUEUlLfOhyVncZ1LnB0p2zXfajb4iL/XzW61icKqOsBm9vebL0Nk331qPndDrih7HiZndkWyq5Jd9WBX/dqu/PN2x2Xfw7G/B8O3zkfvHxIdJbpwRyYlcxqKomkwNFgclMJBU4qmmKaYIdHQPENiUeBgKWYpZmmejSl9PAZaFJxqKB7dBVz/TDFRkeJEsVF5kYTozzOVJ0XL80naPMrBvxE2KUae5xi0o08VnDVOQtyrj54eFEu7Gp0oj3Zl0Y5QJ4r9WYEjEu7Yx0sScYooEZdQNh4U4kvEHNEgzjDnGvEG8QpRIxaYY2Phn3g1qFZ/wY6XEt8Zaub3eZl5tujau2pdw2cx73arur2YN+2u2jJ4h/qMfWfYvYJ0/f9p+kdPUyxB/txu4XOzA99Fmf0A"
         },
     ]
+    solver_config = {"sat-prepro": 2}
 
     def solve(self, puzzle: Puzzle) -> str:
         self.reset()
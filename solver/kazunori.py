@@ -42,7 +42,7 @@ class KazunoriSolver(Solver):
         self.add_program_line(avoid_2x2_number())
         self.add_program_line(area_num_adjacent(adj_type=4))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             fail_false(len(ar) % 2 == 0, f"Area {i} must have an even number of cells.")
             self.add_program_line(area(_id=i, src_cells=ar))
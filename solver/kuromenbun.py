@@ -55,7 +55,7 @@ class KuromenbunSolver(Solver):
         self.add_program_line(shade_c(color="gray"))
         self.add_program_line(adjacent())
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge, puzzle.text)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view, puzzle.text)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
             excluded: List[Tuple[int, int]] = []
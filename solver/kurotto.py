@@ -22,6 +22,7 @@ class KurottoSolver(Solver):
             "test": False,
         },
     ]
+    solver_config = {"configuration": "frumpy"}
 
     def solve(self, puzzle: Puzzle) -> str:
         self.reset()
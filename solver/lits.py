@@ -44,7 +44,7 @@ class LitsSolver(Solver):
         self.add_program_line(grid_color_connected(color="gray", grid_size=(puzzle.row, puzzle.col)))
         self.add_program_line(avoid_rect(2, 2, color="gray"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
 
@@ -53,9 +53,13 @@ class LitsSolver(Solver):
         if puzzle.param["invlitso"]:
             shapes.append("O")  # add O shape for Inverse LITSO
 
+        excluded = {(r, c) for (r, c, _, _), shade in puzzle.surface.items() if (shade in Color.DARK) != (color == "gray")}
+        area_cells = {i: [cell for cell in ar if cell not in excluded] for i, ar in enumerate(rooms)}
         for i, o_type in enumerate(shapes):
             o_shape = OMINOES[4][o_type]
-            self.add_program_line(general_shape("omino_4", i, o_shape, color=color, _type="area", simple=True))
+            self.add_program_line(
+                general_shape("omino_4", i, o_shape, color=color, _type="area", simple=True, cells=area_cells)
+            )
 
         self.add_program_line(all_shapes("omino_4", color=color, _type="area"))
         self.add_program_line(count_shape(1, "omino_4", _id=None, color=color, _type="area"))
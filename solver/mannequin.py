@@ -88,7 +88,7 @@ class MannequinSolver(Solver):
         self.add_program_line(area_adjacent())
         self.add_program_line(mannequin_constraint(color="gray"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge, puzzle.text)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view, puzzle.text)
         for i, (ar, rc) in enumerate(rooms.items()):
             self.add_program_line(area(_id=i, src_cells=ar))
             self.add_program_line(distance_in_room(ar, puzzle.edge))
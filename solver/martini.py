@@ -35,6 +35,7 @@ class MartiniSolver(Solver):
             "test": False,
         },
     ]
+    solver_config = {"configuration": "trendy"}
 
     def solve(self, puzzle: Puzzle) -> str:
         self.reset()
@@ -45,7 +46,7 @@ class MartiniSolver(Solver):
         self.add_program_line(area_color_connected(color="gray", adj_type=4))
         self.add_program_line(grid_color_connected(color="gray", adj_type=8))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
 
@@ -46,7 +46,7 @@ class MeanderSolver(Solver):
         self.add_program_line(avoid_same_number_adjacent(adj_type=8))
         self.add_program_line(unique_num(_type="area", color="grid"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, (ar, _) in enumerate(rooms.items()):
             self.add_program_line(area(_id=i, src_cells=ar))
             self.add_program_line(fill_num(_range=range(1, len(ar) + 1), _type="area", _id=i))
@@ -51,11 +51,11 @@ class MoonSunSolver(Solver):
         self.add_program_line(grid_color_connected(color="white", adj_type="line"))
         self.add_program_line(single_route(color="white"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         fail_false(len(rooms) % 2 == 0, "The number of areas should be even.")
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
-            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.edge))
+            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.view))
             self.add_program_line(count_area_pass(1, _id=i))
 
         for (r, c, d, _), symbol_name in puzzle.symbol.items():
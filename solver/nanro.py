@@ -45,7 +45,7 @@ class NanroSolver(Solver):
         self.add_program_line(nanro_fill_constraint(color="not gray"))
         self.add_program_line(nanro_avoid_adjacent())
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
             self.add_program_line(fill_num(_range=range(1, len(ar) + 1), _type="area", _id=i, color="gray"))
@@ -36,7 +36,7 @@ class NewsSolver(Solver):
         self.add_program_line(unique_num(color="grid", _type="area"))
         self.add_program_line(news_constraint())
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
             self.add_program_line(fill_num(_range=range(1, 5), color="white", _type="area", _id=i))
@@ -31,7 +31,7 @@ class NorinoriSolver(Solver):
         self.add_program_line(adjacent())
         self.add_program_line(nori_adjacent(color="gray"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
             self.add_program_line(count(2, color="gray", _type="area", _id=i))
@@ -112,13 +112,9 @@ class NumlinVBitSolver(Solver):
         rule, nbit = num_binary_range(len(locations))
         self.add_program_line(rule)
 
-        if puzzle.param["visit_all"]:
-            self.add_program_line("white(R, C) :- grid(R, C).")
-        else:
-            self.add_program_line(shade_c(color="white"))
-
-        if puzzle.param["no_2x2"]:
-            self.add_program_line(no_2x2_path_bit())
+        self.add_param_line("white(R, C) :- grid(R, C).", "visit_all", puzzle.param["visit_all"])
+        self.add_param_line(shade_c(color="white"), "visit_all", puzzle.param["visit_all"], negate=True)
+        self.add_param_line(no_2x2_path_bit(), "no_2x2", puzzle.param["no_2x2"])
 
         self.add_program_line(fill_line(color="white"))
         self.add_program_line(adjacent(_type="line"))
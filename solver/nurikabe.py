@@ -4,6 +4,7 @@ from typing import List, Tuple
 
 from noqx.manager import Solver
 from noqx.puzzle import Color, Puzzle
+from noqx.rule import reachable
 from noqx.rule.common import display, grid, shade_c
 from noqx.rule.helper import validate_direction, validate_type
 from noqx.rule.neighbor import adjacent
@@ -11,6 +12,7 @@ from noqx.rule.reachable import (
     avoid_unknown_src,
     count_reachable_src,
     grid_color_connected,
+    grid_multi_src_color_connected,
     grid_src_color_connected,
 )
 from noqx.rule.shape import avoid_rect
@@ -46,10 +48,15 @@ class NurikabeSolver(Solver):
             validate_type(label, "normal")
             all_src.append((r, c))
 
+        if reachable.SHARED_REACHABILITY:
+            src_cells = {(r, c): num if isinstance(num, int) else None for (r, c, _, _), num in puzzle.text.items()}
+            self.add_program_line(grid_multi_src_color_connected(src_cells, color="not black"))
+
         for (r, c, _, _), num in puzzle.text.items():
-            current_excluded = [src for src in all_src if src != (r, c)]
             self.add_program_line(f"not black({r}, {c}).")
-            self.add_program_line(grid_src_color_connected((r, c), exclude_cells=current_excluded, color="not black"))
+            if not reachable.SHARED_REACHABILITY:
+                current_excluded = [src for src in all_src if src != (r, c)]
+                self.add_program_line(grid_src_color_connected((r, c), exclude_cells=current_excluded, color="not black"))
 
             if isinstance(num, int):
                 self.add_program_line(count_reachable_src(num, (r, c), color="not black"))
@@ -42,7 +42,7 @@ class NurimazeSolver(Solver):
         self.add_program_line(single_route(color="white", path=True))
         self.add_program_line(grid_color_connected(color="white", adj_type="line"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
 
@@ -65,10 +65,10 @@ class OnsenSolver(Solver):
         self.add_program_line(single_route(color="white"))
 
         onsen_id = 0
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
-            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.edge))
+            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.view))
             self.add_program_line(count(("gt", 0), _id=i, color="white", _type="area"))
 
             for r, c in ar:
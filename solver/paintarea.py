@@ -34,7 +34,7 @@ class PaintareaSolver(Solver):
         self.add_program_line(avoid_rect(2, 2, color="not gray"))
         self.add_program_line(area_same_color(color="gray"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, (ar, _) in enumerate(rooms.items()):
             self.add_program_line(area(_id=i, src_cells=ar))
 
@@ -56,7 +56,7 @@ class ParquetSolver(Solver):
                     Point(r, c, Direction.TOP, "delete"), True
                 ) or puzzle.edge.get(Point(r, c, Direction.TOP, "normal"), False)
 
-        bigger_rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        bigger_rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         rooms = full_bfs(puzzle.row, puzzle.col, edges)
         room_map: Dict[Tuple[Tuple[int, int], ...], List[int]] = {}  # cluster the rooms into bigger_rooms
         for i, ar in enumerate(rooms):
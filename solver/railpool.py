@@ -49,7 +49,7 @@ class RailPoolSolver(Solver):
         self.add_program_line(single_route(color="grid"))
         self.add_program_line(len_segment_area(color="grid"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge, puzzle.text)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view, puzzle.text)
         for i, (ar, rc) in enumerate(rooms.items()):
             self.add_program_line(area(_id=i, src_cells=ar))
             if rc:
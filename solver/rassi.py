@@ -35,10 +35,10 @@ class RassiSilaiSolver(Solver):
         self.add_program_line(area_color_connected(color="grid", adj_type="line"))
         self.add_program_line(avoid_same_color_adjacent(color="dead_end", adj_type=8))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
-            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.edge))
+            self.add_program_line(area_border(_id=i, src_cells=ar, edge=puzzle.view))
             self.add_program_line(count_area_pass(0, _id=i))
 
             if len(ar) == 1:
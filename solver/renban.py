@@ -60,7 +60,7 @@ class RenbanMadoguchiSolver(Solver):
         self.add_program_line(fill_num(_range=range(1, lmt_num + 1)))
         self.add_program_line(unique_num(color="grid", _type="area"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
             self.add_program_line(consecutive_in_room(_id=i, size=len(ar)))
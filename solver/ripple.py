@@ -42,7 +42,7 @@ class RippleSolver(Solver):
                 flag = True
                 self.add_program_line(f"black({r}, {c}).")
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
             if flag:
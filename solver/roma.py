@@ -37,7 +37,7 @@ class RomaSolver(Solver):
         self.add_program_line(roma_adjacent())
         self.add_program_line(avoid_unknown_src(adj_type="line_directed", color="grid"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
             self.add_program_line(count(("le", 1), color="arrow_N_W__1", _type="area", _id=i))
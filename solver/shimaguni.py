@@ -41,7 +41,7 @@ class ShimaguniSolver(Solver):
         self.add_program_line(area_adjacent())
         self.add_program_line(adjacent_area_different_size(color="gray"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge, puzzle.text)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view, puzzle.text)
         for i, (ar, rc) in enumerate(rooms.items()):
             self.add_program_line(area(_id=i, src_cells=ar))
             flag = True
@@ -37,7 +37,7 @@ class StarBattleSolver(Solver):
         self.add_program_line(count(num_stars, color="star__2", _type="row"))
         self.add_program_line(count(num_stars, color="star__2", _type="col"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
             self.add_program_line(count(num_stars, color="star__2", _type="area", _id=i))
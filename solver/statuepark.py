@@ -51,9 +51,13 @@ class StatueParkSolver(Solver):
         self.add_program_line(grid_color_connected(color="not gray", grid_size=(puzzle.row, puzzle.col)))
         self.add_program_line(all_shapes("omino_statue", color="gray"))
 
+        excluded = {(r, c) for (r, c, _, _), symbol_name in puzzle.symbol.items() if symbol_name == "circle_M__1"}
+        excluded |= {(r, c) for (r, c, _, _), color in puzzle.surface.items() if color not in Color.DARK}
+        cells = [(r, c) for r in range(puzzle.row) for c in range(puzzle.col) if (r, c) not in excluded]
+
         shapeset = parse_shapeset(puzzle.param["shapeset"])
         for i, (o_shape, o_count) in enumerate(shapeset.items()):
-            self.add_program_line(general_shape("omino_statue", i, o_shape, color="gray", adj_type=4))
+            self.add_program_line(general_shape("omino_statue", i, o_shape, color="gray", adj_type=4, cells=cells))
             self.add_program_line(count_shape(o_count, name="omino_statue", _id=i, color="gray"))
 
         for (r, c, d, _), symbol_name in puzzle.symbol.items():
@@ -146,18 +146,12 @@ class SudokuSolver(Solver):
                 self.add_program_line(f":- number({r - 1}, {c}, N1), number({r}, {c - 1}, N2), (N1 - N2) \\ 2 != 0.")
                 self.add_program_line(f":- number({r}, {c}, N1), number({r}, {c - 1}, N2), (N1 - N2) \\ 2 = 0.")
 
-        if puzzle.param["diagonal"]:  # diagonal rule
-            for i in range(n):
-                self.add_program_line(f"area({n + 1}, {i}, {i}).")
-                self.add_program_line(f"area({n + 2}, {i}, {8 - i}).")
-
-        if puzzle.param["untouch"]:  # untouch rule
-            self.add_program_line(avoid_same_number_adjacent(adj_type="x"))
-
-        if puzzle.param["antiknight"]:  # antiknight rule
-            self.add_program_line("adj_knight(R, C, R1, C1) :- grid(R, C), grid(R1, C1), |R - R1| = 2, |C - C1| = 1.")
-            self.add_program_line("adj_knight(R, C, R1, C1) :- grid(R, C), grid(R1, C1), |R - R1| = 1, |C - C1| = 2.")
-            self.add_program_line(avoid_same_number_adjacent(adj_type="knight"))
+        diagonal = "\n".join(f"area({n + 1}, {i}, {i}).\narea({n + 2}, {i}, {8 - i})." for i in range(n))
+        self.add_param_line(diagonal, "diagonal", puzzle.param["diagonal"])  # diagonal rule
+        self.add_param_line(avoid_same_number_adjacent(adj_type="x"), "untouch", puzzle.param["untouch"])  # untouch rule
+
+        self.add_program_line(adjacent(_type="knight"))
+        self.add_param_line(avoid_same_number_adjacent(adj_type="knight"), "antiknight", puzzle.param["antiknight"])
 
         self.add_program_line(display(item="number", size=3))
 
@@ -27,7 +27,7 @@ class SuguruSolver(Solver):
         self.add_program_line(unique_num(_type="area", color="grid"))
         self.add_program_line(avoid_same_number_adjacent(adj_type=8))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
             self.add_program_line(fill_num(_range=range(1, len(ar) + 1), _type="area", _id=i))
@@ -36,7 +36,7 @@ class SukoroRoomSolver(Solver):
         self.add_program_line(unique_num(color="black", _type="area"))
         self.add_program_line(area_same_color(color="black"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, (ar, _) in enumerate(rooms.items()):
             self.add_program_line(area(_id=i, src_cells=ar))
 
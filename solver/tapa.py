@@ -73,6 +73,7 @@ class TapaSolver(Solver):
         },
         {"url": "https://puzz.link/p?tapa/10/10/i0ha0t1h2hb0t3h4h.q.h5h6ha0o.g.h7h8g.o./", "test": False},
     ]
+    solver_config = {"configuration": "trendy"}
 
     def solve(self, puzzle: Puzzle) -> str:
         self.reset()
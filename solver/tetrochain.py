@@ -33,8 +33,11 @@ class TetroChainYSolver(Solver):
 
         self.add_program_line(all_shapes("omino_4", color="black"))
         self.add_program_line(avoid_same_omino_adjacent(4, color="black", adj_type=4))
+        excluded = {(r, c) for (r, c, _, _) in puzzle.text}
+        excluded |= {(r, c) for (r, c, _, _), color in puzzle.surface.items() if color not in Color.DARK}
+        cells = [(r, c) for r in range(puzzle.row) for c in range(puzzle.col) if (r, c) not in excluded]
         for i, o_shape in enumerate(OMINOES[4].values()):
-            self.add_program_line(general_shape("omino_4", i, o_shape, color="black", _type="grid", adj_type=4))
+            self.add_program_line(general_shape("omino_4", i, o_shape, color="black", _type="grid", adj_type=4, cells=cells))
 
         for (r, c, d, label), clue in puzzle.text.items():
             validate_direction(r, c, d)
@@ -24,7 +24,7 @@ class TilepaintSolver(Solver):
         self.add_program_line(shade_c(color="gray"))
         self.add_program_line(area_same_color(color="gray"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, (ar, _) in enumerate(rooms.items()):
             self.add_program_line(area(_id=i, src_cells=ar))
 
@@ -47,7 +47,7 @@ class ToichikaSolver(Solver):
         self.add_program_line(shade_cc(colors=["gray", "arrow_N_W__1", "arrow_N_W__3", "arrow_N_W__5", "arrow_N_W__7"]))
         self.add_program_line(toichika_pair(color="gray"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
             self.add_program_line(count(1, color="not gray", _type="area", _id=i))
@@ -52,7 +52,7 @@ class Toichika2Solver(Solver):
         self.add_program_line(num_appear_less_than_three())
         self.add_program_line(toichika2_pair(color="not gray"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
             self.add_program_line(
@@ -58,7 +58,7 @@ class TontonbeyaSolver(Solver):
         self.add_program_line(area_color_connected(color="ox_E__2", adj_type=4))
         self.add_program_line(area_color_connected(color="ox_E__3", adj_type=4))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view)
         for i, ar in enumerate(rooms):
             self.add_program_line(area(_id=i, src_cells=ar))
 
@@ -36,7 +36,7 @@ class YajilinRegionsSolver(Solver):
         self.add_program_line(grid_color_connected(color="not black", adj_type="line"))
         self.add_program_line(single_route(color="not black"))
 
-        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge, puzzle.text)
+        rooms = full_bfs(puzzle.row, puzzle.col, puzzle.view, puzzle.text)
         for i, (ar, rc) in enumerate(rooms.items()):
             self.add_program_line(area(_id=i, src_cells=ar))
 
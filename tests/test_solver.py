@@ -1,17 +1,68 @@
 """Test all solvers in Noqx."""
 
+import asyncio
+import json
 import logging
+import os
 import pkgutil
+import tempfile
 import unittest
-
-from noqx.clingo import Config, run_solver
-from noqx.manager import Solver, list_solver_metadata, load_solver
-from noqx.puzzle import Direction
-from noqx.rule.common import count, fill_num, unique_num
-from noqx.rule.helper import fail_false, validate_direction, validate_type
-from noqx.rule.neighbor import adjacent
-from noqx.rule.reachable import count_reachable_src
-from noqx.rule.shape import OMINOES, all_rect, all_shapes, count_shape, general_shape, get_variant_shape
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from itertools import product
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from unittest import mock
+
+from noqx.batch import error_status, load_checkpoint, solve_batch, split_lines
+from noqx.cache import GroundCache, SolutionCache, puzzle_digest, solver_version
+from noqx.clingo import (
+    PORTFOLIO,
+    ClingoSolver,
+    Config,
+    config_arguments,
+    dump_ground,
+    get_ground_cache,
+    get_solution_cache,
+    iter_solver,
+    run_solver,
+    warm_caches,
+)
+from noqx.flight import SingleFlight, request_key
+from noqx.hint import get_session, parse_fixed, run_hint
+from noqx.manager import (
+    ProgramCache,
+    Solver,
+    generate_program,
+    get_solver,
+    guard_statement,
+    lazy_modules,
+    list_solver_metadata,
+    load_solver,
+    modules,
+    prepare_puzzle,
+    program_cache,
+    program_key,
+    register_solver,
+)
+from noqx.pool import SolverPool
+from noqx.puzzle import Color, Direction, Point
+from noqx.puzzle.penpa import PENPA_ABBREVIATIONS, compress_abbreviations, expand_abbreviations
+from noqx.registry import load_index, load_solvers
+from noqx.rule import reachable
+from noqx.rule.common import area, count, fill_num, grid, shade_c, unique_num
+from noqx.rule.helper import fail_false, full_bfs, validate_direction, validate_type
+from noqx.rule.neighbor import adjacent, area_border
+from noqx.rule.reachable import count_reachable_src, grid_color_connected, grid_multi_src_color_connected
+from noqx.rule.shape import (
+    OMINOES,
+    VARIANT_CACHE_SIZE,
+    all_rect,
+    all_shapes,
+    count_shape,
+    general_shape,
+    get_variant_shape,
+    shape_placements,
+)
 from noqx.rule.variety import yaji_count
 from solver.binairo import unique_linecolor
 from solver.castle import wall_length
@@ -25,6 +76,29 @@ for module_info in pkgutil.iter_modules(["solver"]):
     load_solver("solver", module_info.name)
 
 metadata = list_solver_metadata()
+
+
+def iter_examples() -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """Iterate over the test examples with their actual parameters."""
+    for puzzle_name, puzzle_metadata in metadata.items():
+        default_params = puzzle_metadata.get("parameters", {})
+
+        for puzzle_example in puzzle_metadata.get("examples", []):
+            if puzzle_example.get("test") is False or puzzle_example.get("url"):
+                continue  # ignore test cases with url option or test flag is set to False
+
+            # replace default values with actual configuration values
+            puzzle_config = puzzle_example.get("config", {})
+            params = {k: v["default"] if k not in puzzle_config else puzzle_config[k] for k, v in default_params.items()}
+
+            for k, v in params.items():
+                v_str = str(v)
+                if v_str.isdigit():
+                    params[k] = v_str
+
+            yield puzzle_name, puzzle_example["data"], params
+
+
 empty_payload = "m=edit&p=7ZLNb7JAEIfv/BVmznNgwfqxN2u1F0s/sDFmQwzyYiRCsSBNs4b/3dmBhIvprW96MMCTx5kx/NhM+VmFRYyCLneENstwYG7hmNtur2VySmPZw0l12ucFCeLzfI67MC1jS7VTgXXWY6knqB+lAgEIDj0CAtSv8qyfpPZQ+9QC7FNt0Qw5pLNOV9w3Nm2Kwib3Gh+QrkmjpIjSeLOgLlVepNJLBPOee/63UcjyrxjaHOZ3lGfbxBS24Yk+ptwnx7ZTVv/yQ9XOiqBGPWni+lfiul1co01cY78WNz3m14KOg7qmA3+jqBupTOr3Tked+vJM9JiCuWbOmQ5zSaOoXeYD02beMRc8M2OumFNmnzngmaF52V+Lo4QTWAr8qtiFUUyH6FXZNi56Xl5kYQq0r7UF38CPcmn1+7cV/u8rbA7fvi3yz3Fol+GjKpIsKcNDAoF1AQ=="
 
 
@@ -33,37 +107,173 @@ class TestSolver(unittest.TestCase):
 
     def test_solver_timeout_error(self):
         """Test solver assertion error."""
-        Config.time_limit = 0.5
         payload = "m=edit&p=7VVNa9tAEL3rV5Q9z0Gzu9bXzXXjXtz0wy4hCBEcVyEiNnL1UYqM/3tmRiIrQ2gphdYHI/R4sztv9GZ3JdXf23WVA4aABkwEPiBdQWRhYjQNR3L7w7Uqmm2evIFp2zyWFRGAj/M5PKy3de6lQ1bmHbo46abQvU9ShQqUphtVBt3n5NB9SNSm3N0XCrolzStAmlj0mZrolaM3Ms9s1g+iT/x64ERviW6KarPN7xb9yKck7Vag+GFvRc1U7cofuRrMcNwboIH7dUMd1Y/Ffpip22/lUzvkYnaEbvobz8Z5Ztp7ZvaKZ27l7z1v9+VrbuPseKSl/0J+75KUrX91NHJ0mRwIr5ODspakIQT97igbUWhfwommUAcuDk6mA59C9F/iiNV0dIYwZrUTxyxGN40+y50aNcuNiw3rxwLDFWIXWy6gRxWkm5EhDLmEM4whV3DtYiQdOI8YcQUn0CgenEKjdDHK0FzCVdBaPOjRwGlbWhbRdaX7VRwPnO6JDrjAqGC/kO6RRhYyGsVcwK2C8U931fRNDTEdBJTjcCs4F9SCKzot0BnBd4K+4ERwITlXgjeCM0ErGEhOyOftj07kP7CTWiufuF9dk0vGOWZkXqqWbfWw3uT0/ZuVu31ZF02u6Idz9NRPJTe9bAj28g/6j/8g3gb/3N77c7NDXyL11FZl05Qq854B"
-        self.assertRaises(TimeoutError, run_solver, "kurotto", payload, {})
-        Config.time_limit = 30
+        with mock.patch.object(Config, "time_limit", 0.5):
+            self.assertRaises(TimeoutError, run_solver, "kurotto", payload, {})
 
     def test_solver_api(self):
         """Test all available solvers. The tests should only return a unique solution."""
         failed_solvers = []
-        for puzzle_name, puzzle_metadata in metadata.items():
-            default_params = puzzle_metadata.get("parameters", {})
-
-            for puzzle_example in puzzle_metadata.get("examples", []):
-                if puzzle_example.get("test") is False or puzzle_example.get("url"):
-                    continue  # ignore test cases with url option or test flag is set to False
-
-                # replace default values with actual configuration values
-                puzzle_config = puzzle_example.get("config", {})
-                params = {k: v["default"] if k not in puzzle_config else puzzle_config[k] for k, v in default_params.items()}
-
-                for k, v in params.items():
-                    v_str = str(v)
-                    if v_str.isdigit():
-                        params[k] = v_str
-
-                response = run_solver(puzzle_name, puzzle_example["data"], params)
-                if len(response["url"]) != 1:
-                    failed_solvers.append(puzzle_name)
+        for puzzle_name, puzzle_content, params in iter_examples():
+            response = run_solver(puzzle_name, puzzle_content, params)
+            if len(response["url"]) != 1:
+                failed_solvers.append(puzzle_name)
 
         if failed_solvers:
             self.fail(f"Failed puzzle(s): {', '.join(failed_solvers)}.")
 
+    def test_concurrent_program_generation(self):
+        """Test generating programs for the same puzzle types from many threads at once."""
+        examples = list(iter_examples())
+        max_entries = program_cache.max_entries
+        program_cache.max_entries = 0  # every program is generated by `Solver.solve`
+        try:
+            expected = [generate_program(prepare_puzzle(*example)) for example in examples]
+
+            def generate(index: int) -> str:
+                return generate_program(prepare_puzzle(*examples[index]))
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                indices = [i for i in range(len(examples)) for _ in range(4)]
+                for index, result in zip(indices, executor.map(generate, indices)):
+                    self.assertEqual(result, expected[index], f"Corrupted program for {examples[index][0]}.")
+        finally:
+            program_cache.max_entries = max_entries
+
+    def test_solver_stream(self):
+        """Test yielding the solutions one by one."""
+        payload = metadata["nurimisaki"]["examples"][0]["data"]
+        solutions = iter_solver("nurimisaki", payload, {})
+        self.assertTrue(next(solutions).startswith("m=edit&p="))
+        self.assertRaises(StopIteration, next, solutions)
+        self.assertEqual(list(iter_solver("nurimisaki", payload, {})), run_solver("nurimisaki", payload, {})["url"])
+
+    def test_solve_mode(self):
+        """Test the different solve modes on a puzzle with two solutions."""
+        self.assertEqual(run_solver("hitori", empty_payload, {}, "count"), {"count": 2, "exact": True})
+        self.assertEqual(run_solver("hitori", empty_payload, {}, "count:1"), {"count": 1, "exact": False})
+        self.assertEqual(run_solver("hitori", empty_payload, {}, "count:3"), {"count": 2, "exact": True})
+        self.assertEqual(run_solver("hitori", empty_payload, {}, "count:2"), {"count": 2, "exact": True})
+        self.assertEqual(run_solver("hitori", empty_payload, {}, "count", True)["stats"]["models"], 2)
+
+        solver = ClingoSolver(0)
+        self.assertEqual(solver.count("{ a; b; c }."), (8, True))
+        self.assertEqual(solver.model, [])  # the models are counted without being stored
+        self.assertEqual(len(run_solver("hitori", empty_payload, {}, "first")["url"]), 1)
+        self.assertEqual(len(run_solver("hitori", empty_payload, {}, "enumerate:2")["url"]), 2)
+
+        response = run_solver("hitori", empty_payload, {}, "unique")
+        self.assertEqual(len(response["url"]), 1)
+        self.assertFalse(response["unique"])
+        self.assertTrue(run_solver("nurimisaki", empty_payload, {}, "unique")["unique"])
+        self.assertEqual(len(list(iter_solver("hitori", empty_payload, {}, "unique"))), 1)
+
+        for mode in ("all", "enumerate:0", "first:1", "count:0"):
+            self.assertRaises(ValueError, run_solver, "hitori", empty_payload, {}, mode)
+
+        self.assertRaises(ValueError, list, iter_solver("hitori", empty_payload, {}, "count"))
+
+    def test_solver_statistics(self):
+        """Test the timings and the statistics of the solver backend."""
+        solver = ClingoSolver(max_models=0)
+        self.assertEqual(len(list(solver.iter_solve("{ a; b }."))), 4)
+        self.assertGreater(solver.ground_time, 0)
+        self.assertGreater(solver.solve_time, 0)
+        self.assertEqual(solver.statistics()["models"], 4)
+        self.assertTrue(solver.statistics()["exhausted"])
+
+    def test_ground_time_limit(self):
+        """Test the grounding time limit of the solver backend."""
+        with mock.patch.object(Config, "ground_time_limit", 1e-6):
+            self.assertRaisesRegex(
+                TimeoutError, r"Grounding time limit exceeded \(.* MiB peak memory\)", ClingoSolver().solve, "{ a; b }."
+            )
+
+        with mock.patch.object(Config, "ground_time_limit", 0):
+            self.assertEqual(len(list(ClingoSolver(max_models=0).iter_solve("{ a; b }."))), 4)
+
+    def test_solver_api_stats(self):
+        """Test the statistics in the response of the solver."""
+        get_solution_cache().clear()
+        stats = run_solver("hitori", empty_payload, {}, "count", stats=True)["stats"]
+        self.assertEqual((stats["models"], stats["exhausted"], stats["cached"]), (2, True, False))
+        self.assertGreater(stats["ground_ms"], 0)
+        self.assertEqual(stats["pack_ms"], 0)
+
+        stats = run_solver("hitori", empty_payload, {}, "count", stats=True)["stats"]
+        self.assertFalse(stats["cached"])  # the counts are not cached without the models
+
+        run_solver("hitori", empty_payload, {}, "enumerate:3")
+        stats = run_solver("hitori", empty_payload, {}, "enumerate:3", stats=True)["stats"]
+        self.assertEqual((stats["models"], stats["cached"], stats["solve_ms"]), (2, True, 0))
+        self.assertNotIn("stats", run_solver("hitori", empty_payload, {}, "count"))
+
+    def test_portfolio(self):
+        """Test racing the threads with different configurations on the same ground program."""
+        with mock.patch.object(Config, "portfolio", 3):
+            get_solution_cache().clear()
+            stats = run_solver("hitori", empty_payload, {}, "count", stats=True)["stats"]
+            self.assertEqual((stats["models"], stats["exhausted"]), (2, True))
+            self.assertIn(stats["winner"], PORTFOLIO[:3])
+
+            solver = ClingoSolver(0, {"configuration": "trendy"})
+            solver.solve("{ a; b }.")
+            self.assertEqual(solver.statistics()["winner"], "trendy")  # all the threads run the single configuration
+            self.assertEqual(len(run_solver("hitori", empty_payload, {}, "first")["url"]), 1)
+            self.assertTrue(run_solver("nurimisaki", empty_payload, {}, "unique")["unique"])
+
+    def test_solver_config(self):
+        """Test the clingo options and the domain heuristics of the solver configuration."""
+        self.assertEqual(config_arguments({}), ["--trans-ext=dynamic", "--eq=1"])
+        self.assertEqual(
+            config_arguments({"eq": 3, "domain": {"a/1": "true"}}), ["--trans-ext=dynamic", "--eq=3", "--heuristic=Domain"]
+        )
+
+        program = "{ black(1..3) }.\n:- not black(_)."
+        for modifier, expected in (("false", 1), ("true", 3)):
+            solver = ClingoSolver(1, {"configuration": "crafty", "domain": {"black/1": modifier}})
+            solver.solve(program)
+            self.assertEqual(len(solver.model[0].split()), expected)
+
+        for solver_config in ({"unknown": 1}, {"eq": "x"}, {"domain": {"black": "false"}}, {"domain": {"black/1": "up"}}):
+            self.assertRaises(ValueError, ClingoSolver, 1, solver_config)
+
+    def test_multi_src_reachability(self):
+        """Test the shared multi-source reachability against the reachability per source cell."""
+        for puzzle_name in ("fillomino", "nurikabe"):
+            metadata = list_solver_metadata()[puzzle_name]
+            params = {k: v["default"] for k, v in metadata.get("parameters", {}).items()}
+            models, keys = [], []
+            try:
+                for shared in (True, False):
+                    reachable.SHARED_REACHABILITY = shared
+                    puzzle = prepare_puzzle(puzzle_name, metadata["examples"][0]["data"], params)
+                    keys.append(program_key(puzzle))
+                    solutions = ClingoSolver(0).iter_solve(generate_program(puzzle))
+                    models.append(sorted(" ".join(sorted(model.split())) for model in solutions))
+            finally:
+                reachable.SHARED_REACHABILITY = True
+
+            self.assertEqual(models[0], models[1])
+            self.assertNotEqual(keys[0], keys[1])  # the programs of both encodings are cached separately
+
+    def test_multishot_params(self):
+        """Test solving the same board with other guarded parameters on the grounded program."""
+        payload = metadata["sudoku"]["examples"][1]["data"]
+        params = {"diagonal": True, "untouch": False, "antiknight": False}
+        for index, (diagonal, unique) in enumerate(((True, True), (False, False), (True, True))):
+            get_solution_cache().clear()
+            response = run_solver("sudoku", payload, {**params, "diagonal": diagonal}, "unique", stats=True)
+            self.assertEqual(response["unique"], unique)
+            if index > 0:
+                self.assertEqual(response["stats"]["ground_ms"], 0)
+
+        solver = ClingoSolver(0)
+        program = "{ a; b }.\n:- a, b, noqx_param(x).\n#external noqx_param(x). [true]"
+        self.assertEqual(len(list(solver.iter_solve(program))), 3)
+        self.assertEqual(len(list(solver.iter_solve(program.replace("[true]", "[false]")))), 4)
+        self.assertRaises(ValueError, list, solver.iter_solve("{ a }."))
+
     def test_nonogram_edge_case(self):
         """Test nonogram edge case."""
         payload = "m=edit&p=7ZJBb7JAEIbv/Aqz5znsgvbTvVmrvVhai40xhBikGEkh9ANpmiX8d2cGjGnSSw9tPTTrvnmZnXWfnZ3yfxUWMdg4nCFIUDRUn+dA0u80lskhjXUPxtVhnxdoAO5nM9iFaRlbvuK9MrBqM9JmAeZW+0IJEDZOJQIwC12bO21cMB4uCXAwNm+TbLTTs13xOrlJG1QSvdt5tGu0UVJEabyZt5EH7ZslCDrnmneTFVn+FouOg76jPNsmFNiGB7xMuU9eu5Wyes5fqi5XBQ2YcYvrnXDplA6XyDtcsi0uuU9w6RbfjDsKmgbL/ojAG+0T+9PZDs/W0zWqq2uhBrRVIkv7NsKWHwKYpjh5zTpjtVmX+F9gHNYbVsk6YJ1zzpR1xTph7bNecc4/ovkS7w/g+LYKLF94VbELoxir7FbZNi56bl5kYSqwrRtLvAuevoNl6v91+i91Oj2BvLT+uTQc7OjAOgI="
@@ -87,6 +297,49 @@ class TestSolver(unittest.TestCase):
         response = run_solver("toichika", payload, {})
         self.assertEqual(len(response["url"]), 1)
 
+    def test_puzzle_empty_copy(self):
+        """Test packing solutions into the empty copies of a decoded puzzle."""
+        puzzle = prepare_puzzle("nurimisaki", metadata["nurimisaki"]["examples"][0]["data"], {})
+        solution_1 = puzzle.empty_copy()
+        solution_2 = puzzle.empty_copy()
+        self.assertEqual((solution_1.row, solution_1.col, solution_1.text), (puzzle.row, puzzle.col, {}))
+
+        template_surface = dict(puzzle.template["surface"])
+        solution_1.surface[Point(5, 5)] = Color.BLACK
+        self.assertNotEqual(solution_1.encode(), solution_2.encode())
+        self.assertEqual(solution_2.encode(), puzzle.empty_copy().encode())
+        self.assertEqual(puzzle.template["surface"], template_surface)
+
+    def test_puzzle_view(self):
+        """Test the compact view against the dictionaries of a decoded puzzle."""
+        for puzzle_name in ("country", "doubleback", "heyawake", "nurimisaki"):
+            puzzle = prepare_puzzle(puzzle_name, metadata[puzzle_name]["examples"][0]["data"], {})
+            view = puzzle.view
+            self.assertIs(puzzle.view, view)
+            for r, c in product(range(-1, puzzle.row + 1), range(-1, puzzle.col + 1)):
+                for d in (Direction.TOP, Direction.LEFT):
+                    expected = 0 <= r < puzzle.row + (d == Direction.TOP) and 0 <= c < puzzle.col + (d == Direction.LEFT)
+                    expected = expected and puzzle.edge.get(Point(r, c, d)) is True
+                    self.assertEqual(view.has_edge(r, c, d), expected)
+
+                in_grid = 0 <= r < puzzle.row and 0 <= c < puzzle.col
+                for d in (Direction.TOP, Direction.LEFT, Direction.BOTTOM, Direction.RIGHT):
+                    self.assertEqual(view.has_line(r, c, d), in_grid and puzzle.line.get(Point(r, c, d)) is True)
+
+                if in_grid:
+                    self.assertEqual(view.surface[r * puzzle.col + c], puzzle.surface.get(Point(r, c), -1))
+                    self.assertEqual(view.text[r * puzzle.col + c], puzzle.text.get(Point(r, c)))
+
+            rooms = full_bfs(puzzle.row, puzzle.col, puzzle.edge, puzzle.text)
+            self.assertEqual(full_bfs(puzzle.row, puzzle.col, view, puzzle.text), rooms)
+            for i, room in enumerate(rooms):
+                self.assertEqual(area_border(i, room, view), area_border(i, room, puzzle.edge))
+
+            self.assertRaises(ValueError, full_bfs, puzzle.row + 1, puzzle.col, view)
+            puzzle.edge[Point(0, 1, Direction.LEFT)] = not view.has_edge(0, 1, Direction.LEFT)
+            puzzle.clear_view()
+            self.assertEqual(puzzle.view.has_edge(0, 1, Direction.LEFT), puzzle.edge[Point(0, 1, Direction.LEFT)])
+
 
 class TestExtraFunction(unittest.TestCase):
     """Test extra functions in solvers."""
@@ -96,6 +349,35 @@ class TestExtraFunction(unittest.TestCase):
         self.assertRaises(ValueError, adjacent, "unknown")
         self.assertRaises(ValueError, adjacent, 1000)
 
+        for adj_type, distances in ((4, {1}), ("x", {2}), (8, {1, 2})):
+            program = "\n".join((grid(3, 4, with_holes=True), "hole(1, 1).", adjacent(adj_type), f"#show adj_{adj_type}/4."))
+            model = next(ClingoSolver().iter_solve(program))
+            expected = {
+                f"adj_{adj_type}({r},{c},{r1},{c1})"
+                for r, c, r1, c1 in product(range(3), range(4), range(3), range(4))
+                if max(abs(r - r1), abs(c - c1)) == 1 and abs(r - r1) + abs(c - c1) in distances
+            }
+            self.assertEqual(set(model.split()), expected)
+
+        program = "\n".join((grid(3, 4), adjacent("knight"), "#show adj_knight/4."))
+        model = next(ClingoSolver().iter_solve(program))
+        expected = {
+            f"adj_knight({r},{c},{r1},{c1})"
+            for r, c, r1, c1 in product(range(3), range(4), range(3), range(4))
+            if {abs(r - r1), abs(c - c1)} == {1, 2}
+        }
+        self.assertEqual(set(model.split()), expected)
+
+    def test_penpa_abbreviations(self):
+        """Test the single-pass abbreviation codec against replacing the abbreviations one by one."""
+        for data in ("", "zz9zOz", 'zB{"zD":zO,"z":"z9"}zQ', "{zSzLzE}"):
+            expanded = reduce(lambda s, abbr: s.replace(abbr[1], abbr[0]), PENPA_ABBREVIATIONS, data)
+            self.assertEqual(expand_abbreviations(data), expanded)
+
+        for data in ("", '"d"', '{"qa": null, "d": ["d", "nullable", "\\"qa\\"", "sudoku"], "board": {}}', "[]"):
+            compressed = reduce(lambda s, abbr: s.replace(abbr[0], abbr[1]), PENPA_ABBREVIATIONS, data)
+            self.assertEqual(compress_abbreviations(data), compressed)
+
     def test_shape_functions(self):
         """Test shape functions."""
         self.assertRaises(ValueError, all_rect, "not black", False)
@@ -107,6 +389,29 @@ class TestExtraFunction(unittest.TestCase):
         self.assertEqual(len(get_variant_shape(OMINOES[3]["I"], allow_rotations=False, allow_reflections=True)), 1)
         self.assertEqual(len(get_variant_shape(OMINOES[3]["L"], allow_rotations=True, allow_reflections=False)), 4)
         self.assertEqual(len(get_variant_shape(OMINOES[3]["L"], allow_rotations=False, allow_reflections=True)), 2)
+        self.assertIs(get_variant_shape(OMINOES[3]["L"], True, True), get_variant_shape(OMINOES[3]["L"][::-1], True, True))
+        variants = get_variant_shape(OMINOES[3]["L"], True, True)
+        self.assertIsInstance(variants, frozenset)
+        for size in range(VARIANT_CACHE_SIZE):  # the least recently used shapes are dropped
+            get_variant_shape(((0, 0), (0, size + 1)), True, True)
+        self.assertIsNot(get_variant_shape(OMINOES[3]["L"], True, True), variants)
+        self.assertEqual(get_variant_shape(OMINOES[3]["L"], True, True), variants)
+        self.assertEqual(shape_placements(OMINOES[3]["L"], [(0, 0), (0, 1), (1, 0), (1, 1)]), [(0, 0)])
+        self.assertEqual(shape_placements(((0, 1), (1, 0), (1, 1)), [(0, 0), (0, 1), (1, 0)]), [])
+
+    def test_shape_placements(self):
+        """Test the precomputed shape placements against the rule-level variant matching."""
+        cells = [(r, c) for r in range(3) for c in range(4) if (r, c) != (1, 1)]
+        base_program = "\n".join(
+            (grid(3, 4), shade_c(), adjacent(), area(0, cells[:5]), area(1, cells[5:]), "not black(1, 1).")
+        )
+        for _type, shape_cells in (("grid", cells), ("area", {0: cells[:5], 1: cells[5:]})):
+            program = base_program + all_shapes("omino_3", _type=_type)
+            legacy = general_shape("omino_3", 0, OMINOES[3]["L"], _type=_type)
+            expected = len(list(ClingoSolver(0).iter_solve(program + legacy)))
+            current = general_shape("omino_3", 0, OMINOES[3]["L"], _type=_type, cells=shape_cells)
+            self.assertGreater(expected, 1)
+            self.assertEqual(len(list(ClingoSolver(0).iter_solve(program + current))), expected)
 
     def test_binairo_unique_linecolor(self):
         """Test binairo unique linecolor."""
@@ -151,13 +456,443 @@ class TestExtraFunction(unittest.TestCase):
     def test_reachable_rules(self):
         """Test reachable rules."""
         self.assertRaises(ValueError, count_reachable_src, 0, (0, 0), "unknown")
+        self.assertRaises(ValueError, grid_color_connected, "black", 4, None, "unknown")
+        self.assertRaises(ValueError, grid_color_connected, "black", "line", None, "propagator")
+        self.assertRaises(ValueError, grid_multi_src_color_connected, {(0, 0): 1}, None, 4)
+        self.assertRaises(ValueError, grid_multi_src_color_connected, {(0, 0): 1}, "black", 8)
+
+    def test_connectivity_propagator(self):
+        """Test the connectivity propagator against the flood-fill encoding."""
+        for adj_type in (4, "x", 8):
+            base_program = "\n".join((grid(3, 4), shade_c(), adjacent(adj_type)))
+            expected = len(list(ClingoSolver(0).iter_solve(base_program + grid_color_connected(adj_type=adj_type))))
+            program = base_program + grid_color_connected(adj_type=adj_type, backend="propagator")
+            for use_propagator in (True, False):
+                with mock.patch.object(Config, "connectivity_propagator", use_propagator):
+                    self.assertEqual(len(list(ClingoSolver(0).iter_solve(program))), expected)
 
     def test_repeated_imports(self):
         """Test repeated imports."""
         self.assertRaises(ValueError, load_solver, "solver", "aqre")
         self.assertRaises(ValueError, load_solver, "solver", "yinyang")
 
+    def test_lazy_solver(self):
+        """Test registering a solver and importing it on first use."""
+        self.assertRaises(ValueError, register_solver, "solver", "aqre")
+        self.assertRaises(ValueError, get_solver, "unknown")
+
+        solver = modules.pop("yinyang")
+        try:
+            register_solver("solver", "yinyang", {"name": "Yin-Yang"})
+            self.assertRaises(ValueError, register_solver, "solver", "yinyang")
+            self.assertEqual(list_solver_metadata()["yinyang"], {"name": "Yin-Yang"})
+            self.assertIsInstance(get_solver("yinyang"), type(solver))
+            self.assertNotIn("yinyang", lazy_modules)
+            self.assertEqual(list_solver_metadata()["yinyang"]["examples"], solver.examples)
+        finally:
+            modules["yinyang"] = solver
+
+    def test_metadata_index(self):
+        """Test the prebuilt metadata index of the solvers."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index_path = os.path.join(tmpdir, "index.json")
+            self.assertFalse(load_index("solver", index_path))
+            self.assertFalse(load_solvers("solver", index_path))  # the index is rebuilt
+            self.assertTrue(load_solvers("solver", index_path))
+
+            with open(index_path, encoding="utf-8") as f:
+                index = json.load(f)
+
+            self.assertEqual(index["solvers"]["yinyang"]["metadata"], metadata["yinyang"])
+            index["sources"]["yinyang"][0] += 1  # the source file is modified after the index is built
+            with open(index_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+
+            self.assertFalse(load_index("solver", index_path))
+
     def test_non_implemented_solver(self):
         """Test non-implemented solver."""
         raw_solver = Solver()
         self.assertRaises(NotImplementedError, raw_solver.solve, None)
+
+    def test_param_lines(self):
+        """Test the lines guarded by parameters."""
+        solver = Solver()
+        solver.add_param_line("a.\n:- b.", "x", True)
+        solver.add_param_line("{ b } :- a.", "x", True, negate=True)
+        self.assertEqual(
+            solver.program,
+            "a :- noqx_param(x).\n:- b, noqx_param(x).\n{ b } :- a, not noqx_param(x).\n#external noqx_param(x). [true]",
+        )
+        self.assertRaises(ValueError, solver.add_param_line, "c.", "x", False)
+        self.assertRaises(ValueError, solver.add_param_line, "c", "y", False)
+
+        self.assertEqual(guard_statement('p("a:-b.") :- q.', "g"), 'p("a:-b.") :- q, g.')
+        self.assertEqual(guard_statement("#count { R: p(R) } = 1 :- q.", "g"), "#count { R: p(R) } = 1 :- q, g.")
+        self.assertEqual(guard_statement("n(1..9).", "g"), "n(1..9) :- g.")
+        for statement in ("#show a/1.", "a :- b. c.", "a :-", "a :- b :- c.", ":~ a. [1]", "a :- b. % c"):
+            self.assertRaises(ValueError, guard_statement, statement, "g")
+
+        self.assertRaises(ValueError, solver.add_param_line, "d.\n#const n = 1.", "z", True)
+        self.assertNotIn("z", solver.program)  # nothing is added from a rejected line
+
+
+class TestSolverPool(unittest.TestCase):
+    """Test the solver worker pool."""
+
+    def test_pool_solve(self):
+        """Test solving puzzles in worker processes."""
+
+        async def run_pool():
+            pool = SolverPool(workers=2, queue_size=0)
+            await pool.start()
+            try:
+                tasks = [pool.solve("nurimisaki", empty_payload, {}) for _ in range(3)]
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+                self.assertEqual(sum(isinstance(result, asyncio.QueueFull) for result in results), 1)
+                self.assertEqual([len(result["url"]) for result in results if isinstance(result, dict)], [1, 1])
+
+                tasks = [pool.solve("nurimisaki", empty_payload, {}, wait=True) for _ in range(3)]
+                results = await asyncio.gather(*tasks)
+                self.assertEqual([len(result["url"]) for result in results], [1, 1, 1])
+                self.assertEqual(pool.pending, 0)
+
+                with self.assertRaises(ValueError):
+                    await pool.solve("nurimisaki", "m=edit&p=invalid", {})
+
+                with self.assertRaises(TimeoutError):
+                    await pool.solve("nurimisaki", empty_payload, {}, timeout=0)
+
+                solutions = [solution async for solution in pool.solve_stream("nurimisaki", empty_payload, {})]
+                self.assertEqual(len(solutions), 1)
+
+                response = await pool.solve("hitori", empty_payload, {}, "unique")
+                self.assertFalse(response["unique"])
+
+                stream = pool.solve_stream("nurimisaki", empty_payload, {})
+                async for _ in stream:
+                    break
+
+                await stream.aclose()  # type: ignore  # the worker is replaced if the stream is closed early
+
+                response = await pool.solve("nurimisaki", empty_payload, {})  # the killed worker is replaced
+                self.assertEqual(len(response["url"]), 1)
+                self.assertEqual(pool.pending, 0)
+            finally:
+                await pool.close()
+
+        asyncio.run(run_pool())
+
+    def test_pool_ground_time_limit(self):
+        """Test the grounding time limit in worker processes."""
+
+        async def run_pool():
+            pool = SolverPool(workers=1, queue_size=0)
+            await pool.start()
+            try:
+                for _ in range(2):  # the worker exits on the timeout and is replaced
+                    with self.assertRaisesRegex(TimeoutError, "Grounding time limit exceeded"):
+                        await pool.solve("nurimisaki", empty_payload, {})
+
+                self.assertEqual(pool.pending, 0)
+            finally:
+                await pool.close()
+
+        with mock.patch.object(Config, "ground_time_limit", 1e-6):  # the workers take a snapshot of the settings
+            asyncio.run(run_pool())
+
+    def test_pool_not_started(self):
+        """Test the pool errors."""
+        self.assertRaises(ValueError, SolverPool, 0)
+        self.assertRaises(RuntimeError, asyncio.run, SolverPool().solve("nurimisaki", empty_payload, {}))
+
+
+class TestBatch(unittest.TestCase):
+    """Test solving many puzzles in one call."""
+
+    def test_solve_batch(self):
+        """Test the results and the status codes of the batch."""
+        lines = [
+            json.dumps({"puzzle_name": "nurimisaki", "puzzle": empty_payload, "id": "a"}),
+            "",
+            json.dumps({"puzzle_name": "hitori", "puzzle": empty_payload, "mode": "count"}),
+            json.dumps({"puzzle_name": "hitori"}),
+            "invalid",
+            json.dumps({"puzzle_name": "hitori", "puzzle": empty_payload, "id": [1]}),
+        ]
+
+        async def iter_lines() -> AsyncIterator[str]:
+            for line in lines:
+                yield line
+
+        async def run_batch(pool: Optional[SolverPool], skip: Tuple[Any, ...]) -> Dict[Any, Dict[str, Any]]:
+            if pool is not None:
+                await pool.start()
+
+            try:
+                return {result.pop("id"): result async for result in solve_batch(iter_lines(), pool, 2, skip)}
+            finally:
+                if pool is not None:
+                    await pool.close()
+
+        results = asyncio.run(run_batch(None, ()))
+        self.assertEqual(sorted(results, key=str), [1, 2, 3, 4, "a"])
+        self.assertEqual((results["a"]["status"], len(results["a"]["url"])), (200, 1))
+        self.assertEqual(results[1], {"status": 200, "count": 2, "exact": True})
+        self.assertEqual((results[2]["status"], results[3]["status"], results[4]["status"]), (400, 400, 400))
+
+        results = asyncio.run(run_batch(SolverPool(workers=1, queue_size=0), ("a", 2, 3, 4)))
+        self.assertEqual(results, {1: {"status": 200, "count": 2, "exact": True}})
+
+    def test_close_early(self):
+        """Test cancelling the puzzles still being solved when the output is closed early."""
+        line = json.dumps({"puzzle_name": "hitori", "puzzle": empty_payload, "mode": "count"})
+
+        async def iter_lines() -> AsyncIterator[str]:
+            for _ in range(4):
+                yield line
+
+        async def run_batch() -> Tuple[Dict[str, Any], int]:
+            pool = SolverPool(workers=1, queue_size=0)
+            await pool.start()
+            try:
+                results = solve_batch(iter_lines(), pool, 3)
+                result = await results.__anext__()
+                await results.aclose()
+                return result, pool._pending
+            finally:
+                await pool.close()
+
+        self.assertEqual(asyncio.run(run_batch()), ({"id": 0, "status": 200, "count": 2, "exact": True}, 0))
+
+    def test_checkpoint(self):
+        """Test resuming from the output lines of a previous run."""
+        lines = [
+            json.dumps({"id": "a", "status": 200, "url": []}),
+            json.dumps({"id": "b", "status": 504, "detail": "Time limit exceeded."}),
+            json.dumps({"id": 2, "status": 400, "detail": "Invalid puzzle."}),
+            '{"id": "c", "sta',
+            "[1]",
+            json.dumps({"status": 200, "url": []}),
+            json.dumps({"id": ["d"], "status": 200, "url": []}),
+        ]
+        self.assertEqual(load_checkpoint(lines), {"a", 2})
+        self.assertEqual(error_status(asyncio.QueueFull()), 503)
+        self.assertEqual(error_status(MemoryError()), 413)
+        self.assertEqual(error_status(RuntimeError()), 500)
+
+    def test_split_lines(self):
+        """Test splitting the chunks of an upload into lines."""
+        text = '{"id": "数独"}\n\n{"id": 1}'.encode()
+
+        async def iter_chunks() -> AsyncIterator[bytes]:
+            for i in range(0, len(text), 3):
+                yield text[i : i + 3]  # the chunks end in the middle of the characters
+
+        async def collect() -> List[str]:
+            return [line async for line in split_lines(iter_chunks())]
+
+        self.assertEqual(asyncio.run(collect()), ['{"id": "数独"}\n', "\n", '{"id": 1}'])
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test coalescing the identical requests in flight."""
+
+    def test_run(self):
+        """Test sharing the result and the error of a single call."""
+        calls = []
+
+        async def solve(value: int) -> int:
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            if value < 0:
+                raise ValueError("Invalid value.")
+
+            return value
+
+        async def run_flight():
+            flight = SingleFlight()
+            key = request_key("solve", {"b": 1, "a": 2})
+            self.assertEqual(key, request_key("solve", {"a": 2, "b": 1}))
+
+            results = await asyncio.gather(
+                *(flight.run(key, lambda: solve(1)) for _ in range(3)), flight.run("x", lambda: solve(2))
+            )
+            self.assertEqual((results, calls), ([1, 1, 1, 2], [1, 2]))
+            self.assertEqual(flight.stats(), {"requests": 4, "coalesced": 2, "in_flight": 0})
+
+            errors = await asyncio.gather(*(flight.run(key, lambda: solve(-1)) for _ in range(2)), return_exceptions=True)
+            self.assertTrue(all(isinstance(error, ValueError) for error in errors))
+            self.assertEqual(calls, [1, 2, -1])
+
+        asyncio.run(run_flight())
+
+    def test_stream(self):
+        """Test sharing the items of a single stream."""
+        closed = []
+
+        async def solve_stream(count: int) -> AsyncIterator[int]:
+            try:
+                for i in range(count):
+                    await asyncio.sleep(0.01)
+                    yield i
+            finally:
+                closed.append(count)
+
+        async def collect(flight: SingleFlight, delay: float) -> List[int]:
+            await asyncio.sleep(delay)
+            return [item async for item in flight.stream("key", lambda: solve_stream(3))]
+
+        async def run_flight():
+            flight = SingleFlight()
+            results = await asyncio.gather(collect(flight, 0), collect(flight, 0.015))
+            self.assertEqual(results, [[0, 1, 2], [0, 1, 2]])
+            self.assertEqual((closed, flight.stats()), ([3], {"requests": 2, "coalesced": 1, "in_flight": 0}))
+
+            async for _ in flight.stream("key", lambda: solve_stream(5)):
+                break  # the stream is cancelled if all the requests leave
+
+            await asyncio.sleep(0.01)
+            self.assertEqual((closed, flight.stats()["in_flight"]), ([3, 5], 0))
+
+        asyncio.run(run_flight())
+
+
+class TestHint(unittest.TestCase):
+    """Test the hint engine."""
+
+    def test_hint(self):
+        """Test the forced deductions with the fixed atoms."""
+        payload = metadata["nurimisaki"]["examples"][0]["data"]
+        result = run_hint("nurimisaki", payload, {}, [], (1, 1))
+        self.assertFalse(result["conflict"])
+        self.assertEqual(result["hint"]["atom"], "black(0,1)")  # the shaded cell (0, 0) is on the board
+        self.assertEqual((result["hint"]["row"], result["hint"]["col"]), (0, 1))
+        self.assertTrue(result["hint"]["url"].startswith("m=edit&p="))
+        self.assertEqual(result["cell"], {"row": 1, "col": 1, "forced": [], "excluded": ["black(1,1)"]})
+
+        session = get_session("nurimisaki", payload, {})
+        self.assertIs(get_session("nurimisaki", payload, {}), session)  # the puzzle is grounded once
+        fixed = run_hint("nurimisaki", payload, {}, ["black(0,1)"])
+        self.assertEqual(fixed["forced"], result["forced"] - 1)
+        self.assertNotEqual(fixed["hint"]["atom"], "black(0,1)")
+        self.assertTrue(run_hint("nurimisaki", payload, {}, ["not black(0,1)"])["conflict"])
+
+        self.assertEqual(run_hint("hitori", empty_payload, {})["forced"], 0)  # two solutions without common cells
+        sudoku = next(example for example in iter_examples() if example[0] == "sudoku")
+        hint = run_hint(*sudoku)["hint"]
+        self.assertTrue(hint is None or not get_session(*sudoku).is_given(parse_fixed([hint["atom"]])[0][0]))
+
+    def test_invalid_fixed(self):
+        """Test the invalid fixed atoms."""
+        self.assertEqual(parse_fixed(["not black(0, 1)"])[0][1], False)
+        for fixed in (["black(0,"], ["-black(0,1)"], ["1"]):
+            self.assertRaises(ValueError, run_hint, "nurimisaki", empty_payload, {}, fixed)
+
+
+class TestSolutionCache(unittest.TestCase):
+    """Test the solution cache."""
+
+    def test_memory_cache(self):
+        """Test the in-memory LRU tier."""
+        cache = SolutionCache(max_entries=2)
+        cache.put("a", ["black(0, 0)"])
+        cache.put("b", [])
+        self.assertEqual(cache.get("a"), ["black(0, 0)"])
+        cache.put("c", ["black(1, 1)"])  # "b" is the least recently used entry
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache.stats()["memory_entries"], 2)
+
+    def test_disk_cache(self):
+        """Test the on-disk tier with size-based eviction."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache.db")
+            cache = SolutionCache(max_entries=0, path=path, max_bytes=30)
+            cache.put("a", ["black(0, 0)", "black(1, 1)"])
+            cache.put("b", [])
+            self.assertEqual(SolutionCache(path=path).get("a"), ["black(0, 0)", "black(1, 1)"])
+            self.assertEqual(cache.get("b"), [])
+
+            cache.put("c", ["black(2, 2)", "black(3, 3)"])  # "a" is evicted to fit the size limit
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(cache.stats()["disk_entries"], 2)
+
+            cache.clear()
+            self.assertEqual(cache.stats(), {"hits": 0, "misses": 0, "memory_entries": 0, "disk_entries": 0, "disk_bytes": 0})
+            cache._conn.close()
+
+    def test_solver_cache(self):
+        """Test solving the same board twice."""
+        self.assertEqual(solver_version("nurimisaki"), solver_version("nurimisaki"))
+        cache = get_solution_cache()
+        hits = cache.hits
+        response_1 = run_solver("nurimisaki", empty_payload, {})
+        response_2 = run_solver("nurimisaki", empty_payload, {})
+        self.assertEqual(response_1, response_2)
+        self.assertGreater(cache.hits, hits)
+
+    def test_program_cache(self):
+        """Test generating the program of the same board twice."""
+        cache = ProgramCache(max_entries=2)
+        for key in ("a", "b", "a", "c"):
+            if cache.get(key) is None:
+                cache.put(key, key.upper())
+
+        self.assertIsNone(cache.get("b"))  # "b" is the least recently used one
+        self.assertEqual((cache.get("a"), cache.get("c")), ("A", "C"))
+        self.assertEqual(cache.stats(), {"hits": 3, "misses": 4, "entries": 2})
+
+        program_cache.clear()
+        puzzle = prepare_puzzle("hitori", empty_payload, {})
+        program = generate_program(puzzle)
+        self.assertEqual(generate_program(prepare_puzzle("hitori", empty_payload, {})), program)
+        self.assertEqual(program_cache.stats(), {"hits": 1, "misses": 1, "entries": 1})
+        self.assertNotEqual(program_key(puzzle), program_key(prepare_puzzle("hitori", empty_payload, {"x": 1})))
+
+        killer = prepare_puzzle("sudoku", get_solver("sudoku").examples[3]["data"], {})
+        plain = prepare_puzzle("sudoku", get_solver("sudoku").examples[3]["data"], {})
+        plain.problem = {**killer.problem, "killercages": []}  # type: ignore  # the same board without the cages
+        self.assertNotEqual(program_key(killer), program_key(plain))
+        self.assertNotEqual(puzzle_digest(killer, {}), puzzle_digest(plain, {}))
+
+    def test_ground_cache(self):
+        """Test loading the ground program of the same program from the disk."""
+        with tempfile.TemporaryDirectory() as path:
+            Config.ground_cache_path = path
+            try:
+                results = []
+                for _ in range(2):
+                    get_solution_cache().clear()
+                    results.append(run_solver("hitori", empty_payload, {}, "count", stats=True))
+
+                self.assertEqual([result["stats"]["ground_cached"] for result in results], [False, True])
+                self.assertEqual(results[0]["count"], results[1]["count"])
+                self.assertEqual(get_ground_cache().stats()["stores"], 1)  # type: ignore
+
+                for filename in os.listdir(path):  # a broken file, or a file evicted by another process after the lookup
+                    with open(os.path.join(path, filename), "w", encoding="utf-8") as f:
+                        f.write("asp 1 0 0\n1")
+
+                get_solution_cache().clear()
+                result = run_solver("hitori", empty_payload, {}, "count", stats=True)
+                self.assertEqual((result["count"], result["stats"]["ground_cached"]), (results[0]["count"], False))
+                self.assertEqual(get_ground_cache().stats()["disk_entries"], 0)  # type: ignore  # the entry is dropped
+
+                solver = ClingoSolver(0)
+                self.assertEqual(len(list(solver.iter_solve("{ a; b }.\n#external c."))), 4)
+                self.assertIsNone(solver.ground_cached)  # the external atoms are not kept in the ground program
+
+                warmed = warm_caches(["hitori", "akari"])
+                self.assertGreater(warmed["grounded"], 0)
+                self.assertEqual(warm_caches(["hitori", "akari"]), {**warmed, "grounded": 0})  # grounded only once
+
+                cache = GroundCache(path, max_bytes=0)
+                cache.put("a", lambda temp_path: dump_ground("{ a }.", [], temp_path))
+                self.assertEqual(cache.stats()["disk_entries"], 1)  # the other files are evicted to fit the size limit
+                self.assertIsNotNone(cache.get("a"))
+                cache.clear()
+                self.assertEqual(cache.stats(), {"hits": 0, "misses": 0, "stores": 0, "disk_entries": 0, "disk_bytes": 0})
+            finally:
+                Config.ground_cache_path = None